@@ -1,66 +1,82 @@
 import os
 import uuid
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, g, make_response
+import time
+import threading
+import secrets
+from flask import Flask, Request, render_template, request, redirect, url_for, session, flash, jsonify, g, make_response, Response
 from werkzeug.utils import secure_filename
+from markupsafe import Markup
 import traceback
+import json
 from werkzeug.security import generate_password_hash, check_password_hash # For passwords
 from functools import wraps # For login_required decorator
 from datetime import datetime
-import copy # For deepcopy
-import re # For parsing Gemini's response
-import json
 
 # --- Load .env variables ---
 from dotenv import load_dotenv
 load_dotenv() # Load environment variables from .env file
 
-# --- Google Generative AI SDK ---
-GOOGLE_API_KEY_CONFIGURED = False
-try:
-    import google.generativeai as genai
-    GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-    if GOOGLE_API_KEY:
-        genai.configure(api_key=GOOGLE_API_KEY)
-        GOOGLE_API_KEY_CONFIGURED = True
-        print("INFO: Google Generative AI SDK configured successfully.")
+# --- Heavy Subsystems (loaded on first use) ---
+# The Gemini client, WeasyPrint, the resume parser, the job scraper and the ranker are imported the
+# first time a request needs them (or by the APP_WARMUP background thread), so workers serving
+# login and dashboard pages start without them; see core/lazy_imports.py.
+from core.lazy_imports import LazySubsystem, start_warmup
+
+def _load_enhancement_service() -> dict:
+    # One shared model client, a response cache and a bounded worker pool; see core/enhancement_service.py
+    from core.enhancement_service import enhancement_service, GENAI_AVAILABLE, JOB_PENDING, JOB_RUNNING
+    if enhancement_service.configured:
+        print("INFO: Gemini enhancement service configured successfully.")
+    elif not GENAI_AVAILABLE:
+        print("WARNING: google-generativeai library not found. Gemini AI features will be disabled. Run 'pip install google-generativeai'")
     else:
         print("WARNING: GOOGLE_API_KEY not found in environment variables. Gemini AI features will be disabled.")
-except ImportError:
-    print("WARNING: google-generativeai library not found. Gemini AI features will be disabled. Run 'pip install google-generativeai'")
+    return {'service': enhancement_service, 'JOB_PENDING': JOB_PENDING, 'JOB_RUNNING': JOB_RUNNING}
+enhancement = LazySubsystem("Gemini enhancement service (core.enhancement_service)", _load_enhancement_service)
+SSE_HEARTBEAT_SECONDS = 15 # Keep-alive comment interval on the enhancement preview event stream
 
+def _load_pdf_renderer() -> dict:
+    from weasyprint import HTML, CSS # OSError when the Pango/Cairo system libraries are missing
+    return {'HTML': HTML, 'CSS': CSS}
+pdf_renderer = LazySubsystem("WeasyPrint (PDF generation)", _load_pdf_renderer, fallback={'HTML': None, 'CSS': None})
 
-# --- PDF Generation Library ---
-WEASYPRINT_AVAILABLE = False
-HTML, CSS = None, None
-try:
-    from weasyprint import HTML as WeasyHTML, CSS as WeasyCSS
-    HTML = WeasyHTML
-    CSS = WeasyCSS
-    WEASYPRINT_AVAILABLE = True
-    print("INFO: WeasyPrint library loaded successfully.")
-except ImportError:
-    print("WARNING: WeasyPrint library not found. PDF generation will be disabled.")
-
-# --- Import your custom modules ---
-MODULES_LOADED_SUCCESSFULLY = True
-# ... (rest of your module imports remain the same) ...
-try:
-    from core.python_resume_parser_v9 import extract_text_from_pdf, AdvancedResumeParser
-except ImportError as e:
-    print(f"Error importing Resume Parser module (core.python_resume_parser_v9): {e}")
-    MODULES_LOADED_SUCCESSFULLY = False
-    def extract_text_from_pdf(path): return "Error: Parser module (core.python_resume_parser_v9) not loaded."
-    class AdvancedResumeParser:
-        def parse_resume(self, text):
-            return {"metadata": {"resume_score": 0.0}, "skills": {"all_skills": []}}
+def _load_resume_parser() -> dict:
+    from core.python_resume_parser_v9 import AdvancedResumeParser
+    return {'AdvancedResumeParser': AdvancedResumeParser}
+resume_parser = LazySubsystem("Resume Parser module (core.python_resume_parser_v9)", _load_resume_parser)
 
-try:
+def _load_job_scraper() -> dict:
     from core.job_scrapper_api_v3 import scrape_jobs, PREDEFINED_SKILLS_KEYWORDS
+    from core.job_deduplicator import NearDuplicateIndex
+    return {'scrape_jobs': scrape_jobs, 'PREDEFINED_SKILLS_KEYWORDS': PREDEFINED_SKILLS_KEYWORDS, 'NearDuplicateIndex': NearDuplicateIndex}
+def _no_scrape_jobs(keywords, location, max_jobs_per_source, skills_json_path, dedup_index=None, priority="high"): return []
+job_scraper = LazySubsystem("Job Scrapper module (core.job_scrapper_api_v3)", _load_job_scraper,
+                            fallback={'scrape_jobs': _no_scrape_jobs, 'PREDEFINED_SKILLS_KEYWORDS': [], 'NearDuplicateIndex': lambda: None})
+
+def _load_job_ranker() -> dict:
+    from core.job_ranker import rank_jobs, JobCatalogRanker
+    # Feature matrices for the cached job catalog are built once and then only extended with
+    # jobs updated since the last sync, so ranking per request stays a couple of sparse products.
+    return {'rank_jobs': rank_jobs, 'catalog': JobCatalogRanker()}
+job_ranker = LazySubsystem("Job ranker (core.job_ranker)", _load_job_ranker)
+
+try:
+    from core.pdf_text import extract_text_from_pdf
 except ImportError as e:
-    print(f"Error importing Job Scrapper module (core.job_scrapper_api_v3): {e}")
-    MODULES_LOADED_SUCCESSFULLY = False
-    def scrape_jobs(keywords, location, max_jobs_per_source, skills_json_path): return []
-    PREDEFINED_SKILLS_KEYWORDS = []
+    print(f"Error importing PDF text extraction (core.pdf_text): {e}")
+    def extract_text_from_pdf(path): return "Error: Parser module (core.pdf_text) not loaded."
+
+from core.source_quota import get_quota_metrics
+from core.fragment_cache import fragment_cache, content_version, enable_template_bytecode_cache
+from core.job_pagination import JOB_PAGE_SIZE, parse_page_args, next_cursor, summarize_job, page_jobs
+from core.upload_buffer import HashingSpooledFile
+from core.results_store import results_store
+from core.instrumentation import (
+    span, metrics_registry, start_request_timing, current_request_spans, finish_request_timing, format_server_timing,
+    REQUEST_TIMING_HEADER_ENABLED
+)
+from core.structured_logging import set_log_levels, set_trace_sample_rates, logging_status
+from core.parser_service import get_resume_parser, ParserServiceBusy, PARSER_SERVICE_URL
 
 DB_FUNCTIONS_AVAILABLE = True
 try:
@@ -68,9 +84,16 @@ try:
         connect_db,
         save_personalized_search_session,
         get_personalized_search_session,
+        get_search_session_summary,
+        get_search_session_jobs_page,
+        get_search_session_job,
         delete_personalized_search_session,
         save_recommended_job,
         get_recommended_jobs_by_keywords,
+        get_recommended_jobs_updated_since,
+        get_expired_recommended_job_urls,
+        bulk_upsert_recommended_jobs,
+        dedup_against_job_cache,
         create_user,
         get_user_by_username,
         get_user_by_id,
@@ -86,17 +109,28 @@ except ImportError as e:
     print(f"Error importing Database Manager module (core.database_manager): {e}")
     print("Database operations will be skipped or limited.")
     DB_FUNCTIONS_AVAILABLE = False
-    MODULES_LOADED_SUCCESSFULLY = False
     # Dummy DB functions ... (keep your dummy functions here)
 
 
+class SpoolingRequest(Request):
+    """Streams uploaded files into a hashing, memory-bounded spool instead of werkzeug's default temp file."""
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return HashingSpooledFile(spill_dir=app.config['UPLOAD_FOLDER'])
+
 app = Flask(__name__)
+app.request_class = SpoolingRequest
 app.config['SECRET_KEY'] = os.environ.get('FLASK_SECRET_KEY', 'a_very_strong_and_random_secret_key_for_prod_!123@')
 app.config['UPLOAD_FOLDER'] = 'uploads'
+LOG_ADMIN_TOKEN = os.environ.get('LOG_ADMIN_TOKEN') # Enables /admin/logging when set
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
 
 RESUME_PDF_TEMPLATE = 'resume_pdf_template.html'
+JOB_CARDS_FRAGMENT = '_job_cards.html'
+SEARCH_LIST_FRAGMENT = '_search_list.html'
+RESUME_LIST_FRAGMENT = '_resume_list.html'
+
+enable_template_bytecode_cache(app)
 
 if not os.path.exists(app.config['UPLOAD_FOLDER']):
     os.makedirs(app.config['UPLOAD_FOLDER'])
@@ -110,55 +144,124 @@ def utility_processor():
         return datetime.utcnow().year
     return dict(current_year=get_current_year())
 
-def process_resume_file_placeholder(pdf_path: str) -> dict:
+def process_resume_file_placeholder(pdf_file) -> dict:
     # This function remains as a placeholder for your actual resume processing logic
-    print(f"FLASK_APP: Calling resume parser for: {pdf_path}")
-    if "AdvancedResumeParser" not in globals() or "extract_text_from_pdf" not in globals():
+    # `pdf_file` is a path or a seekable binary file object (the spooled upload)
+    print(f"FLASK_APP: Calling resume parser for: {getattr(pdf_file, 'name', None) or pdf_file}")
+    if not PARSER_SERVICE_URL and not resume_parser.available: # With the parser service, this worker never loads the parser
          return {"raw_resume_text": "Error: Resume parser components not available.", "extracted_skills": [], "resume_score": 0.0}
     try:
-        parser_instance = AdvancedResumeParser()
-        raw_text = extract_text_from_pdf(pdf_path)
+        parser_instance = get_resume_parser(lambda: resume_parser.AdvancedResumeParser()) # Client of the parser service when PARSER_SERVICE_URL is set
+        raw_text = extract_text_from_pdf(pdf_file)
         if "Error: Parser module" in raw_text or "Error: Parser not loaded" in raw_text :
              raise ValueError(raw_text)
         if not raw_text or not raw_text.strip():
-            if not raw_text and os.path.exists(pdf_path):
+            if not raw_text:
                  flash("Could not extract text from the PDF. It might be image-based or corrupted.", "error") # This flash won't be seen by API caller
             raise ValueError("No text could be extracted from the resume. The file might be image-based or corrupted.")
-        parsed_data_from_parser = parser_instance.parse_resume(raw_text)
+        with span("parser.parse_resume"):
+            parsed_data_from_parser = parser_instance.parse_resume(raw_text)
         resume_score = parsed_data_from_parser.get('metadata', {}).get('resume_score', 0.0)
         all_extracted_skills = parsed_data_from_parser.get('skills', {}).get('all_skills', [])
         return {"raw_resume_text": raw_text, "extracted_skills": all_extracted_skills, "resume_score": resume_score}
+    except ParserServiceBusy as e:
+        print(f"WARNING: Resume parser service busy: {e}")
+        return {"raw_resume_text": f"Error: Resume parser busy: {e}", "extracted_skills": [], "resume_score": 0.0}
     except Exception as e:
         traceback.print_exc()
         print(f"Error in process_resume_file_placeholder: {e}")
         return {"raw_resume_text": f"Error processing resume: {str(e)}", "extracted_skills": [], "resume_score": 0.0}
 
+def render_cached_fragment(template_name: str, owner: str, version: str, **context) -> Markup:
+    """Renders a partial template once per (owner, content version) and serves repeats from the fragment cache."""
+    return Markup(fragment_cache.get_or_render(template_name, owner, version,
+                                               lambda: render_template(template_name, **context)))
+
+# --- Temporary (no-database) results ---
+# Kept in the server-side results store; the cookie session only holds an opaque per-browser
+# token, which also scopes the stored results to the browser that produced them.
+def temp_results_key(search_id: str, create: bool = False) -> str | None:
+    token = session.get('temp_results_token')
+    if token is None:
+        if not create: return None
+        token = session['temp_results_token'] = secrets.token_urlsafe(16)
+    return f"{token}:{search_id}"
+
+def get_temp_results(search_id: str) -> dict | None:
+    key = temp_results_key(search_id)
+    return results_store.get(key) if key else None
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-db_connection_active = False
-db_global_object = None
-if DB_FUNCTIONS_AVAILABLE:
-    try:
-        db_object_from_connect = connect_db()
-        if db_object_from_connect is not None:
-            db_global_object = db_object_from_connect
-            db_connection_active = True
-            print("INFO: MongoDB connection established and active.")
-        else:
-            print("CRITICAL: Failed to connect to MongoDB. Database operations will be impacted.")
-    except Exception as e_connect:
-        print(f"CRITICAL: MongoDB connection failed on startup: {e_connect}")
-else:
+# --- MongoDB Connection ---
+# Connected on first use (or by the APP_WARMUP thread, which includes the database by default),
+# not while the module is imported. A failed connection leaves the database off for this worker.
+def _connect_database() -> dict:
+    if connect_db() is None: raise ConnectionError("connect_db() returned no database")
+    return {}
+database = LazySubsystem("MongoDB connection", _connect_database, errors=(Exception,))
+
+def db_ready() -> bool:
+    """True when the database functions loaded and MongoDB is connected (connecting on the first call)."""
+    return DB_FUNCTIONS_AVAILABLE and database.available
+
+if not DB_FUNCTIONS_AVAILABLE:
     print("INFO: Database functions are not available. DB operations will be skipped.")
 
+start_warmup({'database': database, 'parser': resume_parser, 'scraper': job_scraper, 'ranker': job_ranker,
+              'enhancement': enhancement, 'pdf': pdf_renderer})
+
+# --- Job Relevance Ranking ---
+job_catalog_expired_synced_at = None
+job_catalog_sync_lock = threading.Lock() # One sync at a time, so the same updated jobs are not appended twice
+
+def get_ranked_recommended_jobs(skills: list, resume_text: str = None, limit: int = 10) -> list:
+    """Ranks the cached recommended-job catalog against the candidate's skills."""
+    if not db_ready(): return []
+    if not job_ranker.available: return get_recommended_jobs_by_keywords(skills, limit=limit)
+    global job_catalog_expired_synced_at
+    job_catalog_ranker = job_ranker.catalog
+    with job_catalog_sync_lock: # The ranker's own lock keeps rank() consistent with concurrent syncs
+        expired_urls, job_catalog_expired_synced_at = get_expired_recommended_job_urls(job_catalog_expired_synced_at)
+        if expired_urls: job_catalog_ranker.remove_urls(expired_urls)
+        new_jobs, latest = get_recommended_jobs_updated_since(job_catalog_ranker.last_synced_at)
+        if new_jobs: job_catalog_ranker.add_jobs(new_jobs)
+        job_catalog_ranker.last_synced_at = latest
+    return job_catalog_ranker.rank(skills, resume_text, top_k=limit)
+
+# --- Request Timing ---
+# Spans finished while handling a request are collected and, with REQUEST_TIMING_HEADER=true,
+# returned in a Server-Timing header (shown per request in the browser's network panel).
+@app.before_request
+def start_request_spans():
+    g.request_started_at = time.perf_counter()
+    g.request_timing_token = start_request_timing()
+
+@app.after_request
+def add_request_timing(response):
+    g.response_status = response.status_code
+    if REQUEST_TIMING_HEADER_ENABLED and 'request_timing_token' in g:
+        response.headers['Server-Timing'] = format_server_timing(current_request_spans(), total_seconds=time.perf_counter() - g.request_started_at)
+    return response
+
+@app.teardown_request
+def finish_request_spans(exc):
+    # Teardown also runs when a view or after_request hook raised, so the span list is always reset
+    token = g.pop('request_timing_token', None)
+    if token is None: return
+    finish_request_timing(token)
+    elapsed = time.perf_counter() - g.request_started_at
+    error = exc is not None or g.get('response_status', 500) >= 500
+    metrics_registry.observe(f"http.{request.endpoint or 'unmatched'}", elapsed, error=error)
+
 @app.before_request
 def load_logged_in_user():
     user_id = session.get('user_id')
     if user_id is None:
         g.user = None
     else:
-        if DB_FUNCTIONS_AVAILABLE and db_connection_active:
+        if db_ready():
             g.user = get_user_by_id(user_id) 
             if g.user:
                 session['username'] = g.user.get('username') 
@@ -178,192 +281,6 @@ def login_required(view):
     return wrapped_view
 
 
-# --- Gemini AI Integration Function ---
-def call_gemini_to_enhance_resume(original_sections_data, user_custom_prompt):
-    """
-    Calls the Gemini API to enhance resume content based on user prompt.
-    """
-    print("---- DEBUG: START call_gemini_to_enhance_resume ----")
-    # import json # Already imported at the top
-    # print("---- Input original_sections_data: ----")
-    # print(json.dumps(original_sections_data, indent=2))
-
-
-    if not GOOGLE_API_KEY_CONFIGURED:
-        flash("Gemini AI service is not configured. Using basic processing.", "error")
-        enhanced_data = copy.deepcopy(original_sections_data)
-        # Modify summary in personal_info if it exists, otherwise the top-level summary
-        if 'personal_info' in enhanced_data and isinstance(enhanced_data['personal_info'], dict):
-            summary_val = enhanced_data['personal_info'].get('summary', '')
-            enhanced_data['personal_info']['summary'] = summary_val + \
-                f"\n\n[AI Note (Service Not Configured): User Prompt was '{user_custom_prompt}'.]"
-        elif 'summary' in enhanced_data:
-            enhanced_data['summary'] = enhanced_data.get('summary', '') + \
-                 f"\n\n[AI Note (Service Not Configured): User Prompt was '{user_custom_prompt}'.]"
-        return enhanced_data
-
-    try:
-        model = genai.GenerativeModel('gemini-1.5-flash-latest')
-
-        # --- 1. Format resume data into a text block for Gemini ---
-        text_for_gemini = "Current Resume Content:\n"
-        pi = original_sections_data.get('personal_info', {})
-        if isinstance(pi, dict): # Ensure pi is a dict
-            text_for_gemini += f"  Name: {pi.get('full_name', 'N/A')}\n" # Changed 'name' to 'full_name'
-            contact_parts = [pi.get('email'), pi.get('phone'), pi.get('location')]
-            contact_str = " | ".join(filter(None, contact_parts))
-            if contact_str:
-                text_for_gemini += f"  Contact: {contact_str}\n"
-        
-        # Use the top-level summary key as it's used by the PDF template
-        actual_summary = original_sections_data.get('summary', '')
-        if actual_summary:
-            text_for_gemini += "  Summary:\n" + actual_summary + "\n\n"
-        else:
-            text_for_gemini += "  Summary: [Not provided or empty]\n\n"
-
-
-        experience_list = original_sections_data.get('experience', [])
-        if isinstance(experience_list, list) and experience_list:
-            text_for_gemini += "  Experience:\n"
-            for i, exp in enumerate(experience_list[:2]): # Send first 2 experiences
-                if isinstance(exp, dict):
-                    text_for_gemini += f"    Job {i+1}:\n"
-                    text_for_gemini += f"      Title: {exp.get('job_title', 'N/A')}\n"
-                    text_for_gemini += f"      Company: {exp.get('company', 'N/A')}\n"
-                    text_for_gemini += f"      Dates: {exp.get('start_date', '')} - {exp.get('end_date', '')}\n"
-                    responsibilities = exp.get('responsibilities', []) # Key used by JS and PDF
-                    if isinstance(responsibilities, list) and responsibilities:
-                        text_for_gemini += "      Description (Responsibilities):\n" + "\n".join([f"        - {item}" for item in responsibilities]) + "\n"
-                    elif isinstance(responsibilities, str) and responsibilities:
-                         text_for_gemini += f"      Description (Responsibilities): {responsibilities}\n"
-                    else:
-                        text_for_gemini += "      Description (Responsibilities): [Not provided or empty]\n"
-            text_for_gemini += "\n"
-
-        skills_list = original_sections_data.get('skills', []) # Key used by JS and PDF
-        if isinstance(skills_list, list) and skills_list:
-            text_for_gemini += "  Current Skills:\n" + ", ".join(skills_list) + "\n\n"
-        else:
-            text_for_gemini += "  Current Skills: [Not provided or empty]\n\n"
-        
-        # Consider adding Education, Projects in a similar detailed manner if they need to be enhanced.
-
-        if len(text_for_gemini) < len("Current Resume Content:\n") + 50: # Check if substantial content was added
-            text_for_gemini += "  [Other sections like Education, Projects might exist but are not detailed here for brevity unless specifically targeted by the user's prompt.]"
-
-
-        # --- 2. Construct the full prompt for Gemini ---
-        full_prompt_to_gemini = f"""
-        You are an expert AI resume writing assistant. Your task is to enhance the provided resume content based on the user's specific goal.
-
-        User's Goal: "{user_custom_prompt}"
-
-        {text_for_gemini}
-        --------------------------------
-
-        Instructions for AI:
-        1. Analyze the "User's Goal" and the "Current Resume Content".
-        2. Generate enhanced text *only* for the sections explicitly mentioned or clearly implied by the "User's Goal" AND for which content was provided above.
-        3. Structure your response clearly. For each section you modify, use these specific start and end markers:
-           - For the summary: Start with "AI_ENHANCED_SUMMARY_START" on a new line, then the enhanced summary text, and end with "AI_ENHANCED_SUMMARY_END" on a new line.
-           - For the first job experience's responsibilities: Start with "AI_ENHANCED_EXPERIENCE_1_RESPONSIBILITIES_START", then the enhanced responsibilities (as a list of bullet points, each starting with '- ' on a new line if the original was a list), and end with "AI_ENHANCED_EXPERIENCE_1_RESPONSIBILITIES_END".
-           - For the second job experience's responsibilities (if applicable): Use "AI_ENHANCED_EXPERIENCE_2_RESPONSIBILITIES_START" and "AI_ENHANCED_EXPERIENCE_2_RESPONSIBILITIES_END".
-           - For skills: Start with "AI_ENHANCED_SKILLS_START", then a comma-separated list of all skills (original plus any additions or modifications based on the user's goal), and end with "AI_ENHANCED_SKILLS_END".
-        4. If the user asks to "add a skill X", ensure "X" is included in the comma-separated list in the skills output.
-        5. If content for a requested section was marked as "[Not provided or empty]" in the input, and the user goal is to enhance it, state that you cannot enhance non-existent content for that section within your markers, e.g., "AI_ENHANCED_SUMMARY_START\n(No original summary was provided to enhance.)\nAI_ENHANCED_SUMMARY_END".
-        6. Return *only* the enhanced sections with their specified start/end markers. Do not add any conversational text, apologies, or greetings outside these markers. Each marked section should be on new lines.
-        """
-
-        print(f"DEBUG: Sending prompt to Gemini (first 500 chars):\n{full_prompt_to_gemini[:500]}...")
-
-        model = genai.GenerativeModel(model_name='gemini-1.5-flash-latest')
-        response = model.generate_content(full_prompt_to_gemini)
-        
-        gemini_text_response = ""
-        if not response.parts:
-            gemini_text_response = response.text
-            if not gemini_text_response:
-                if response.candidates and response.candidates[0].content.parts:
-                    gemini_text_response = "".join(part.text for part in response.candidates[0].content.parts)
-                else:
-                    gemini_text_response = "[GEMINI RESPONSE WAS EMPTY OR MALFORMED]"
-        else:
-            gemini_text_response = "".join(part.text for part in response.parts)
-
-        print(f"---- DEBUG: RAW GEMINI RESPONSE ----\n{gemini_text_response}\n---- END DEBUG ----")
-
-        # --- 4. Parse Gemini's response and update sections_data ---
-        enhanced_data = copy.deepcopy(original_sections_data)
-
-        # Parse Summary
-        summary_match = re.search(r"AI_ENHANCED_SUMMARY_START\s*(.*?)\s*AI_ENHANCED_SUMMARY_END", gemini_text_response, re.DOTALL | re.IGNORECASE)
-        if summary_match:
-            enhanced_summary = summary_match.group(1).strip()
-            enhanced_data['summary'] = enhanced_summary # Update top-level summary for PDF
-            if 'personal_info' not in enhanced_data or not isinstance(enhanced_data['personal_info'], dict):
-                enhanced_data['personal_info'] = {} # Should already exist from deepcopy if it was there
-            enhanced_data['personal_info']['summary'] = enhanced_summary # Keep consistent if used elsewhere
-            print(f"INFO: Updated summary from Gemini response: '{enhanced_summary[:100]}...'")
-        else:
-            print("WARNING: Did NOT find 'AI_ENHANCED_SUMMARY_START' markers in Gemini response. Summary not updated from AI.")
-
-        # Parse Experience Responsibilities
-        for i in range(2): # Max 2 experiences sent
-            exp_start_marker = f"AI_ENHANCED_EXPERIENCE_{i+1}_RESPONSIBILITIES_START"
-            exp_end_marker = f"AI_ENHANCED_EXPERIENCE_{i+1}_RESPONSIBILITIES_END"
-            exp_match = re.search(rf"{exp_start_marker}\s*(.*?)\s*{exp_end_marker}", gemini_text_response, re.DOTALL | re.IGNORECASE)
-            
-            if exp_match and 'experience' in enhanced_data and \
-               isinstance(enhanced_data.get('experience'), list) and len(enhanced_data['experience']) > i and \
-               isinstance(enhanced_data['experience'][i], dict):
-                
-                enhanced_responsibilities_text = exp_match.group(1).strip()
-                if enhanced_responsibilities_text:
-                    # Convert bulleted list from Gemini into a list of strings
-                    parsed_responsibilities = [
-                        point.replace("-","",1).strip() for point in enhanced_responsibilities_text.split('\n') 
-                        if point.strip() and (point.strip().startswith("-") or point.strip()) # Accept lines starting with - or any non-empty line if not bulleted
-                    ]
-                    if not parsed_responsibilities and enhanced_responsibilities_text: # If splitting by newline didn't work well (e.g. single paragraph)
-                        parsed_responsibilities = [enhanced_responsibilities_text]
-
-                    enhanced_data['experience'][i]['responsibilities'] = parsed_responsibilities
-                    print(f"INFO: Updated experience {i+1} responsibilities from Gemini response.")
-                else:
-                    print(f"INFO: Gemini returned empty content for experience {i+1} responsibilities.")
-            # else:
-                # print(f"WARNING: Did not find markers for experience {i+1} responsibilities or data structure issue.")
-
-
-        # Parse Skills
-        skills_match = re.search(r"AI_ENHANCED_SKILLS_START\s*(.*?)\s*AI_ENHANCED_SKILLS_END", gemini_text_response, re.DOTALL | re.IGNORECASE)
-        if skills_match:
-            enhanced_skills_str = skills_match.group(1).strip()
-            if enhanced_skills_str:
-                enhanced_data['skills'] = [s.strip() for s in enhanced_skills_str.split(',') if s.strip()]
-                print(f"INFO: Successfully parsed and updated skills from Gemini: {enhanced_data['skills']}")
-            else:
-                print("WARNING: 'AI_ENHANCED_SKILLS_START'...'AI_ENHANCED_SKILLS_END' markers found, but content was empty. Skills not updated from AI.")
-        else:
-            print("WARNING: Did NOT find 'AI_ENHANCED_SKILLS_START'...'AI_ENHANCED_SKILLS_END' markers in Gemini response. Skills not updated from AI.")
-        
-        flash("Resume content processed with Gemini AI. Review the generated PDF.", "success")
-        return enhanced_data
-
-    except Exception as e:
-        print(f"ERROR: Error during Gemini API call or processing: {e}")
-        traceback.print_exc()
-        flash(f"An error occurred while communicating with the AI service: {str(e)}. Using basic processing instead.", "error")
-        enhanced_data = copy.deepcopy(original_sections_data) # Fallback
-        error_note = f"\n\n[AI Note (Error: {str(e)[:50]}...): User Prompt was '{user_custom_prompt}'. AI processing failed.]"
-        if 'summary' in enhanced_data:
-            enhanced_data['summary'] = enhanced_data.get('summary', '') + error_note
-        elif 'personal_info' in enhanced_data and isinstance(enhanced_data.get('personal_info'), dict):
-            enhanced_data['personal_info']['summary'] = enhanced_data['personal_info'].get('summary', '') + error_note
-        return enhanced_data
-
-
 # --- Main Application Routes (index, register, login, logout, dashboard) ---
 @app.route('/')
 def index():
@@ -390,7 +307,7 @@ def register():
         if error: 
             return render_template('register.html', username=username, email=email)
 
-        if DB_FUNCTIONS_AVAILABLE and db_connection_active:
+        if db_ready():
             existing_user = get_user_by_username(username) 
             if existing_user:
                 flash('Username already exists. Please choose a different one or login.', 'error')
@@ -418,7 +335,7 @@ def login():
             flash('Username and password are required.', 'error')
             return render_template('login.html', username=username)
 
-        if DB_FUNCTIONS_AVAILABLE and db_connection_active:
+        if db_ready():
             user = get_user_by_username(username) 
             if user and check_password_hash(user['password_hash'], password):
                 session.clear() 
@@ -446,9 +363,13 @@ def logout():
 @login_required
 def dashboard():
     user_searches = []
-    if DB_FUNCTIONS_AVAILABLE and db_connection_active and g.user:
+    if db_ready() and g.user:
         user_searches = get_search_sessions_for_user(str(g.user['_id'])) 
-    return render_template('dashboard.html', user_searches=user_searches)
+    version = content_version([(s.get('session_id'), s.get('created_at'), len(s.get('personalized_jobs') or []),
+                                (s.get('resume_data') or {}).get('score'), (s.get('resume_data') or {}).get('reparsed_at')) # Re-parses change the score shown
+                               for s in user_searches])
+    search_list_html = render_cached_fragment(SEARCH_LIST_FRAGMENT, str(g.user['_id']), version, user_searches=user_searches)
+    return render_template('dashboard.html', user_searches=user_searches, search_list_html=search_list_html)
 
 
 # --- Resume Builder Routes ---
@@ -456,15 +377,17 @@ def dashboard():
 @login_required
 def resume_builder_dashboard():
     user_built_resumes = []
-    if DB_FUNCTIONS_AVAILABLE and db_connection_active:
+    if db_ready():
         user_built_resumes = get_user_resumes(str(g.user['_id'])) 
-    return render_template('resume_builder_dashboard.html', user_resumes=user_built_resumes)
+    version = content_version([(str(r.get('_id')), r.get('resume_name'), r.get('updated_at')) for r in user_built_resumes])
+    resume_list_html = render_cached_fragment(RESUME_LIST_FRAGMENT, str(g.user['_id']), version, user_resumes=user_built_resumes)
+    return render_template('resume_builder_dashboard.html', user_resumes=user_built_resumes, resume_list_html=resume_list_html)
 
 @app.route('/resume-builder/new', methods=['GET', 'POST'])
 @login_required
 def resume_builder_new():
     if request.method == 'POST':
-        if not DB_FUNCTIONS_AVAILABLE or not db_connection_active:
+        if not db_ready():
             return jsonify({"status": "error", "message": "Database unavailable"}), 503 
         try:
             data = request.get_json() 
@@ -489,7 +412,7 @@ def resume_builder_new():
 @app.route('/resume-builder/<resume_id>/edit', methods=['GET', 'POST'])
 @login_required
 def resume_builder_edit(resume_id):
-    if not DB_FUNCTIONS_AVAILABLE or not db_connection_active:
+    if not db_ready():
         if request.method == 'POST': # For AJAX calls
              return jsonify({"status": "error", "message": "Database unavailable"}), 503
         else: # For GET requests
@@ -527,7 +450,7 @@ def resume_builder_edit(resume_id):
 @app.route('/resume-builder/<resume_id>/delete', methods=['POST'])
 @login_required
 def resume_builder_delete(resume_id):
-    if not DB_FUNCTIONS_AVAILABLE or not db_connection_active:
+    if not db_ready():
         flash('Database not available. Cannot delete resume.', 'error')
     else:
         success = delete_user_resume(resume_id, str(g.user['_id'])) 
@@ -541,10 +464,10 @@ def resume_builder_delete(resume_id):
 @app.route('/resume-builder/<resume_id>/download_pdf')
 @login_required
 def resume_builder_download_pdf(resume_id):
-    if not WEASYPRINT_AVAILABLE:
+    if not pdf_renderer.available:
         flash("PDF generation service is currently unavailable. Please try again later.", "error")
         return redirect(url_for('resume_builder_dashboard'))
-    if not DB_FUNCTIONS_AVAILABLE or not db_connection_active:
+    if not db_ready():
         flash('Database not available. Cannot fetch resume data for PDF generation.', 'error')
         return redirect(url_for('resume_builder_dashboard'))
     resume_doc = get_user_resume_by_id(resume_id, str(g.user['_id'])) 
@@ -560,19 +483,20 @@ def resume_builder_download_pdf(resume_id):
                                       resume_doc=resume_doc)
         pdf_stylesheets = []
         css_file_path = os.path.join(app.static_folder, 'css', 'resume_pdf_styles.css') 
-        if os.path.exists(css_file_path) and CSS is not None: 
-            pdf_stylesheets.append(CSS(filename=css_file_path))
+        if os.path.exists(css_file_path) and pdf_renderer.CSS is not None: 
+            pdf_stylesheets.append(pdf_renderer.CSS(filename=css_file_path))
         else:
-            if CSS is not None: 
+            if pdf_renderer.CSS is not None: 
                  print(f"WARNING: PDF CSS file not found at {css_file_path} or CSS class not loaded. Using minimal default styles.")
             basic_pdf_css_string = """
                 @page { size: A4; margin: 1.5cm; }
                 body { font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 10pt; line-height: 1.4; color: #333; }"""
-            if CSS is not None: 
-                pdf_stylesheets.append(CSS(string=basic_pdf_css_string))
-        if HTML is None: 
+            if pdf_renderer.CSS is not None: 
+                pdf_stylesheets.append(pdf_renderer.CSS(string=basic_pdf_css_string))
+        if pdf_renderer.HTML is None: 
             raise ImportError("WeasyPrint HTML class not loaded, cannot generate PDF.")
-        pdf_bytes = HTML(string=html_string, base_url=request.url_root).write_pdf(stylesheets=pdf_stylesheets if pdf_stylesheets else None)
+        with span("pdf.render"):
+            pdf_bytes = pdf_renderer.HTML(string=html_string, base_url=request.url_root).write_pdf(stylesheets=pdf_stylesheets if pdf_stylesheets else None)
         response = make_response(pdf_bytes)
         response.headers['Content-Type'] = 'application/pdf'
         response.headers['Content-Disposition'] = f'attachment; filename="{safe_resume_name}.pdf"'
@@ -594,7 +518,7 @@ def resume_builder_download_pdf(resume_id):
 @app.route('/resume-builder/<resume_id>/enhance', methods=['GET'])
 @login_required
 def resume_builder_enhance_prompt_page(resume_id):
-    if not DB_FUNCTIONS_AVAILABLE or not db_connection_active:
+    if not db_ready():
         flash('Database not available. Cannot load resume for enhancement.', 'error')
         return redirect(url_for('resume_builder_dashboard'))
 
@@ -605,40 +529,108 @@ def resume_builder_enhance_prompt_page(resume_id):
 
     return render_template('resume_builder_enhance_prompt.html', 
                            resume_name=resume_doc.get('resume_name', 'Untitled Resume'),
-                           resume_id=resume_id)
+                           resume_id=resume_id,
+                           job_id=request.args.get('job_id'))
 
 @app.route('/resume-builder/<resume_id>/process-ai', methods=['POST'])
 @login_required
 def resume_builder_process_with_ai(resume_id):
-    if not WEASYPRINT_AVAILABLE:
-        flash("PDF generation service is currently unavailable. Cannot process with AI.", "error")
-        return redirect(url_for('resume_builder_enhance_prompt_page', resume_id=resume_id))
-
-    if not DB_FUNCTIONS_AVAILABLE or not db_connection_active:
-        flash('Database not available. Cannot fetch resume data for AI processing.', 'error')
-        return redirect(url_for('resume_builder_enhance_prompt_page', resume_id=resume_id))
+    """
+    Queues the Gemini enhancement and returns right away. Browsers are sent back to the prompt page,
+    which polls the job and downloads the PDF when it is ready; API clients get the job handle as JSON.
+    """
+    wants_json = request.accept_mimetypes.best == 'application/json'
+    def _fail(message, category, status_code, redirect_to):
+        if wants_json: return jsonify({"status": "error", "message": message}), status_code
+        flash(message, category)
+        return redirect(redirect_to)
+
+    enhance_page = url_for('resume_builder_enhance_prompt_page', resume_id=resume_id)
+    if not pdf_renderer.available:
+        return _fail("PDF generation service is currently unavailable. Cannot process with AI.", "error", 503, enhance_page)
+    if not enhancement.available:
+        return _fail("AI enhancement service is currently unavailable.", "error", 503, enhance_page)
+    if not db_ready():
+        return _fail('Database not available. Cannot fetch resume data for AI processing.', 'error', 503, enhance_page)
 
     user_prompt = request.form.get('user_prompt', '').strip()
     if not user_prompt:
-        flash('Please provide a prompt to guide the AI.', 'warning')
-        return redirect(url_for('resume_builder_enhance_prompt_page', resume_id=resume_id))
+        return _fail('Please provide a prompt to guide the AI.', 'warning', 400, enhance_page)
+
+    original_resume_doc = get_user_resume_by_id(resume_id, str(g.user['_id']))
+    if not original_resume_doc:
+        return _fail('Original resume not found or permission denied.', 'error', 404, url_for('resume_builder_dashboard'))
+
+    job = enhancement.service.submit(original_resume_doc.get('sections', {}), user_prompt,
+                                     owner=f"{g.user['_id']}:{resume_id}")
+    status_url = url_for('resume_builder_ai_job_status', resume_id=resume_id, job_id=job.job_id)
+    pdf_url = url_for('resume_builder_ai_job_pdf', resume_id=resume_id, job_id=job.job_id)
+    if wants_json:
+        return jsonify({"status": "accepted", "job": job.to_status(), "status_url": status_url, "pdf_url": pdf_url}), 202
+    return redirect(url_for('resume_builder_enhance_prompt_page', resume_id=resume_id, job_id=job.job_id))
 
+@app.route('/resume-builder/<resume_id>/ai-jobs/<job_id>')
+@login_required
+def resume_builder_ai_job_status(resume_id, job_id):
+    job = enhancement.service.get(job_id, owner=f"{g.user['_id']}:{resume_id}") if enhancement.available else None
+    if not job:
+        return jsonify({"status": "error", "message": "Enhancement job not found or expired."}), 404
+    return jsonify({"status": "success", "job": job.to_status(),
+                    "pdf_url": url_for('resume_builder_ai_job_pdf', resume_id=resume_id, job_id=job_id)})
+
+@app.route('/resume-builder/<resume_id>/ai-jobs/<job_id>/events')
+@login_required
+def resume_builder_ai_job_events(resume_id, job_id):
+    """
+    Server-sent events for the incremental preview: one `section` event per enhanced section as soon
+    as Gemini closes its marker (sections already completed are replayed first), then a `done` event.
+    """
+    job = enhancement.service.get(job_id, owner=f"{g.user['_id']}:{resume_id}") if enhancement.available else None
+    if not job:
+        return jsonify({"status": "error", "message": "Enhancement job not found or expired."}), 404
+    pdf_url = url_for('resume_builder_ai_job_pdf', resume_id=resume_id, job_id=job_id)
+
+    def _sse(event, data):
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    def event_stream():
+        sent = 0
+        while True:
+            updated = job.wait_for_update(sent, timeout=SSE_HEARTBEAT_SECONDS)
+            finished = job.finished # Read before the snapshot, so updates made before finishing are all in it
+            updates = job.section_updates[sent:] # Updates arriving while we yield are picked up next round
+            for section, value in updates:
+                yield _sse("section", {"section": section, "value": value})
+            sent += len(updates)
+            if finished:
+                yield _sse("done", {"job": job.to_status(), "pdf_url": pdf_url})
+                return
+            if not updated:
+                yield ": keep-alive\n\n" # Stops proxies from closing an idle stream
+
+    return Response(event_stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/resume-builder/<resume_id>/ai-jobs/<job_id>/pdf')
+@login_required
+def resume_builder_ai_job_pdf(resume_id, job_id):
+    job = enhancement.service.get(job_id, owner=f"{g.user['_id']}:{resume_id}") if enhancement.available else None
+    if not job:
+        flash('Enhancement job not found or expired. Please submit your prompt again.', 'warning')
+        return redirect(url_for('resume_builder_enhance_prompt_page', resume_id=resume_id))
+    if job.status in (enhancement.JOB_PENDING, enhancement.JOB_RUNNING):
+        return redirect(url_for('resume_builder_enhance_prompt_page', resume_id=resume_id, job_id=job_id))
+    if not db_ready():
+        flash('Database not available. Cannot fetch resume data for AI processing.', 'error')
+        return redirect(url_for('resume_builder_enhance_prompt_page', resume_id=resume_id))
     original_resume_doc = get_user_resume_by_id(resume_id, str(g.user['_id']))
     if not original_resume_doc:
         flash('Original resume not found or permission denied.', 'error')
         return redirect(url_for('resume_builder_dashboard'))
 
-    original_sections_data = original_resume_doc.get('sections', {})
-    original_resume_name = original_resume_doc.get('resume_name', 'UntitledResume')
-    
-    enhanced_sections_data = call_gemini_to_enhance_resume(original_sections_data, user_prompt)
-    
-    safe_resume_name = secure_filename(original_resume_name + "_AI_Enhanced")
-    
-    print("---- DEBUG: FINAL ENHANCED DATA TO PDF TEMPLATE ----")
-    # import json # Already imported at the top
-    print(json.dumps(enhanced_sections_data, indent=2))
-    print("---- END DEBUG ----")
+    if job.message: flash(job.message, job.category or "info")
+    enhanced_sections_data = job.result
+    safe_resume_name = secure_filename(original_resume_doc.get('resume_name', 'UntitledResume') + "_AI_Enhanced")
 
     try:
         html_string = render_template(RESUME_PDF_TEMPLATE,
@@ -647,17 +639,18 @@ def resume_builder_process_with_ai(resume_id):
                                      )
         pdf_stylesheets = []
         css_file_path = os.path.join(app.static_folder, 'css', 'resume_pdf_styles.css')
-        if WEASYPRINT_AVAILABLE and CSS and os.path.exists(css_file_path):
-            pdf_stylesheets.append(CSS(filename=css_file_path))
-        elif WEASYPRINT_AVAILABLE and CSS:
+        if pdf_renderer.available and pdf_renderer.CSS and os.path.exists(css_file_path):
+            pdf_stylesheets.append(pdf_renderer.CSS(filename=css_file_path))
+        elif pdf_renderer.available and pdf_renderer.CSS:
              print(f"WARNING: PDF CSS file not found at {css_file_path}. Using minimal default styles for AI enhanced PDF.")
              basic_pdf_css_string = "@page { size: A4; margin: 1.5cm; } body { font-family: sans-serif; font-size: 10pt; line-height: 1.4; }"
-             pdf_stylesheets.append(CSS(string=basic_pdf_css_string))
+             pdf_stylesheets.append(pdf_renderer.CSS(string=basic_pdf_css_string))
 
-        if not WEASYPRINT_AVAILABLE or not HTML:
+        if not pdf_renderer.available or not pdf_renderer.HTML:
             raise ImportError("WeasyPrint HTML or CSS components not loaded, cannot generate AI enhanced PDF.")
 
-        pdf_bytes = HTML(string=html_string, base_url=request.url_root).write_pdf(stylesheets=pdf_stylesheets if pdf_stylesheets else None)
+        with span("pdf.render"):
+            pdf_bytes = pdf_renderer.HTML(string=html_string, base_url=request.url_root).write_pdf(stylesheets=pdf_stylesheets if pdf_stylesheets else None)
 
         response = make_response(pdf_bytes)
         response.headers['Content-Type'] = 'application/pdf'
@@ -681,7 +674,7 @@ def resume_builder_process_with_ai(resume_id):
 # --- API and Existing Routes (Resume Parser/Job Scraper) ---
 @app.route('/api/process_resume', methods=['POST'])
 def process_resume_api():
-    if not MODULES_LOADED_SUCCESSFULLY:
+    if not job_scraper.available:
         return jsonify({"status": "error", "message": "Core application modules could not be loaded."}), 500
     if 'resume' not in request.files:
         return jsonify({"status": "error", "message": "No resume file part in the request."}), 400
@@ -689,16 +682,20 @@ def process_resume_api():
     if file.filename == '':
         return jsonify({"status": "error", "message": "No resume file selected."}), 400
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        unique_filename = str(uuid.uuid4()) + "_" + filename
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
+        # The upload was streamed into a spooled buffer (see SpoolingRequest) and is parsed from there;
+        # it is only on disk, as an unlinked temp file, if it exceeded the in-memory threshold.
+        upload = file.stream
         try:
-            file.save(file_path)
             processing_session_id = str(uuid.uuid4())
-            parsed_resume_output = process_resume_file_placeholder(file_path) 
+            resume_hash = getattr(upload, 'content_hash', None)
+            print(f"FLASK_APP: Received resume '{secure_filename(file.filename)}' ({getattr(upload, 'size', '?')} bytes, sha256 {resume_hash})")
+            upload.seek(0)
+            parsed_resume_output = process_resume_file_placeholder(upload) 
             raw_text = parsed_resume_output["raw_resume_text"]
             extracted_skills = parsed_resume_output["extracted_skills"]
             resume_score = parsed_resume_output["resume_score"]
+            if raw_text.startswith("Error: Resume parser busy:"):
+                return jsonify({"status": "error", "message": "The resume parser is busy. Please try again in a moment."}), 503, {'Retry-After': '5'}
             if raw_text.startswith("Error processing resume:") or \
                raw_text.startswith("Error: Resume parser components not available.") or \
                raw_text.startswith("Error: Parser module"):
@@ -707,38 +704,51 @@ def process_resume_api():
                 return jsonify({"status": "error", "message": raw_text}), 400
             personalized_job_results = []
             recommended_job_results = [] 
+            dedup_index = job_scraper.NearDuplicateIndex() # Shared so the same posting is not shown in both lists
             if extracted_skills:
                 print(f"FLASK_APP: Scraping jobs with extracted skills: {extracted_skills[:5]}")
-                personalized_job_results = scrape_jobs( 
-                    keywords=extracted_skills, location=None, max_jobs_per_source=5, skills_json_path=None 
+                personalized_job_results = job_scraper.scrape_jobs( 
+                    keywords=extracted_skills, location=None, max_jobs_per_source=5, skills_json_path=None,
+                    dedup_index=dedup_index
                 )
-            if not personalized_job_results: 
+                if personalized_job_results and db_ready(): # Variants that only the job cache links to each other
+                    personalized_job_results = dedup_against_job_cache(personalized_job_results)
+            if not personalized_job_results and db_ready():
+                # The catalog refresher keeps the cache warm, so prefer it over a live scrape
+                recommended_job_results = get_ranked_recommended_jobs(extracted_skills or job_scraper.PREDEFINED_SKILLS_KEYWORDS[:10], raw_text, limit=10)
+                if recommended_job_results: print(f"FLASK_APP: Serving {len(recommended_job_results)} recommended jobs from the job cache.")
+            recommended_from_cache = bool(recommended_job_results)
+            if not personalized_job_results and not recommended_job_results: 
                 print("FLASK_APP: No personalized jobs found, scraping with recommended keywords.")
-                recommended_job_results = scrape_jobs( 
-                    keywords=PREDEFINED_SKILLS_KEYWORDS[:10], location=None, max_jobs_per_source=3, skills_json_path=None
+                recommended_job_results = job_scraper.scrape_jobs( 
+                    keywords=job_scraper.PREDEFINED_SKILLS_KEYWORDS[:10], location=None, max_jobs_per_source=3, skills_json_path=None,
+                    dedup_index=dedup_index, priority="low" # Generic fallback search must not eat the interactive quota reserve
                 )
+            if job_ranker.available:
+                personalized_job_results = job_ranker.rank_jobs(personalized_job_results, extracted_skills, raw_text)
+                recommended_job_results = job_ranker.rank_jobs(recommended_job_results, extracted_skills, raw_text)
             current_user_id = str(g.user['_id']) if g.user else None
-            if DB_FUNCTIONS_AVAILABLE and db_connection_active:
+            if db_ready():
                 save_personalized_search_session( 
                     session_id=processing_session_id,
                     resume_score=resume_score,
                     extracted_skills=extracted_skills,
                     personalized_job_results=personalized_job_results,
                     raw_resume_text=raw_text,
-                    user_id=current_user_id
+                    user_id=current_user_id,
+                    resume_sha256=resume_hash
                 )
-                if recommended_job_results: 
-                    for job in recommended_job_results:
-                        save_recommended_job(job_data=job, source_keywords=PREDEFINED_SKILLS_KEYWORDS[:10]) 
+                if recommended_job_results and not recommended_from_cache: 
+                    bulk_upsert_recommended_jobs(recommended_job_results, source_keywords=job_scraper.PREDEFINED_SKILLS_KEYWORDS[:10]) 
             else: 
-                session_key_for_temp_results = 'temp_results_' + processing_session_id
-                session[session_key_for_temp_results] = {
+                temp_results_store_key = temp_results_key(processing_session_id, create=True)
+                results_store.put(temp_results_store_key, {
                     'search_id': processing_session_id,
                     'resume_data': {'resume_score': resume_score, 'extracted_skills': extracted_skills, 'raw_text': raw_text},
                     'personalized_jobs': personalized_job_results,
                     'recommended_jobs': recommended_job_results 
-                }
-                print(f"FLASK_APP: Saved results to session key: {session_key_for_temp_results}")
+                })
+                print(f"FLASK_APP: Saved temporary results to the results store: {temp_results_store_key}")
             return jsonify({
                 "status": "success",
                 "data": {
@@ -754,52 +764,125 @@ def process_resume_api():
             traceback.print_exc() 
             return jsonify({"status": "error", "message": f"An internal server error occurred: {str(e)}"}), 500
         finally:
-            if 'file_path' in locals() and os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except Exception as e_remove:
-                    print(f"Error removing uploaded file {file_path}: {e_remove}")
+            file.close()
     else:
         return jsonify({"status": "error", "message": "Invalid file type. Allowed: PDF, DOC, DOCX."}), 400
 
 @app.route('/results_page/<search_id>')
 def show_results_page(search_id):
     search_data = None; source = "Database"; can_clear_from_db = False
-    if DB_FUNCTIONS_AVAILABLE and db_connection_active:
-        search_data = get_personalized_search_session(search_id) 
-    if not search_data and ('temp_results_' + search_id) in session: 
+    if db_ready():
+        search_data = get_search_session_summary(search_id) # Jobs are paged in below, not loaded whole
+    temp_results = get_temp_results(search_id) if not search_data else None
+    if temp_results: 
         flash("Displaying temporary results as database is unavailable or data not found in DB.", "warning")
-        search_data = session['temp_results_' + search_id]; source = "Temporary Session"; can_clear_from_db = False
+        search_data = temp_results; source = "Temporary Session"; can_clear_from_db = False
     if not search_data:
         flash('No results found for this search ID, or the session has expired.', 'error')
         recommended_jobs_fallback_display = []
-        if DB_FUNCTIONS_AVAILABLE and db_connection_active: 
-            recommended_jobs_fallback_display = get_recommended_jobs_by_keywords(PREDEFINED_SKILLS_KEYWORDS[:5], limit=10) 
+        if db_ready(): 
+            recommended_jobs_fallback_display = get_recommended_jobs_by_keywords(job_scraper.PREDEFINED_SKILLS_KEYWORDS[:5], limit=10) 
         return render_template('idx2.html', error_message='Search results not found.', resume_data_display=None,
                                jobs_display=None, recommended_jobs_display=recommended_jobs_fallback_display,
                                search_id_display=search_id, results_source = "Fallback/Not Found")
     resume_data_display = search_data.get('resume_data', {})
     if 'score' in resume_data_display and 'resume_score' not in resume_data_display:
         resume_data_display['resume_score'] = resume_data_display.pop('score')
-    personalized_jobs_display = search_data.get('personalized_jobs', [])
-    recommended_jobs_display = search_data.get('recommended_jobs', []) 
+    if source == "Database":
+        first_page, total_jobs = get_search_session_jobs_page(search_id, 0, JOB_PAGE_SIZE)
+    else:
+        first_page, total_jobs = page_jobs(search_results_jobs(search_data), 0, JOB_PAGE_SIZE)
     if source == "Database" and search_data.get('user_id') and g.user and \
        str(search_data.get('user_id')) == str(g.user['_id']):
         can_clear_from_db = True
-    if not personalized_jobs_display and not recommended_jobs_display and DB_FUNCTIONS_AVAILABLE and db_connection_active:
-        skills_for_rec = resume_data_display.get('extracted_skills', PREDEFINED_SKILLS_KEYWORDS[:5]) 
+    if not total_jobs and db_ready():
+        skills_for_rec = resume_data_display.get('extracted_skills', job_scraper.PREDEFINED_SKILLS_KEYWORDS[:5]) 
         if skills_for_rec: 
-            recommended_jobs_display = get_recommended_jobs_by_keywords(skills_for_rec, limit=10) 
-            if recommended_jobs_display: source += " (plus fresh recommended)" if source == "Database" else " (fresh recommended)"
-    return render_template('idx2.html', resume_data_display=resume_data_display, jobs_display=personalized_jobs_display,
-                           recommended_jobs_display=recommended_jobs_display, search_id_display=search_id,
-                           results_source = source, can_clear_this_result = can_clear_from_db)
+            recommended_jobs = get_ranked_recommended_jobs(skills_for_rec, resume_data_display.get('raw_text'), limit=10) 
+            # Not part of the saved search, so there is no full text to fetch later and nothing more to page
+            first_page = [summarize_job(job, None) for job in recommended_jobs]
+            if first_page: source += " (plus fresh recommended)" if source == "Database" else " (fresh recommended)"
+    jobs_next_cursor = next_cursor(0, len(first_page), total_jobs) if total_jobs else None
+    # Saved results don't change after the search, so the first page is keyed by search_id plus the job URLs shown
+    version = content_version(search_data.get('created_at'), total_jobs, [j.get('url') for j in first_page])
+    job_cards_html = render_cached_fragment(JOB_CARDS_FRAGMENT, search_id, version, jobs=first_page)
+    return render_template('idx2.html', resume_data_display=resume_data_display, search_id_display=search_id,
+                           results_source = source, can_clear_this_result = can_clear_from_db, job_cards_html=job_cards_html,
+                           jobs_next_cursor=jobs_next_cursor, jobs_total=total_jobs)
+
+def search_results_jobs(search_data: dict) -> list:
+    """Job list of a session-stored search, in the order positions refer to."""
+    return (search_data.get('personalized_jobs') or []) + (search_data.get('recommended_jobs') or [])
+
+@app.route('/api/searches/<search_id>/jobs')
+def search_jobs_api(search_id):
+    """Pages through a saved search's jobs: ?cursor=&limit=&source=&skill=&sort=relevance|date."""
+    try:
+        page_args = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    temp_results = None
+    if not (db_ready() and get_search_session_summary(search_id)):
+        temp_results = get_temp_results(search_id)
+        if not temp_results:
+            return jsonify({"status": "error", "message": "Search not found."}), 404
+    if temp_results:
+        jobs, total = page_jobs(search_results_jobs(temp_results), **page_args)
+    else:
+        jobs, total = get_search_session_jobs_page(search_id, **page_args)
+    return jsonify({"status": "success", "data": {
+        "jobs": jobs, "total": total, "next_cursor": next_cursor(page_args['offset'], len(jobs), total)
+    }})
+
+@app.route('/api/searches/<search_id>/jobs/<int:position>')
+def search_job_detail_api(search_id, position):
+    """The full job, description included, for a card's "show full description"."""
+    job = None
+    if db_ready():
+        job = get_search_session_job(search_id, position)
+    temp_results = get_temp_results(search_id) if job is None else None
+    if temp_results:
+        jobs = search_results_jobs(temp_results)
+        job = jobs[position] if position < len(jobs) else None
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found."}), 404
+    return jsonify({"status": "success", "data": {"job": job, "position": position}})
+
+@app.route('/metrics')
+def metrics():
+    """Span latency histograms in Prometheus text format (?format=json for count/sum/p50/p95 per span)."""
+    if request.args.get('format') == 'json':
+        return jsonify({"status": "success", "spans": metrics_registry.snapshot()})
+    return Response(metrics_registry.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/logging', methods=['GET', 'POST'])
+def logging_admin():
+    """
+    Current log levels and trace sample rates; POST {"levels": "parser.contact=DEBUG", "sample_rates": {"parser": 0.05}}
+    changes them in this worker without a restart. Requires the X-Admin-Token header to match LOG_ADMIN_TOKEN.
+    """
+    if not LOG_ADMIN_TOKEN or not secrets.compare_digest(request.headers.get('X-Admin-Token', ''), LOG_ADMIN_TOKEN):
+        return jsonify({"status": "error", "message": "Not found."}), 404
+    if request.method == 'POST':
+        payload = request.get_json(silent=True) or {}
+        try:
+            if payload.get('levels'): set_log_levels(payload['levels'])
+            if payload.get('sample_rates'): set_trace_sample_rates(payload['sample_rates'])
+        except (ValueError, TypeError) as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"status": "success", **logging_status()})
+
+@app.route('/api/source_quota')
+@login_required
+def source_quota_api():
+    """Remaining API budget per job source for the current quota window."""
+    return jsonify({"status": "success", "sources": get_quota_metrics()})
 
 @app.route('/clear_session_results/<search_id>')
 @login_required
 def clear_session_data_route(search_id):
     deletion_status = "error"; search_doc_for_permission_check = None
-    if DB_FUNCTIONS_AVAILABLE and db_connection_active:
+    if db_ready():
         search_doc_for_permission_check = get_personalized_search_session(search_id) 
         if search_doc_for_permission_check and \
            search_doc_for_permission_check.get('user_id') and \
@@ -810,6 +893,7 @@ def clear_session_data_route(search_id):
             elif deletion_status == "retained": flash(f'Search results (ID: {search_id}) are recent and retained in database.', 'info')
             elif deletion_status == "not_found": flash(f'Could not clear from database (ID: {search_id}). Record not found or already cleared.', 'warning')
             else: flash(f'Error clearing results from database (ID: {search_id}).', 'error')
+            if deletion_status == "deleted": fragment_cache.discard_owner(search_id) # Drop its cached job cards
         elif search_doc_for_permission_check: 
             flash(f'You do not have permission to clear database results for ID {search_id}.', 'error')
             deletion_status = "permission_denied"
@@ -819,9 +903,8 @@ def clear_session_data_route(search_id):
     else: 
         flash('Database unavailable. Cannot clear results from database.', 'error')
         deletion_status = "db_unavailable"
-    temp_session_key = 'temp_results_' + search_id; cleared_temp = False
-    if temp_session_key in session:
-        session.pop(temp_session_key, None)
+    temp_key = temp_results_key(search_id); cleared_temp = False
+    if temp_key and results_store.delete(temp_key):
         cleared_temp = True
     if cleared_temp and deletion_status not in ["deleted", "retained", "permission_denied"]:
         flash(f'Temporary cached results for ID {search_id} cleared from this browser session.', 'success')
@@ -834,12 +917,8 @@ def clear_session_data_route(search_id):
 
 
 if __name__ == '__main__':
-    if not MODULES_LOADED_SUCCESSFULLY:
-        print("WARNING: One or more core project modules could not be loaded. Application functionality may be limited.")
-    if DB_FUNCTIONS_AVAILABLE and not db_connection_active:
+    if DB_FUNCTIONS_AVAILABLE and not db_ready():
         print("WARNING: Database Manager was loaded, but connection to MongoDB failed during app startup. DB features will be impacted.")
     elif not DB_FUNCTIONS_AVAILABLE:
          print("WARNING: Database Manager module not loaded. Database operations will be skipped.")
     app.run(debug=True, port=5001)
-
-
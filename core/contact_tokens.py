@@ -0,0 +1,52 @@
+import re
+from dataclasses import dataclass
+from typing import List
+
+# --- Configuration & Constants ---
+# Emails, phone numbers and profile/web URLs are found with one combined regex in a single pass.
+# Where two alternatives could start at the same position, the one listed first wins, and the
+# order is chosen so that this is also the longest match: a generic URL is tried before a bare
+# "linkedin.com/in/..." and is then typed by its host, and an email is tried before a phone number.
+URL_PATTERN = r'\b(?:https?://|www\.)[\w\.-]+(?:\.[a-zA-Z]{2,63})+(?:/[\w%\.\-\=\&\?\!\*~(),$]*)*\b'
+LINKEDIN_PATTERN = r'\b(?:https?://)?(?:www\.)?linkedin\.com/in/[\w%\.-]+/?\b'
+GITHUB_PATTERN = r'\b(?:https?://)?(?:www\.)?github\.com/[\w%\.-]+/?\b'
+LEETCODE_PATTERN = r'\b(?:https?://)?(?:www\.)?leetcode\.com/u/[\w%\.-]+/?\b'
+EMAIL_PATTERN = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
+PHONE_PATTERN = r'\b(?:\+91[ -]?)?(?:[6-9]\d{9}|[6-9]\d{2}[ -]?\d{3}[ -]?\d{4})\b'
+
+CONTACT_TOKEN_RE = re.compile("|".join(f"(?P<{kind}>{pattern})" for kind, pattern in (
+    ('url', URL_PATTERN), ('linkedin', LINKEDIN_PATTERN), ('github', GITHUB_PATTERN), ('leetcode', LEETCODE_PATTERN),
+    ('email', EMAIL_PATTERN), ('phone', PHONE_PATTERN))), re.IGNORECASE)
+PROFILE_HOSTS = (('linkedin.com/in/', 'linkedin'), ('github.com/', 'github'), ('leetcode.com/u/', 'leetcode'))
+
+# spaCy entity labels for each kind, as the old entity-ruler patterns labelled them
+ENTITY_LABELS = {'email': 'EMAIL', 'phone': 'PHONE', 'linkedin': 'LINKEDIN_URL', 'github': 'GITHUB_URL', 'leetcode': 'URL', 'url': 'URL'}
+
+
+@dataclass(slots=True, frozen=True)
+class ContactToken:
+    kind: str # 'email' | 'phone' | 'linkedin' | 'github' | 'leetcode' | 'url'
+    start: int
+    end: int
+    text: str
+
+
+def tokenize_contacts(text: str) -> List[ContactToken]:
+    """Non-overlapping contact tokens in `text`, left to right."""
+    tokens = []
+    for match in CONTACT_TOKEN_RE.finditer(text):
+        kind, value = match.lastgroup, match.group(0)
+        if kind == 'url':
+            lowered = value.lower()
+            kind = next((profile_kind for host, profile_kind in PROFILE_HOSTS if host in lowered), 'url')
+        tokens.append(ContactToken(kind, match.start(), match.end(), value))
+    return tokens
+
+def space_contact_tokens(line: str) -> str:
+    """Puts single spaces around every contact token so the tokenizer and NER see them as separate words."""
+    parts, position = [], 0
+    for token in tokenize_contacts(line):
+        parts.append(line[position:token.start]); parts.append(token.text)
+        position = token.end
+    parts.append(line[position:])
+    return " ".join(part.strip() for part in parts if part.strip())
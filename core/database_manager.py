@@ -4,6 +4,18 @@ from pymongo.server_api import ServerApi
 from dotenv import load_dotenv
 from datetime import datetime, timezone, timedelta
 from bson import ObjectId
+try:
+    from core.job_deduplicator import fingerprint_job, NearDuplicateIndex
+    from core.job_record import JobRecord
+    from core.job_pagination import JOB_PAGE_SIZE, DESCRIPTION_SNIPPET_CHARS, SUMMARY_FIELDS
+    from core.instrumentation import MongoCommandTimer
+except ImportError: # Allows running this file directly from inside core/
+    from job_deduplicator import fingerprint_job, NearDuplicateIndex
+    from job_record import JobRecord
+    from job_pagination import JOB_PAGE_SIZE, DESCRIPTION_SNIPPET_CHARS, SUMMARY_FIELDS
+    from instrumentation import MongoCommandTimer
+import re
+import hashlib
 
 # Load environment variables (e.g., for MONGO_URI)
 load_dotenv()
@@ -13,6 +25,10 @@ MONGO_URI = os.environ.get("MONGO_ATLAS_URI") # Your MongoDB Atlas connection st
 DB_NAME = "job_matching_app" # Or your preferred database name
 PERSONALIZED_SEARCH_COLLECTION = "personalized_searches"
 RECOMMENDED_JOBS_COLLECTION = "recommended_jobs_cache"
+CATALOG_REFRESH_COLLECTION = "job_catalog_refreshes" # Freshness record per refresher query
+JOB_CHECKPOINT_COLLECTION = "maintenance_checkpoints" # Resume points of long-running maintenance jobs (bulk re-parse, ...)
+RECOMMENDED_JOB_EXPIRY_DAYS = int(os.environ.get("RECOMMENDED_JOB_EXPIRY_DAYS", 7)) # Postings not seen by any refresh for this long are expired
+RECOMMENDED_JOB_PURGE_DAYS = int(os.environ.get("RECOMMENDED_JOB_PURGE_DAYS", 30)) # Expired postings are deleted after this long
 USER_COLLECTION = "users"
 # New collection for the Resume Builder
 USER_RESUMES_COLLECTION = "user_resumes" # Added for resume builder
@@ -43,7 +59,7 @@ def connect_db():
 
     try:
         print("Attempting to connect to MongoDB Atlas...")
-        client = MongoClient(MONGO_URI, server_api=ServerApi('1'))
+        client = MongoClient(MONGO_URI, server_api=ServerApi('1'), event_listeners=[MongoCommandTimer()]) # Times every command as a mongo.<command> span
         client.admin.command('ping')
         print("Successfully connected to MongoDB Atlas!")
         db = client[DB_NAME]
@@ -111,7 +127,8 @@ def get_user_by_id(user_id):
 # (Existing functions: save_personalized_search_session, get_personalized_search_session,
 #  get_search_sessions_for_user, delete_personalized_search_session - remain unchanged)
 def save_personalized_search_session(session_id: str, resume_score: float, extracted_skills: list,
-                                   personalized_job_results: list, raw_resume_text: str = None, user_id: str = None):
+                                   personalized_job_results: list, raw_resume_text: str = None, user_id: str = None,
+                                   resume_sha256: str = None):
     """
     Saves or updates a document containing resume data and personalized job results
     for a specific session, potentially linked to a user.
@@ -136,6 +153,8 @@ def save_personalized_search_session(session_id: str, resume_score: float, extra
         }
         if user_id: # Link to user if user_id is provided
             search_document["user_id"] = ObjectId(user_id)
+        if resume_sha256: # Hash of the uploaded file, computed while it was received
+            search_document["resume_sha256"] = resume_sha256
 
         result = collection.update_one(
             {"session_id": session_id},
@@ -170,6 +189,79 @@ def get_personalized_search_session(session_id: str):
         print(f"Error retrieving personalized search session for '{session_id}': {e}")
         return None
 
+def iter_search_session_resume_texts(after_id=None, batch_size: int = 200, limit: int = None):
+    """
+    Yields lists of {'_id', 'raw_text'} for search sessions that kept their resume text, in `_id` order
+    and starting after `after_id`. Documents are streamed with a cursor, `batch_size` at a time, so the
+    collection is never loaded into memory. Database errors are raised so the caller can stop and resume.
+    """
+    database = connect_db()
+    query = {"resume_data.raw_text": {"$type": "string", "$ne": ""}}
+    if after_id is not None: query["_id"] = {"$gt": after_id}
+    cursor = database[PERSONALIZED_SEARCH_COLLECTION].find(query, {"resume_data.raw_text": 1}).sort("_id", 1).batch_size(batch_size)
+    if limit: cursor = cursor.limit(limit)
+    batch = []
+    for doc in cursor:
+        batch.append({'_id': doc['_id'], 'raw_text': doc['resume_data']['raw_text']})
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch: yield batch
+
+def count_search_session_resume_texts(after_id=None) -> int:
+    try:
+        database = connect_db()
+        query = {"resume_data.raw_text": {"$type": "string", "$ne": ""}}
+        if after_id is not None: query["_id"] = {"$gt": after_id}
+        return database[PERSONALIZED_SEARCH_COLLECTION].count_documents(query)
+    except Exception as e:
+        print(f"Error counting search sessions with resume text: {e}")
+        return 0
+
+def bulk_update_search_session_resume_data(updates: list[dict], parser_run: str = None) -> dict:
+    """
+    Writes re-parsed results back with a single bulk_write. Each update is {'_id', 'score', 'extracted_skills'};
+    only those fields (plus `reparsed_at` and the `parser_run` label) change, the stored jobs are left alone.
+    Returns counts: {'matched', 'modified'}. Errors are raised, so a job never checkpoints past a failed write.
+    """
+    if not updates: return {'matched': 0, 'modified': 0}
+    database = connect_db()
+    now = datetime.now(timezone.utc)
+    operations = []
+    for update in updates:
+        fields = {"resume_data.score": update['score'], "resume_data.extracted_skills": update['extracted_skills'], "resume_data.reparsed_at": now}
+        if parser_run: fields["resume_data.parser_run"] = parser_run
+        operations.append(UpdateOne({"_id": update['_id']}, {"$set": fields}))
+    result = database[PERSONALIZED_SEARCH_COLLECTION].bulk_write(operations, ordered=False)
+    return {'matched': result.matched_count, 'modified': result.modified_count}
+
+def save_job_checkpoint(job_name: str, state: dict):
+    """Stores the resume point of a maintenance job (e.g. the last processed `_id` and running totals)."""
+    try:
+        database = connect_db()
+        database[JOB_CHECKPOINT_COLLECTION].update_one(
+            {"job_name": job_name},
+            {"$set": {**state, "job_name": job_name, "updated_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"Error saving checkpoint for job '{job_name}': {e}")
+
+def get_job_checkpoint(job_name: str) -> dict:
+    try:
+        database = connect_db()
+        return database[JOB_CHECKPOINT_COLLECTION].find_one({"job_name": job_name}, {"_id": 0}) or {}
+    except Exception as e:
+        print(f"Error retrieving checkpoint for job '{job_name}': {e}")
+        return {}
+
+def clear_job_checkpoint(job_name: str):
+    try:
+        database = connect_db()
+        database[JOB_CHECKPOINT_COLLECTION].delete_one({"job_name": job_name})
+    except Exception as e:
+        print(f"Error clearing checkpoint for job '{job_name}': {e}")
+
 def get_search_sessions_for_user(user_id: str, limit: int = 10):
     """Retrieves all personalized search sessions for a given user_id, sorted by creation date."""
     if not user_id:
@@ -186,6 +278,84 @@ def get_search_sessions_for_user(user_id: str, limit: int = 10):
         return []
 
 
+def get_search_session_summary(session_id: str):
+    """
+    The search session without its job list: resume data, created_at, user_id and `job_count`.
+    Lets the results page render without pulling every job (and description) out of the database.
+    """
+    if not session_id:
+        print("ERROR: session_id is required to retrieve personalized search.")
+        return None
+    try:
+        database = connect_db()
+        collection = database[PERSONALIZED_SEARCH_COLLECTION]
+        documents = list(collection.aggregate([
+            {"$match": {"session_id": session_id}},
+            {"$project": {"session_id": 1, "resume_data": 1, "created_at": 1, "user_id": 1,
+                          "job_count": {"$size": {"$ifNull": ["$personalized_jobs", []]}}}}
+        ]))
+        if not documents:
+            print(f"No personalized search session found for '{session_id}'.")
+            return None
+        document = documents[0]
+        if 'resume_data' in document and 'score' not in document['resume_data'] and 'resume_score' in document['resume_data']:
+            document['resume_data']['score'] = document['resume_data'].pop('resume_score')
+        return document
+    except Exception as e:
+        print(f"Error retrieving personalized search summary for '{session_id}': {e}")
+        return None
+
+def get_search_session_jobs_page(session_id: str, offset: int = 0, limit: int = JOB_PAGE_SIZE, source: str = None,
+                                 skill: str = None, sort: str = "relevance") -> tuple[list[dict], int]:
+    """
+    One page of a search's personalized jobs, filtered by source site and/or skill, in saved
+    (relevance) order or newest first. Descriptions are cut to a snippet inside the aggregation, so
+    only the page's summaries leave the database. Returns (jobs, total matching the filters).
+    """
+    pipeline = [
+        {"$match": {"session_id": session_id}},
+        {"$project": {"_id": 0, "job": "$personalized_jobs"}},
+        {"$unwind": {"path": "$job", "includeArrayIndex": "position"}}
+    ]
+    if source:
+        pipeline.append({"$match": {"job.source_site": {"$regex": f"^{re.escape(source)}$", "$options": "i"}}})
+    if skill:
+        pipeline.append({"$match": {"job.extracted_skills": {"$regex": f"^{re.escape(skill)}$", "$options": "i"}}})
+    sort_spec = {"job.publication_date": -1, "position": 1} if sort == "date" else {"position": 1}
+    summary_projection = {field: f"$job.{field}" for field in SUMMARY_FIELDS}
+    summary_projection.update({
+        "_id": 0, "position": 1,
+        "extracted_skills": {"$ifNull": ["$job.extracted_skills", []]},
+        "description_text": {"$substrCP": [{"$ifNull": ["$job.description_text", ""]}, 0, DESCRIPTION_SNIPPET_CHARS]},
+        "description_truncated": {"$gt": [{"$strLenCP": {"$ifNull": ["$job.description_text", ""]}}, DESCRIPTION_SNIPPET_CHARS]}
+    })
+    pipeline.append({"$facet": {
+        "total": [{"$count": "count"}],
+        "jobs": [{"$sort": sort_spec}, {"$skip": offset}, {"$limit": limit}, {"$project": summary_projection}]
+    }})
+    try:
+        database = connect_db()
+        result = next(database[PERSONALIZED_SEARCH_COLLECTION].aggregate(pipeline), None) or {}
+        total = result['total'][0]['count'] if result.get('total') else 0
+        return result.get('jobs', []), total
+    except Exception as e:
+        print(f"Error paging jobs for search session '{session_id}': {e}")
+        return [], 0
+
+def get_search_session_job(session_id: str, position: int):
+    """The full job (description included) at `position` in a search's personalized job list."""
+    try:
+        database = connect_db()
+        documents = list(database[PERSONALIZED_SEARCH_COLLECTION].aggregate([
+            {"$match": {"session_id": session_id}},
+            {"$project": {"_id": 0, "job": {"$arrayElemAt": [{"$ifNull": ["$personalized_jobs", []]}, position]}}}
+        ]))
+        return documents[0].get('job') if documents else None
+    except Exception as e:
+        print(f"Error retrieving job {position} of search session '{session_id}': {e}")
+        return None
+
+
 def delete_personalized_search_session(session_id: str):
     """
     Deletes the personalized search session data for a given session_id,
@@ -233,30 +403,112 @@ def delete_personalized_search_session(session_id: str):
         return "error"
 
 # --- Recommended Job Results ---
-# (Existing functions: save_recommended_job, get_recommended_jobs_by_keywords - remain unchanged)
+# The cache is kept warm by core/job_catalog_refresher.py; interactive requests only read it.
+_recommended_job_indexes_ready = False
+
+def _ensure_recommended_job_indexes(collection):
+    """Creates the indexes used for URL lookups and near-duplicate (LSH band) lookups, once per process."""
+    global _recommended_job_indexes_ready
+    if _recommended_job_indexes_ready: return
+    try:
+        collection.create_index("job_details.url")
+        collection.create_index("dedup.bands")
+        collection.create_index("dedup.title_company_key")
+        collection.create_index("dedup.exact_key")
+        collection.create_index("last_seen_at")
+        collection.create_index([("expired_at", 1), ("_id", 1)])
+        collection.create_index([("last_updated_at", 1), ("_id", 1)])
+        collection.create_index("job_details.published_at")
+        _recommended_job_indexes_ready = True
+    except Exception as e:
+        print(f"WARNING: Could not ensure indexes on '{RECOMMENDED_JOBS_COLLECTION}': {e}")
+
+def _cached_dedup_candidates(collection, fingerprints: list[dict], urls: list = (), limit: int = 50) -> tuple[NearDuplicateIndex, list]:
+    """
+    NearDuplicateIndex over the cached jobs sharing a URL, LSH band, title/company or exact key
+    with `fingerprints`, and the cached _id at each index position.
+    """
+    or_clauses = []
+    urls = [url for url in urls if url]
+    if urls: or_clauses.append({"job_details.url": {"$in": urls}})
+    for field, values in (('bands', [band for fp in fingerprints for band in fp.get('bands') or []]),
+                          ('title_company_key', [fp['title_company_key'] for fp in fingerprints if fp.get('title_company_key')]),
+                          ('exact_key', [fp['exact_key'] for fp in fingerprints if fp.get('exact_key')])):
+        if values: or_clauses.append({f"dedup.{field}": {"$in": sorted(set(values))}})
+    index, ids = NearDuplicateIndex(), []
+    if not or_clauses: return index, ids
+    for candidate in collection.find({"$or": or_clauses, "dedup": {"$exists": True}}, {"dedup": 1, "job_details.url": 1}).limit(limit * max(len(fingerprints), 1)):
+        index.add(candidate['dedup'], (candidate.get('job_details') or {}).get('url'))
+        ids.append(candidate['_id'])
+    return index, ids
+
+def _find_cached_near_duplicate(collection, fingerprint: dict):
+    """Returns the _id of a cached job that is a near-duplicate of `fingerprint`, or None."""
+    candidates, ids = _cached_dedup_candidates(collection, [fingerprint])
+    position = candidates.find_duplicate(fingerprint)
+    return ids[position] if position is not None else None
+
+def dedup_against_job_cache(jobs: list[dict]) -> list[dict]:
+    """
+    Drops jobs that are the same cached posting as an earlier job in the list. Two results from
+    different sources may not match each other directly but both match the posting cached by an
+    earlier search; the cache ties them together. One query for the whole list; returns `jobs`
+    unchanged if the database is unavailable.
+    """
+    if len(jobs) < 2: return jobs
+    try:
+        collection = connect_db()[RECOMMENDED_JOBS_COLLECTION]
+        fingerprints = [fingerprint_job(job) for job in jobs]
+        urls = [(job.get('url') or "").strip() or None for job in jobs]
+        candidates, ids = _cached_dedup_candidates(collection, fingerprints, urls)
+        seen_ids, unique_jobs = set(), []
+        for job, fingerprint, url in zip(jobs, fingerprints, urls):
+            position = candidates.find_duplicate(fingerprint, url)
+            cached_id = ids[position] if position is not None else None
+            if cached_id is not None and cached_id in seen_ids: continue
+            if cached_id is not None: seen_ids.add(cached_id)
+            unique_jobs.append(job)
+        if len(unique_jobs) < len(jobs): print(f"Dropped {len(jobs) - len(unique_jobs)} jobs duplicating a cached posting.")
+        return unique_jobs
+    except Exception as e:
+        print(f"Error deduplicating jobs against the job cache: {e}")
+        return jobs
+
 def save_recommended_job(job_data: dict, source_keywords: list):
-    """Saves or updates a recommended job in the cache."""
+    """
+    Saves or updates a recommended job in the cache.
+    The job's MinHash fingerprint is stored under `dedup`; a job that is a near-duplicate of an
+    already cached posting (same job re-listed by another source under a different URL)
+    updates that document instead of creating a second one.
+    """
     if not job_data or not job_data.get('url'):
         print("ERROR: Job data with a URL is required to save a recommended job.")
         return None
     try:
         database = connect_db()
         collection = database[RECOMMENDED_JOBS_COLLECTION]
-        job_document = {
-            "job_details": job_data,
-            "source_keywords": source_keywords,
-            "first_seen_at": datetime.now(timezone.utc),
-            "last_updated_at": datetime.now(timezone.utc)
-        }
+        _ensure_recommended_job_indexes(collection)
+        fingerprint = fingerprint_job(job_data)
+
+        match_filter = {"job_details.url": job_data['url']}
+        if collection.count_documents(match_filter, limit=1) == 0:
+            duplicate_id = _find_cached_near_duplicate(collection, fingerprint)
+            if duplicate_id is not None:
+                match_filter = {"_id": duplicate_id}
+                print(f"Recommended job '{job_data['url']}' is a near-duplicate of cached job {duplicate_id}. Updating it instead.")
+
         result = collection.update_one(
-            {"job_details.url": job_data['url']},
+            match_filter,
             {
                 "$set": {
-                    "job_details": job_data,
+                    "job_details": JobRecord.from_dict(job_data).to_bson(),
                     "source_keywords": source_keywords,
-                    "last_updated_at": datetime.now(timezone.utc)
+                    "dedup": fingerprint,
+                    "last_updated_at": datetime.now(timezone.utc),
+                    "last_seen_at": datetime.now(timezone.utc)
                 },
-                "$setOnInsert": {"first_seen_at": datetime.now(timezone.utc)}
+                "$setOnInsert": {"first_seen_at": datetime.now(timezone.utc)},
+                "$unset": {"expired_at": ""}
             },
             upsert=True
         )
@@ -269,6 +521,127 @@ def save_recommended_job(job_data: dict, source_keywords: list):
         print(f"Error saving recommended job '{job_data.get('url')}': {e}")
         return None
 
+def bulk_upsert_recommended_jobs(jobs: list[dict], source_keywords: list, query_key: str = None) -> dict:
+    """
+    Upserts a batch of jobs into the recommended cache with a single bulk_write.
+    Unlike save_recommended_job, keywords accumulate ($addToSet) so a posting found by several
+    refresher queries stays reachable from all of them. Existing URLs are looked up in one query;
+    only jobs with new URLs are checked against cached near-duplicates.
+    Returns counts: {'matched', 'modified', 'upserted'}.
+    """
+    stats = {'matched': 0, 'modified': 0, 'upserted': 0}
+    jobs = [job for job in jobs if job and job.get('url')]
+    if not jobs: return stats
+    try:
+        database = connect_db()
+        collection = database[RECOMMENDED_JOBS_COLLECTION]
+        _ensure_recommended_job_indexes(collection)
+        now = datetime.now(timezone.utc)
+        urls = [job['url'] for job in jobs]
+        known_urls = {doc['job_details']['url'] for doc in collection.find({"job_details.url": {"$in": urls}}, {"job_details.url": 1})}
+
+        operations = []
+        for job in jobs:
+            fingerprint = fingerprint_job(job)
+            match_filter = {"job_details.url": job['url']}
+            if job['url'] not in known_urls:
+                duplicate_id = _find_cached_near_duplicate(collection, fingerprint)
+                if duplicate_id is not None: match_filter = {"_id": duplicate_id}
+            update = {
+                "$set": {"job_details": JobRecord.from_dict(job).to_bson(), "dedup": fingerprint, "last_updated_at": now, "last_seen_at": now},
+                "$addToSet": {"source_keywords": {"$each": list(source_keywords or [])}},
+                "$setOnInsert": {"first_seen_at": now},
+                "$unset": {"expired_at": ""}
+            }
+            if query_key: update["$addToSet"]["refresh_queries"] = query_key
+            operations.append(UpdateOne(match_filter, update, upsert=True))
+
+        result = collection.bulk_write(operations, ordered=False)
+        stats = {'matched': result.matched_count, 'modified': result.modified_count, 'upserted': result.upserted_count}
+        print(f"Bulk upserted {len(operations)} recommended jobs: {stats}")
+    except Exception as e:
+        print(f"Error bulk upserting recommended jobs: {e}")
+    return stats
+
+def expire_stale_recommended_jobs(max_age_days: int = RECOMMENDED_JOB_EXPIRY_DAYS, purge_after_days: int = RECOMMENDED_JOB_PURGE_DAYS) -> dict:
+    """
+    Marks cached jobs not seen by any scrape for `max_age_days` as expired (`expired_at`), and
+    deletes jobs that have been expired for longer than `purge_after_days`. Expired jobs stay
+    readable for a while so in-memory catalogs can drop them (see get_expired_recommended_job_urls).
+    """
+    stats = {'expired': 0, 'purged': 0}
+    try:
+        database = connect_db()
+        collection = database[RECOMMENDED_JOBS_COLLECTION]
+        now = datetime.now(timezone.utc)
+        seen_cutoff = now - timedelta(days=max_age_days)
+        result = collection.update_many(
+            {"expired_at": {"$exists": False},
+             "$or": [{"last_seen_at": {"$lt": seen_cutoff}},
+                     {"last_seen_at": {"$exists": False}, "last_updated_at": {"$lt": seen_cutoff}}]},
+            {"$set": {"expired_at": now}}
+        )
+        stats['expired'] = result.modified_count
+        stats['purged'] = collection.delete_many({"expired_at": {"$lt": now - timedelta(days=purge_after_days)}}).deleted_count
+        print(f"Recommended job cache expiry: {stats}")
+    except Exception as e:
+        print(f"Error expiring stale recommended jobs: {e}")
+    return stats
+
+def _after_sync_cursor(field: str, since: tuple) -> dict:
+    """
+    Query for documents after a (field value, _id) sync cursor. Bulk upserts and expiry stamp a whole
+    batch with one timestamp, so the _id tie-break keeps a page limit from skipping the rest of a batch.
+    """
+    if not since: return {field: {"$exists": True}}
+    value, last_id = since
+    return {"$or": [{field: {"$gt": value}}, {field: value, "_id": {"$gt": last_id}}]}
+
+def get_expired_recommended_job_urls(since: tuple = None, limit: int = 5000):
+    """Returns (urls, cursor) of cached jobs expired after the (expired_at, _id) cursor `since`, for incremental catalog sync."""
+    try:
+        database = connect_db()
+        collection = database[RECOMMENDED_JOBS_COLLECTION]
+        cursor = collection.find(_after_sync_cursor("expired_at", since), {"job_details.url": 1, "expired_at": 1}) \
+            .sort([("expired_at", 1), ("_id", 1)]).limit(limit)
+        urls, latest = [], since
+        for doc in cursor:
+            url = (doc.get('job_details') or {}).get('url')
+            if url: urls.append(url)
+            latest = (doc['expired_at'], doc['_id'])
+        return urls, latest
+    except Exception as e:
+        print(f"Error retrieving expired recommended jobs since {since}: {e}")
+        return [], since
+
+def make_refresh_query_key(keywords: list, location: str = None) -> str:
+    """Stable key for a refresher (keywords, location) pair, independent of keyword order and case."""
+    normalized = ",".join(sorted({k.strip().lower() for k in keywords or [] if k and k.strip()}))
+    return hashlib.sha1(f"{normalized}|{(location or '').strip().lower()}".encode('utf-8')).hexdigest()[:16]
+
+def record_catalog_refresh(query_key: str, keywords: list, location: str, stats: dict, status: str = "ok"):
+    """Stores when a refresher query last ran and what it found."""
+    try:
+        database = connect_db()
+        database[CATALOG_REFRESH_COLLECTION].update_one(
+            {"query_key": query_key},
+            {"$set": {"keywords": keywords, "location": location, "status": status, "stats": stats,
+                      "last_refreshed_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"Error recording catalog refresh for query '{query_key}': {e}")
+
+def get_catalog_refresh_state(query_key: str = None) -> dict:
+    """Returns {query_key: refresh_doc} for one query or for all of them."""
+    try:
+        database = connect_db()
+        query = {"query_key": query_key} if query_key else {}
+        return {doc['query_key']: doc for doc in database[CATALOG_REFRESH_COLLECTION].find(query, {"_id": 0})}
+    except Exception as e:
+        print(f"Error retrieving catalog refresh state: {e}")
+        return {}
+
 def get_recommended_jobs_by_keywords(keywords: list, limit: int = 20):
     """Retrieves recommended jobs from cache that match any of the given keywords."""
     if not keywords:
@@ -277,15 +650,37 @@ def get_recommended_jobs_by_keywords(keywords: list, limit: int = 20):
     try:
         database = connect_db()
         collection = database[RECOMMENDED_JOBS_COLLECTION]
-        query = {"source_keywords": {"$in": keywords}}
+        query = {"source_keywords": {"$in": keywords}, "expired_at": {"$exists": False}}
         jobs_cursor = collection.find(query).sort("last_updated_at", -1).limit(limit)
-        jobs = [job['job_details'] for job in jobs_cursor if 'job_details' in job]
+        jobs = [JobRecord.from_bson(job['job_details']).to_dict() for job in jobs_cursor if 'job_details' in job]
         print(f"Found {len(jobs)} recommended jobs for keywords: {keywords}")
         return jobs
     except Exception as e:
         print(f"Error retrieving recommended jobs by keywords: {e}")
         return []
 
+def get_recommended_jobs_updated_since(since: tuple = None, limit: int = 5000):
+    """
+    Retrieves cached recommended jobs updated after the (last_updated_at, _id) cursor `since` (all of them if None), oldest first.
+    Returns (jobs, cursor) so callers can sync a local copy of the catalog incrementally.
+    """
+    try:
+        database = connect_db()
+        collection = database[RECOMMENDED_JOBS_COLLECTION]
+        query = _after_sync_cursor("last_updated_at", since)
+        query["expired_at"] = {"$exists": False}
+        cursor = collection.find(query, {"job_details": 1, "last_updated_at": 1}) \
+            .sort([("last_updated_at", 1), ("_id", 1)]).limit(limit)
+        jobs, latest = [], since
+        for doc in cursor:
+            if 'job_details' in doc: jobs.append(JobRecord.from_bson(doc['job_details']).to_dict())
+            latest = (doc['last_updated_at'], doc['_id'])
+        print(f"Fetched {len(jobs)} recommended jobs updated since {since}.")
+        return jobs, latest
+    except Exception as e:
+        print(f"Error retrieving recommended jobs updated since {since}: {e}")
+        return [], since
+
 # --- Resume Builder Functions ---
 # NEW FUNCTIONS START HERE
 
@@ -0,0 +1,91 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+import dateutil.parser as date_parser
+try:
+    from core.instrumentation import span
+except ImportError: # Allows running the parser directly from inside core/
+    from instrumentation import span
+
+# --- Configuration & Constants ---
+# Resume dates are normalized to 'YYYY', 'YYYY-MM' or 'Present'. The common shapes (a bare year,
+# "Mar 2021" / "March 2021", "03/2021", "2021-03") are resolved from precompiled patterns and a month
+# table taken from dateutil's own parserinfo, so they give exactly what dateutil would. Anything else
+# falls back to dateutil's fuzzy parser, timed as parser.dates.fuzzy. Results are memoized per input.
+DATE_CACHE_SIZE = 4096
+PRESENT_WORDS = ('present', 'current', 'now', 'today', 'till date')
+PRESENT = 'Present'
+
+_MONTHS = {name.lower(): index for index, names in enumerate(date_parser.parserinfo.MONTHS, 1) for name in names}
+_FUZZY_DEFAULT = datetime(1900, 1, 1)
+_FAR_FUTURE = (2999, 12)
+
+YEAR_RE = re.compile(r'(19|20)\d{2}')
+YEAR_SEARCH_RE = re.compile(r'\b(19|20)\d{2}\b')
+MONTH_YEAR_RE = re.compile(r'(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*)\.?\s*\'?((?:19|20)\d{2})')
+MM_YYYY_RE = re.compile(r'(\d{1,2})[/\s.-]+((?:19|20)\d{2})')
+ISO_YEAR_MONTH_RE = re.compile(r'((?:19|20)\d{2})-(\d{2})')
+EXPLICIT_JANUARY_RE = re.compile(r'\b(jan|1st|01)\b')
+YEAR_MONTH_KEY_RE = re.compile(r'((?:19|20)\d{2})(?:-(\d{2}))?')
+
+
+def _fuzzy_normalize(date_text_lower: str, date_text_original: str) -> Optional[str]:
+    """Last resort for free-form dates ("Summer 2019", "Q3 2020", "17th May 2021")."""
+    with span("parser.dates.fuzzy"):
+        parsed_date = date_parser.parse(date_text_lower, fuzzy=True, default=_FUZZY_DEFAULT)
+    if parsed_date.year != 1900: # Fuzzy parsing yielded a plausible year
+        # If only a year was likely intended (e.g. "2023" parsed to "2023-01-01" by default)
+        if parsed_date.month == 1 and parsed_date.day == 1 and not EXPLICIT_JANUARY_RE.search(date_text_lower):
+            year_only_in_text = YEAR_RE.fullmatch(date_text_original)
+            if year_only_in_text: return year_only_in_text.group(0)
+        return parsed_date.strftime('%Y-%m')
+    year_only_match = YEAR_SEARCH_RE.search(date_text_lower) # Defaulted to 1900: no usable date, try a bare year
+    return year_only_match.group(0) if year_only_match else None
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def normalize_date(date_text: str) -> Optional[str]:
+    """'YYYY', 'YYYY-MM' or 'Present' for a date-like string; the stripped input if nothing matches."""
+    date_text_lower = date_text.lower().strip(); date_text_original = date_text.strip()
+    if any(word in date_text_lower for word in PRESENT_WORDS): return PRESENT
+    try:
+        if YEAR_RE.fullmatch(date_text_lower): return date_text_lower
+
+        month_year_match = MONTH_YEAR_RE.match(date_text_lower) # "Month YYYY" or "Mon YYYY"
+        if month_year_match:
+            month = _MONTHS.get(month_year_match.group(1))
+            if month: return f"{month_year_match.group(2)}-{month:02d}"
+            try: return date_parser.parse(f"{month_year_match.group(1)} {month_year_match.group(2)}").strftime('%Y-%m')
+            except (ValueError, OverflowError): pass
+
+        mm_yyyy_match = MM_YYYY_RE.match(date_text_lower) # MM/YYYY, MM-YYYY, MM.YYYY
+        if mm_yyyy_match:
+            month = int(mm_yyyy_match.group(1))
+            if 1 <= month <= 12: return f"{mm_yyyy_match.group(2)}-{month:02d}"
+            try: return date_parser.parse(f"{mm_yyyy_match.group(1)}-{mm_yyyy_match.group(2)}").strftime('%Y-%m')
+            except (ValueError, OverflowError): pass
+
+        iso_match = ISO_YEAR_MONTH_RE.fullmatch(date_text_lower) # YYYY-MM
+        if iso_match and 1 <= int(iso_match.group(2)) <= 12: return date_text_lower
+
+        normalized = _fuzzy_normalize(date_text_lower, date_text_original)
+        if normalized: return normalized
+    except (ValueError, TypeError, OverflowError):
+        pass
+
+    year_only_match_final = YEAR_SEARCH_RE.search(date_text_lower) # Final fallback: any year in the text
+    if year_only_match_final: return year_only_match_final.group(0)
+    return date_text_original
+
+def normalize_dates(date_texts: Iterable[str]) -> List[Optional[str]]:
+    """Batch form of normalize_date(): each distinct string is normalized once, results keep input order."""
+    date_texts = list(date_texts)
+    normalized = {text: normalize_date(text) for text in set(date_texts)}
+    return [normalized[text] for text in date_texts]
+
+def date_sort_key(normalized_date: Optional[str]) -> Tuple[int, int]:
+    """(year, month) for ordering normalized dates, newest last. Missing and 'Present' sort as the far future."""
+    if not normalized_date or normalized_date.lower() == 'present': return _FAR_FUTURE
+    match = YEAR_MONTH_KEY_RE.match(normalized_date)
+    if not match: return (1900, 1) # Unparseable text sorts as the oldest
+    return (int(match.group(1)), int(match.group(2) or 1))
@@ -0,0 +1,88 @@
+import os
+import hashlib
+import tempfile
+import threading
+from dotenv import load_dotenv
+
+try:
+    from spacy.tokens import DocBin
+    SPACY_AVAILABLE = True
+except ImportError:
+    DocBin = None
+    SPACY_AVAILABLE = False
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# Every spaCy Doc produced while parsing one resume (the full document plus each section, entry
+# and line the extractors re-tag) is saved as one DocBin blob, keyed by the hash of the resume
+# text and a fingerprint of the model and pipeline. Parsing the same text again replays the Docs
+# instead of running the pipeline, so changing an extractor heuristic only costs extractor time.
+# Texts an extractor has not asked for before still go through spaCy and are added to the blob.
+# The blobs hold resume text, so only callers that pass use_doc_cache=True write them: the bulk
+# re-parser (texts already stored with the search sessions), and the parser service only when
+# started with --doc-cache. Web uploads are not cached by default.
+DOC_CACHE_ENABLED = os.environ.get('DOC_CACHE_ENABLED', 'true').lower() != 'false'
+DOC_CACHE_DIR = os.environ.get('DOC_CACHE_DIR', os.path.join('instance', 'doc_cache'))
+
+
+def pipeline_fingerprint(nlp, revision: str = "") -> str:
+    """Model name/version and component names; `revision` covers custom components whose output changes."""
+    meta = nlp.meta
+    parts = [meta.get('lang', ''), meta.get('name', ''), meta.get('version', ''), ",".join(nlp.pipe_names), revision]
+    return hashlib.sha1("|".join(parts).encode('utf-8')).hexdigest()[:12]
+
+def text_key(text: str, fingerprint: str) -> str:
+    return f"{hashlib.sha256(text.encode('utf-8')).hexdigest()}-{fingerprint}"
+
+
+class DocCache:
+    """Directory of DocBin blobs, one per (resume text, pipeline fingerprint)."""
+    def __init__(self, cache_dir: str = DOC_CACHE_DIR, enabled: bool = DOC_CACHE_ENABLED):
+        self.cache_dir = cache_dir
+        self.enabled = enabled and SPACY_AVAILABLE
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.spacy")
+
+    def load(self, key: str, vocab) -> dict | None:
+        """{text: Doc} for a cached resume, or None."""
+        if not self.enabled: return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                doc_bin = DocBin().from_bytes(f.read())
+            docs = {doc.text: doc for doc in doc_bin.get_docs(vocab)}
+        except FileNotFoundError:
+            docs = None
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Could not read cached docs '{key}': {e}")
+            docs = None
+        with self._lock:
+            if docs is None: self.misses += 1
+            else: self.hits += 1
+        return docs
+
+    def save(self, key: str, docs) -> bool:
+        """Writes the Docs atomically (temp file + rename), so concurrent readers never see a partial blob."""
+        if not self.enabled: return False
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            doc_bin = DocBin(docs=docs, store_user_data=False)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(doc_bin.to_bytes())
+            os.replace(tmp_path, path)
+            return True
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Could not cache docs '{key}': {e}")
+            return False
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "dir": self.cache_dir, "hits": self.hits, "misses": self.misses}
+
+
+doc_cache = DocCache()
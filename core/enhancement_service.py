@@ -0,0 +1,617 @@
+import os
+import re
+import copy
+import json
+import time
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from dotenv import load_dotenv
+
+try:
+    from core.results_store import results_store
+except ImportError: # Allows running this file directly from inside core/
+    from results_store import results_store
+
+load_dotenv()
+
+# --- Google Generative AI SDK (optional) ---
+GENAI_AVAILABLE = False
+try:
+    import google.generativeai as genai
+    GENAI_AVAILABLE = True
+except ImportError:
+    genai = None
+
+# --- Configuration & Constants ---
+GEMINI_MODEL_NAME = os.environ.get('GEMINI_MODEL_NAME', 'gemini-1.5-flash-latest')
+# When set, Gemini is called over its REST API at this base URL instead of through the SDK.
+# Point it at testing/fake_gemini_server.py (or set it to "fake" for the in-process FakeGeminiBackend)
+# to exercise the whole flow without an API key.
+GEMINI_API_BASE_URL = os.environ.get('GEMINI_API_BASE_URL')
+GEMINI_MAX_CONCURRENCY = int(os.environ.get('GEMINI_MAX_CONCURRENCY', 4)) # Simultaneous LLM calls per process
+GEMINI_TIMEOUT_SECONDS = float(os.environ.get('GEMINI_TIMEOUT_SECONDS', 60))
+ENHANCEMENT_CACHE_MAX_ENTRIES = 1024 # Memoized section enhancements
+ENHANCEMENT_CACHE_TTL_SECONDS = 24 * 60 * 60
+ENHANCEMENT_JOB_TTL_SECONDS = 60 * 60 # Finished jobs are forgotten after this long
+# Job state is mirrored to the SQLite results store shared by the workers on a host, so a status poll,
+# event stream or PDF request served by another worker than the one running the job still finds it.
+ENHANCEMENT_JOB_KEY_PREFIX = "enhancement_job:"
+ENHANCEMENT_JOB_POLL_SECONDS = 0.5 # How often a worker following another worker's job re-reads the store
+
+JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_ERROR = "pending", "running", "done", "error"
+
+
+# --- Prompt Planning & Building ---
+# The enhanceable sections, in prompt order. Only the sections the user's goal is about are sent,
+# and each section's enhancement is memoized by a hash of its content, so editing the summary does
+# not regenerate experience bullets.
+ENHANCEABLE_SECTIONS = ('summary', 'experience_1', 'experience_2', 'skills')
+
+PLANNER_KEYWORDS = {
+    'summary': ('summary', 'profile', 'objective', 'about me', 'bio', 'introduction', 'intro', 'pitch', 'headline'),
+    'experience': ('experience', 'job', 'role', 'responsibility', 'responsibilities', 'bullet', 'achievement', 'accomplishment',
+                   'work history', 'position', 'star method', 'action verb', 'impact', 'quantify', 'quantified', 'duties'),
+    'skills': ('skill', 'technology', 'technologies', 'keyword', 'tools', 'tech stack', 'competency', 'competencies', 'expertise'),
+}
+WHOLE_RESUME_KEYWORDS = ('entire', 'whole', 'all sections', 'everything', 'overall', 'full resume', 'every section', 'throughout')
+
+def _keyword_re(keywords) -> re.Pattern:
+    """Whole-word (or whole-phrase) match for any keyword, plural 's' allowed ('bio' does not match 'biology')."""
+    return re.compile(r'\b(?:' + '|'.join(re.escape(keyword) for keyword in keywords) + r')s?\b')
+
+_PLANNER_KEYWORD_RES = {section: _keyword_re(keywords) for section, keywords in PLANNER_KEYWORDS.items()}
+_WHOLE_RESUME_RE = _keyword_re(WHOLE_RESUME_KEYWORDS)
+_FIRST_EXPERIENCE_RE = re.compile(r'\b(first|1st|latest|current|most recent|recent)\b')
+_SECOND_EXPERIENCE_RE = re.compile(r'\b(second|2nd|previous|prior|earlier)\b')
+
+
+def _experience(sections: dict, index: int) -> dict | None:
+    experience_list = sections.get('experience', [])
+    if isinstance(experience_list, list) and len(experience_list) > index and isinstance(experience_list[index], dict):
+        return experience_list[index]
+    return None
+
+def _has_content(sections: dict, name: str) -> bool:
+    if name == 'summary': return bool(sections.get('summary'))
+    if name == 'skills': return True # Skills can be added to an empty list
+    exp = _experience(sections, int(name[-1]) - 1)
+    return bool(exp and exp.get('responsibilities'))
+
+def plan_sections(sections: dict, user_prompt: str) -> list[str]:
+    """
+    Works out which sections the user's goal is about, from whole-word keywords and from mentions of
+    an experience's company or job title. Falls back to every section with content when the goal
+    names none, or asks for the whole resume.
+    """
+    goal = (user_prompt or "").lower()
+    with_content = [name for name in ENHANCEABLE_SECTIONS if _has_content(sections, name)]
+    if _WHOLE_RESUME_RE.search(goal):
+        return with_content
+
+    planned = set()
+    if _PLANNER_KEYWORD_RES['summary'].search(goal): planned.add('summary')
+    if _PLANNER_KEYWORD_RES['skills'].search(goal): planned.add('skills')
+    for i in range(2):
+        exp = _experience(sections, i) or {}
+        names = [str(exp.get(k) or '').strip().lower() for k in ('company', 'job_title')]
+        if any(len(n) >= 3 and re.search(rf'\b{re.escape(n)}\b', goal) for n in names): planned.add(f'experience_{i+1}')
+    if _PLANNER_KEYWORD_RES['experience'].search(goal) and not any(p.startswith('experience') for p in planned):
+        first, second = bool(_FIRST_EXPERIENCE_RE.search(goal)), bool(_SECOND_EXPERIENCE_RE.search(goal))
+        if first or not second: planned.add('experience_1')
+        if second or not first: planned.add('experience_2')
+    if not planned and re.search(r'\badd\b', goal): planned.add('skills') # "Add Docker" style requests
+
+    plan = [name for name in with_content if name in planned]
+    return plan or with_content
+
+def section_text(sections: dict, name: str) -> str:
+    """The prompt block for one section. Also what its memoization key is computed from."""
+    if name == 'summary':
+        # Use the top-level summary key as it's used by the PDF template
+        actual_summary = sections.get('summary', '')
+        return "  Summary:\n" + actual_summary + "\n\n" if actual_summary else "  Summary: [Not provided or empty]\n\n"
+    if name == 'skills':
+        skills_list = sections.get('skills', []) # Key used by JS and PDF
+        if isinstance(skills_list, list) and skills_list:
+            return "  Current Skills:\n" + ", ".join(skills_list) + "\n\n"
+        return "  Current Skills: [Not provided or empty]\n\n"
+    i = int(name[-1]) - 1
+    exp = _experience(sections, i)
+    if exp is None: return ""
+    text = f"    Job {i+1}:\n"
+    text += f"      Title: {exp.get('job_title', 'N/A')}\n"
+    text += f"      Company: {exp.get('company', 'N/A')}\n"
+    text += f"      Dates: {exp.get('start_date', '')} - {exp.get('end_date', '')}\n"
+    responsibilities = exp.get('responsibilities', []) # Key used by JS and PDF
+    if isinstance(responsibilities, list) and responsibilities:
+        text += "      Description (Responsibilities):\n" + "\n".join([f"        - {item}" for item in responsibilities]) + "\n"
+    elif isinstance(responsibilities, str) and responsibilities:
+        text += f"      Description (Responsibilities): {responsibilities}\n"
+    else:
+        text += "      Description (Responsibilities): [Not provided or empty]\n"
+    return text
+
+def build_resume_text(sections: dict, include: list[str] = None) -> str:
+    """Formats the resume sections in `include` (default: all enhanceable ones) into a plain text block."""
+    include = ENHANCEABLE_SECTIONS if include is None else include
+    text_for_gemini = "Current Resume Content:\n"
+    for name in ENHANCEABLE_SECTIONS:
+        if name not in include: continue
+        if name == 'experience_1' or (name == 'experience_2' and 'experience_1' not in include):
+            text_for_gemini += "  Experience:\n"
+        text_for_gemini += section_text(sections, name)
+        if name == 'experience_2' or (name == 'experience_1' and 'experience_2' not in include):
+            text_for_gemini += "\n"
+    return text_for_gemini
+
+SECTION_INSTRUCTIONS = {
+    'summary': 'For the summary: Start with "AI_ENHANCED_SUMMARY_START" on a new line, then the enhanced summary text, and end with "AI_ENHANCED_SUMMARY_END" on a new line.',
+    'experience_1': 'For the first job experience\'s responsibilities: Start with "AI_ENHANCED_EXPERIENCE_1_RESPONSIBILITIES_START", then the enhanced responsibilities (as a list of bullet points, each starting with \'- \' on a new line if the original was a list), and end with "AI_ENHANCED_EXPERIENCE_1_RESPONSIBILITIES_END".',
+    'experience_2': 'For the second job experience\'s responsibilities: Start with "AI_ENHANCED_EXPERIENCE_2_RESPONSIBILITIES_START", then the enhanced responsibilities in the same bullet format, and end with "AI_ENHANCED_EXPERIENCE_2_RESPONSIBILITIES_END".',
+    'skills': 'For skills: Start with "AI_ENHANCED_SKILLS_START", then a comma-separated list of all skills (original plus any additions or modifications based on the user\'s goal), and end with "AI_ENHANCED_SKILLS_END".',
+}
+
+def build_enhancement_prompt(sections: dict, user_custom_prompt: str, include: list[str] = None) -> str:
+    """Prompt asking for exactly the sections in `include` (default: planned from the goal)."""
+    include = plan_sections(sections, user_custom_prompt) if include is None else include
+    text_for_gemini = build_resume_text(sections, include)
+    marker_instructions = "\n".join(f"           - {SECTION_INSTRUCTIONS[name]}" for name in include)
+    skills_rule = '\n        4. If the user asks to "add a skill X", ensure "X" is included in the comma-separated list in the skills output.' if 'skills' in include else ""
+    return f"""
+        You are an expert AI resume writing assistant. Your task is to enhance the provided resume content based on the user's specific goal.
+
+        User's Goal: "{user_custom_prompt}"
+
+        {text_for_gemini}
+        --------------------------------
+
+        Instructions for AI:
+        1. Analyze the "User's Goal" and the "Current Resume Content". Only the sections relevant to the goal are shown.
+        2. Generate enhanced text for every section shown above, following the "User's Goal".
+        3. Structure your response clearly. Use these specific start and end markers:
+{marker_instructions}{skills_rule}
+        5. If a section was marked as "[Not provided or empty]", state that you cannot enhance non-existent content within its markers, e.g., "AI_ENHANCED_SUMMARY_START\\n(No original summary was provided to enhance.)\\nAI_ENHANCED_SUMMARY_END".
+        6. Return *only* the enhanced sections with their specified start/end markers. Do not add any conversational text, apologies, or greetings outside these markers. Each marked section should be on new lines.
+        """
+
+def make_section_key(sections: dict, name: str, user_prompt: str) -> str:
+    """Memoization key for one section's enhancement: model, normalized goal and the section's own content."""
+    goal = " ".join((user_prompt or "").split())
+    return hashlib.sha256(f"{GEMINI_MODEL_NAME}\n{goal}\n{name}\n{section_text(sections, name)}".encode('utf-8')).hexdigest()
+
+
+# --- Response Parsing ---
+def _apply_summary(enhanced_data: dict, enhanced_summary: str):
+    enhanced_data['summary'] = enhanced_summary # Update top-level summary for PDF
+    if 'personal_info' not in enhanced_data or not isinstance(enhanced_data['personal_info'], dict):
+        enhanced_data['personal_info'] = {}
+    enhanced_data['personal_info']['summary'] = enhanced_summary # Keep consistent if used elsewhere
+    print(f"INFO: Updated summary from Gemini response: '{enhanced_summary[:100]}...'")
+    return enhanced_summary
+
+def _apply_experience(index: int):
+    def apply(enhanced_data: dict, enhanced_responsibilities_text: str):
+        if not ('experience' in enhanced_data and isinstance(enhanced_data.get('experience'), list) and
+                len(enhanced_data['experience']) > index and isinstance(enhanced_data['experience'][index], dict)):
+            return None
+        if not enhanced_responsibilities_text:
+            print(f"INFO: Gemini returned empty content for experience {index+1} responsibilities.")
+            return None
+        # Convert bulleted list from Gemini into a list of strings
+        parsed_responsibilities = [
+            point.replace("-","",1).strip() for point in enhanced_responsibilities_text.split('\n')
+            if point.strip() and (point.strip().startswith("-") or point.strip()) # Accept lines starting with - or any non-empty line if not bulleted
+        ]
+        if not parsed_responsibilities and enhanced_responsibilities_text: # If splitting by newline didn't work well (e.g. single paragraph)
+            parsed_responsibilities = [enhanced_responsibilities_text]
+        enhanced_data['experience'][index]['responsibilities'] = parsed_responsibilities
+        print(f"INFO: Updated experience {index+1} responsibilities from Gemini response.")
+        return parsed_responsibilities
+    return apply
+
+def _apply_skills(enhanced_data: dict, enhanced_skills_str: str):
+    if not enhanced_skills_str:
+        print("WARNING: 'AI_ENHANCED_SKILLS_START'...'AI_ENHANCED_SKILLS_END' markers found, but content was empty. Skills not updated from AI.")
+        return None
+    enhanced_data['skills'] = [s.strip() for s in enhanced_skills_str.split(',') if s.strip()]
+    print(f"INFO: Successfully parsed and updated skills from Gemini: {enhanced_data['skills']}")
+    return enhanced_data['skills']
+
+# Section name -> (marker prefix, applier). Appliers update the draft in place and return the new
+# section value (or None if nothing was applied).
+SECTION_MARKERS = {
+    'summary': ("AI_ENHANCED_SUMMARY", _apply_summary),
+    'experience_1': ("AI_ENHANCED_EXPERIENCE_1_RESPONSIBILITIES", _apply_experience(0)),
+    'experience_2': ("AI_ENHANCED_EXPERIENCE_2_RESPONSIBILITIES", _apply_experience(1)),
+    'skills': ("AI_ENHANCED_SKILLS", _apply_skills),
+}
+_SECTION_BLOCK_RES = {name: re.compile(rf"{prefix}_START\s*(.*?)\s*{prefix}_END", re.DOTALL | re.IGNORECASE)
+                      for name, (prefix, _) in SECTION_MARKERS.items()}
+
+def apply_enhancement_response(original_sections_data: dict, gemini_text_response: str) -> dict:
+    """Parses Gemini's marked-up response and returns a copy of the sections with the enhancements applied."""
+    enhanced_data = copy.deepcopy(original_sections_data)
+    for name, (prefix, apply) in SECTION_MARKERS.items():
+        match = _SECTION_BLOCK_RES[name].search(gemini_text_response)
+        if match:
+            apply(enhanced_data, match.group(1).strip())
+        elif name in ('summary', 'skills'):
+            print(f"WARNING: Did NOT find '{prefix}_START' markers in Gemini response. {name.capitalize()} not updated from AI.")
+    return enhanced_data
+
+
+class StreamingSectionParser:
+    """
+    Incremental version of apply_enhancement_response for streamed output: `feed` each chunk as it
+    arrives and get back the (section, value) pairs whose END marker just closed. Each section is
+    applied to `draft` once, as soon as it is complete; sections outside `allowed` are ignored.
+    """
+    def __init__(self, original_sections_data: dict, allowed: list[str] = None):
+        self.draft = copy.deepcopy(original_sections_data)
+        self.allowed = list(SECTION_MARKERS) if allowed is None else list(allowed)
+        self.text = ""
+        self.completed: list[str] = []
+        self.raw_sections: dict[str, str] = {} # Section -> text between its markers, for memoization
+
+    def apply_section(self, name: str, raw_text: str):
+        """Applies one section's enhanced text (e.g. a memoized one) and returns its new value."""
+        self.completed.append(name)
+        self.raw_sections[name] = raw_text
+        return SECTION_MARKERS[name][1](self.draft, raw_text)
+
+    def feed(self, chunk: str) -> list[tuple]:
+        if not chunk: return []
+        self.text += chunk
+        if "_END" not in self.text[-(len(chunk) + 3):].upper():
+            return [] # No END marker arrived (including one split across chunks), so nothing new can have closed
+        updates = []
+        for name in self.allowed:
+            if name in self.completed: continue
+            match = _SECTION_BLOCK_RES[name].search(self.text)
+            if match:
+                value = self.apply_section(name, match.group(1).strip())
+                if value is not None: updates.append((name, value))
+        return updates
+
+
+def add_ai_note(sections: dict, note: str) -> dict:
+    """Copy of the sections with `note` appended to the summary (used when the AI could not run)."""
+    enhanced_data = copy.deepcopy(sections)
+    if 'summary' in enhanced_data:
+        enhanced_data['summary'] = enhanced_data.get('summary', '') + note
+    elif 'personal_info' in enhanced_data and isinstance(enhanced_data.get('personal_info'), dict):
+        enhanced_data['personal_info']['summary'] = enhanced_data['personal_info'].get('summary', '') + note
+    return enhanced_data
+
+
+# --- Gemini Backends ---
+class SdkGeminiBackend:
+    """google-generativeai client. The GenerativeModel is created once and shared by all calls."""
+    def __init__(self, api_key: str, model_name: str = GEMINI_MODEL_NAME):
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name=model_name)
+
+    def generate(self, prompt: str, timeout: float = GEMINI_TIMEOUT_SECONDS) -> str:
+        response = self.model.generate_content(prompt, request_options={'timeout': timeout})
+        if response.parts:
+            return "".join(part.text for part in response.parts)
+        if response.candidates and response.candidates[0].content.parts:
+            return "".join(part.text for part in response.candidates[0].content.parts)
+        return "[GEMINI RESPONSE WAS EMPTY OR MALFORMED]"
+
+    def generate_stream(self, prompt: str, timeout: float = GEMINI_TIMEOUT_SECONDS):
+        """Yields text chunks as the model produces them."""
+        for chunk in self.model.generate_content(prompt, stream=True, request_options={'timeout': timeout}):
+            if chunk.parts:
+                yield "".join(part.text for part in chunk.parts)
+
+
+class RestGeminiBackend:
+    """Calls the Gemini REST API (`models/<model>:generateContent`) at `base_url` over one pooled session."""
+    def __init__(self, base_url: str, api_key: str = None, model_name: str = GEMINI_MODEL_NAME):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key or ""
+        self.model_name = model_name
+        self.session = requests.Session()
+
+    def generate(self, prompt: str, timeout: float = GEMINI_TIMEOUT_SECONDS) -> str:
+        url = f"{self.base_url}/v1beta/models/{self.model_name}:generateContent"
+        payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        # Key goes in a header, not the query string, so it never shows up in error messages
+        response = self.session.post(url, headers={'x-goog-api-key': self.api_key}, json=payload, timeout=timeout)
+        response.raise_for_status()
+        candidates = response.json().get('candidates') or []
+        parts = (candidates[0].get('content') or {}).get('parts', []) if candidates else []
+        return "".join(part.get('text', '') for part in parts) or "[GEMINI RESPONSE WAS EMPTY OR MALFORMED]"
+
+    def generate_stream(self, prompt: str, timeout: float = GEMINI_TIMEOUT_SECONDS):
+        """Yields text chunks from `streamGenerateContent?alt=sse`; `timeout` applies to each read."""
+        url = f"{self.base_url}/v1beta/models/{self.model_name}:streamGenerateContent"
+        payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        with self.session.post(url, params={'alt': 'sse'}, headers={'x-goog-api-key': self.api_key},
+                               json=payload, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"): continue
+                candidates = json.loads(line[5:].strip()).get('candidates') or []
+                parts = (candidates[0].get('content') or {}).get('parts', []) if candidates else []
+                text = "".join(part.get('text', '') for part in parts)
+                if text: yield text
+
+
+class FakeGeminiBackend:
+    """
+    In-process stand-in for offline tests and demos: answers every prompt with `response_text`,
+    streamed in `chunk_size` character pieces `chunk_delay` seconds apart.
+    """
+    DEFAULT_RESPONSE = (
+        "AI_ENHANCED_SUMMARY_START\nResults-driven professional with a record of shipping reliable software.\nAI_ENHANCED_SUMMARY_END\n"
+        "AI_ENHANCED_EXPERIENCE_1_RESPONSIBILITIES_START\n- Delivered measurable improvements across key projects\n"
+        "- Collaborated with cross-functional teams to ship features\nAI_ENHANCED_EXPERIENCE_1_RESPONSIBILITIES_END\n"
+        "AI_ENHANCED_SKILLS_START\nPython, SQL, Communication\nAI_ENHANCED_SKILLS_END\n"
+    )
+
+    def __init__(self, response_text: str = None, chunk_size: int = 24, chunk_delay: float = 0.05, fail: bool = False):
+        self.response_text = response_text or self.DEFAULT_RESPONSE
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.fail = fail
+        self.calls = 0
+
+    def generate(self, prompt: str, timeout: float = GEMINI_TIMEOUT_SECONDS) -> str:
+        return "".join(self.generate_stream(prompt, timeout))
+
+    def generate_stream(self, prompt: str, timeout: float = GEMINI_TIMEOUT_SECONDS):
+        self.calls += 1
+        if self.fail: raise RuntimeError("Fake Gemini failure")
+        for i in range(0, len(self.response_text), self.chunk_size):
+            if self.chunk_delay: time.sleep(self.chunk_delay)
+            yield self.response_text[i:i + self.chunk_size]
+
+
+def create_default_backend():
+    """Fake backend if GEMINI_API_BASE_URL is 'fake', REST if it is another URL, else the SDK if a key is configured, else None."""
+    api_key = os.environ.get('GOOGLE_API_KEY')
+    if GEMINI_API_BASE_URL == 'fake':
+        print("INFO: Gemini enhancement service using the in-process fake backend.")
+        return FakeGeminiBackend()
+    if GEMINI_API_BASE_URL:
+        print(f"INFO: Gemini enhancement service using REST endpoint {GEMINI_API_BASE_URL}.")
+        return RestGeminiBackend(GEMINI_API_BASE_URL, api_key)
+    if GENAI_AVAILABLE and api_key:
+        return SdkGeminiBackend(api_key)
+    return None
+
+
+# --- Enhancement Service ---
+class EnhancementJob:
+    """
+    One enhancement request. The worker running it holds the live object and writes every change to
+    `store`; other workers get a copy from `load` whose wait_for_update re-reads the store.
+    """
+    __slots__ = ('job_id', 'cache_key', 'owner', 'status', 'result', 'error', 'message', 'category', 'created_at', 'finished_at',
+                 'section_updates', '_changed', '_store', '_remote')
+
+    def __init__(self, job_id: str, cache_key: str, owner: str = None, store=None):
+        self.job_id = job_id
+        self.cache_key = cache_key
+        self.owner = owner
+        self.status = JOB_PENDING
+        self.result = None
+        self.error = None
+        self.message = None
+        self.category = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.section_updates: list[tuple] = [] # (section, value) in the order sections completed
+        self._changed = threading.Condition()
+        self._store = store
+        self._remote = False
+
+    @staticmethod
+    def store_key(job_id: str) -> str:
+        return f"{ENHANCEMENT_JOB_KEY_PREFIX}{job_id}"
+
+    def to_record(self) -> dict:
+        return {'job_id': self.job_id, 'cache_key': self.cache_key, 'owner': self.owner, 'status': self.status,
+                'result': self.result, 'error': self.error, 'message': self.message, 'category': self.category,
+                'created_at': self.created_at, 'finished_at': self.finished_at, 'section_updates': self.section_updates}
+
+    def _apply_record(self, record: dict):
+        for field in ('status', 'result', 'error', 'message', 'category', 'created_at', 'finished_at'):
+            setattr(self, field, record.get(field))
+        self.section_updates = [tuple(update) for update in record.get('section_updates') or []]
+
+    def persist(self):
+        """Writes the job's state to the shared store (no-op without one)."""
+        if self._store is not None and not self._remote:
+            self._store.put(self.store_key(self.job_id), self.to_record(), ttl_seconds=ENHANCEMENT_JOB_TTL_SECONDS)
+
+    @classmethod
+    def load(cls, job_id: str, store) -> "EnhancementJob | None":
+        """Read-only copy of a job another worker is running (or ran), or None if the store doesn't know it."""
+        record = store.get(cls.store_key(job_id)) if store is not None else None
+        if not record: return None
+        job = cls(record['job_id'], record.get('cache_key'), record.get('owner'), store)
+        job._apply_record(record)
+        job._remote = True
+        return job
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_ERROR)
+
+    def start(self):
+        self.status = JOB_RUNNING
+        self.persist()
+
+    def add_section_update(self, section: str, value):
+        with self._changed:
+            self.section_updates.append((section, value))
+            self.persist()
+            self._changed.notify_all()
+
+    def finish(self, status: str, result: dict, message: str, category: str, error: str = None):
+        with self._changed:
+            self.status, self.result, self.message, self.category, self.error = status, result, message, category, error
+            self.finished_at = time.time()
+            self.persist()
+            self._changed.notify_all()
+
+    def wait_for_update(self, seen_updates: int, timeout: float) -> bool:
+        """Blocks until there are more than `seen_updates` section updates or the job finished. False on timeout."""
+        has_update = lambda: len(self.section_updates) > seen_updates or self.finished
+        if not self._remote:
+            with self._changed:
+                return self._changed.wait_for(has_update, timeout=timeout)
+        deadline = time.time() + timeout
+        while not has_update():
+            if time.time() >= deadline: return False
+            time.sleep(min(ENHANCEMENT_JOB_POLL_SECONDS, max(0.0, deadline - time.time())))
+            record = self._store.get(self.store_key(self.job_id))
+            if record: self._apply_record(record)
+        return True
+
+    def to_status(self) -> dict:
+        """Polling payload (without the enhanced sections themselves)."""
+        return {'job_id': self.job_id, 'status': self.status, 'message': self.message, 'category': self.category,
+                'error': self.error, 'completed_sections': [section for section, _ in self.section_updates],
+                'elapsed_seconds': round((self.finished_at or time.time()) - self.created_at, 2)}
+
+
+class EnhancementService:
+    """
+    Runs resume enhancement off the request thread. `submit` returns a job id immediately; the
+    Gemini call runs on a bounded thread pool (GEMINI_MAX_CONCURRENCY) with a per-call timeout,
+    and the page polls `get`. Enhancements are memoized per section (hash of the goal and that
+    section's content) and identical in-flight prompts share one job, so re-submitting is instant.
+    Job state is written to `store` (the shared results store), so `get` works from any worker.
+    """
+    def __init__(self, backend=None, max_concurrency: int = GEMINI_MAX_CONCURRENCY, timeout: float = GEMINI_TIMEOUT_SECONDS,
+                 store=results_store):
+        self.backend = backend
+        self.timeout = timeout
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini")
+        self._lock = threading.Lock()
+        self._jobs: dict[str, EnhancementJob] = {}
+        self._inflight: dict[str, str] = {}
+        self._cache: OrderedDict = OrderedDict()
+
+    @property
+    def configured(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def make_cache_key(prompt: str) -> str:
+        return hashlib.sha256(f"{GEMINI_MODEL_NAME}\n{prompt}".encode('utf-8')).hexdigest()
+
+    def _cache_get(self, key: str):
+        entry = self._cache.get(key)
+        if not entry: return None
+        stored_at, text = entry
+        if time.time() - stored_at > ENHANCEMENT_CACHE_TTL_SECONDS:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return text
+
+    def _cache_put(self, key: str, text: str):
+        self._cache[key] = (time.time(), text)
+        self._cache.move_to_end(key)
+        while len(self._cache) > ENHANCEMENT_CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    def _prune_jobs(self):
+        cutoff = time.time() - ENHANCEMENT_JOB_TTL_SECONDS
+        for job_id in [j for j, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def submit(self, sections: dict, user_prompt: str, owner: str = None) -> EnhancementJob:
+        """
+        Starts (or reuses) an enhancement job. Only the planned sections are considered, memoized
+        sections are applied immediately, and the LLM is asked for the remaining ones only.
+        """
+        sections = copy.deepcopy(sections) # The caller's dict may change while the job runs
+        plan = plan_sections(sections, user_prompt)
+        section_keys = {name: make_section_key(sections, name, user_prompt) for name in plan}
+        with self._lock:
+            self._prune_jobs()
+            memoized = {name: text for name in plan if (text := self._cache_get(section_keys[name])) is not None}
+        to_generate = [name for name in plan if name not in memoized]
+        prompt = build_enhancement_prompt(sections, user_prompt, to_generate) if to_generate else ""
+        key = self.make_cache_key(prompt)
+        with self._lock:
+            inflight_id = self._inflight.get(key)
+            if to_generate and inflight_id in self._jobs and self._jobs[inflight_id].owner == owner:
+                return self._jobs[inflight_id]
+            job = EnhancementJob(uuid.uuid4().hex, key, owner, self.store)
+            self._jobs[job.job_id] = job
+            job.persist()
+            if not self.configured:
+                note = f"\n\n[AI Note (Service Not Configured): User Prompt was '{user_prompt}'.]"
+                job.finish(JOB_DONE, add_ai_note(sections, note), "Gemini AI service is not configured. Using basic processing.", "error")
+                return job
+            if to_generate: self._inflight[key] = job.job_id
+
+        parser = StreamingSectionParser(sections, allowed=to_generate)
+        for name in plan:
+            if memoized.get(name): # "" means the model left this section unchanged last time
+                value = parser.apply_section(name, memoized[name])
+                if value is not None: job.add_section_update(name, value)
+        print(f"INFO: Enhancement plan {plan}: {len(memoized)} memoized, generating {to_generate or 'nothing'}.")
+        if not to_generate:
+            job.finish(JOB_DONE, parser.draft, "Resume content processed with Gemini AI. Review the generated PDF.", "success")
+            return job
+        self._executor.submit(self._run, job, parser, {name: section_keys[name] for name in to_generate}, user_prompt, prompt)
+        return job
+
+    def _run(self, job: EnhancementJob, parser: "StreamingSectionParser", section_keys: dict, user_prompt: str, prompt: str):
+        job.start()
+        try:
+            print(f"DEBUG: Sending prompt to Gemini ({len(prompt)} chars, first 500):\n{prompt[:500]}...")
+            if hasattr(self.backend, 'generate_stream'):
+                # Apply each marked section as soon as its END marker arrives, so pollers/SSE see it early
+                deadline = time.time() + self.timeout
+                for chunk in self.backend.generate_stream(prompt, timeout=self.timeout):
+                    for section, value in parser.feed(chunk): job.add_section_update(section, value)
+                    if time.time() > deadline: raise TimeoutError(f"Gemini did not finish within {self.timeout:.0f}s")
+            else:
+                for section, value in parser.feed(self.backend.generate(prompt, timeout=self.timeout)):
+                    job.add_section_update(section, value)
+            with self._lock: # Only on success, and only sections whose END marker was parsed
+                for name, key in section_keys.items():
+                    if name in parser.raw_sections: self._cache_put(key, parser.raw_sections[name])
+            job.finish(JOB_DONE, parser.draft, "Resume content processed with Gemini AI. Review the generated PDF.", "success")
+        except Exception as e:
+            print(f"ERROR: Error during Gemini API call or processing: {e}")
+            error_note = f"\n\n[AI Note (Error: {str(e)[:50]}...): User Prompt was '{user_prompt}'. AI processing failed.]"
+            job.finish(JOB_ERROR, add_ai_note(parser.draft, error_note),
+                       f"An error occurred while communicating with the AI service: {str(e)}. Using basic processing instead.", "error", error=str(e))
+        finally:
+            with self._lock:
+                if self._inflight.get(job.cache_key) == job.job_id:
+                    del self._inflight[job.cache_key]
+
+    def get(self, job_id: str, owner: str = None) -> EnhancementJob | None:
+        """Returns the job if it exists and belongs to `owner`; jobs of other workers are read from the store."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None: job = EnhancementJob.load(job_id, self.store)
+        if job is None or job.owner != owner: return None
+        return job
+
+    def enhance(self, sections: dict, user_prompt: str, owner: str = None) -> EnhancementJob:
+        """Blocking convenience wrapper (scripts, tests): submits and waits for the job to finish."""
+        job = self.submit(sections, user_prompt, owner)
+        deadline = time.time() + self.timeout + 5
+        while not job.finished and time.time() < deadline:
+            job.wait_for_update(len(job.section_updates), timeout=max(0.0, deadline - time.time()))
+        return job
+
+
+enhancement_service = EnhancementService(create_default_backend())
@@ -0,0 +1,97 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# Rendered HTML fragments (job-card lists, resume lists) are kept in a per-process LRU bounded
+# by total size. Keys carry a content version, so a changed list renders under a new key and
+# the old entry simply ages out; nothing has to be invalidated explicitly.
+FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get('FRAGMENT_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', 2048))
+TEMPLATE_BYTECODE_CACHE_DIR = os.environ.get('TEMPLATE_BYTECODE_CACHE_DIR', os.path.join('instance', 'jinja_bytecode'))
+
+
+def content_version(*parts) -> str:
+    """Short hash of whatever identifies a fragment's content (ids, timestamps, counts)."""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class FragmentCache:
+    """Thread-safe LRU of rendered fragments, bounded by entry count and by total characters stored."""
+    def __init__(self, max_bytes: int = FRAGMENT_CACHE_MAX_BYTES, max_entries: int = FRAGMENT_CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(fragment: str, owner: str, version: str) -> str:
+        return f"{fragment}|{owner}|{version}"
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            html = self._entries.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return html
+
+    def put(self, key: str, html: str):
+        if len(html) > self.max_bytes: return # Would evict everything else; not worth caching
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None: self._size -= len(previous)
+            self._entries[key] = html
+            self._size += len(html)
+            while self._entries and (self._size > self.max_bytes or len(self._entries) > self.max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def get_or_render(self, fragment: str, owner: str, version: str, render) -> str:
+        """Returns the cached fragment for (fragment, owner, version), calling `render()` on a miss."""
+        key = self.make_key(fragment, owner, version)
+        html = self.get(key)
+        if html is None:
+            html = render()
+            self.put(key, html)
+        return html
+
+    def discard_owner(self, owner: str):
+        """Drops every fragment rendered for `owner` (e.g. a deleted search), whatever its version."""
+        with self._lock:
+            for key in [k for k in self._entries if k.split('|', 2)[1] == owner]:
+                self._size -= len(self._entries.pop(key))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._size, 'hits': self.hits, 'misses': self.misses}
+
+
+def enable_template_bytecode_cache(app, directory: str = TEMPLATE_BYTECODE_CACHE_DIR) -> bool:
+    """
+    Stores compiled Jinja templates on disk so a restarted or newly forked worker loads them
+    instead of re-parsing and compiling every template. Call before the first render.
+    """
+    try:
+        from jinja2 import FileSystemBytecodeCache
+        os.makedirs(directory, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+        print(f"INFO: Jinja bytecode cache enabled at '{directory}'.")
+        return True
+    except (ImportError, OSError) as e:
+        print(f"WARNING: Could not enable the Jinja bytecode cache ({e}). Templates will be compiled per process.")
+        return False
+
+
+fragment_cache = FragmentCache()
@@ -0,0 +1,166 @@
+import os
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# Named spans (pdf.extract_text, parser.extract.skills, parser.nlp.<caller>, jobs.fetch.<source>,
+# mongo.<command>, pdf.render, ...) are timed and aggregated into per-span histograms, exported
+# in Prometheus text format at /metrics. Counts are per process; with several workers, scrape
+# each one or aggregate downstream.
+INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'true').lower() != 'false'
+REQUEST_TIMING_HEADER_ENABLED = os.environ.get('REQUEST_TIMING_HEADER', 'false').lower() == 'true'
+SPAN_BUCKETS_SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_PREFIX = 'resume_app'
+
+# Spans finished during the current request, for the Server-Timing header; None outside a request
+_request_spans: ContextVar[list | None] = ContextVar('request_spans', default=None)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics) with a running sum and count."""
+    __slots__ = ('buckets', 'counts', 'sum', 'count', 'errors')
+
+    def __init__(self, buckets: tuple = SPAN_BUCKETS_SECONDS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool = False):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        if error: self.errors += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bucket bound containing the q-quantile (what a p95 panel would show)."""
+        if not self.count: return None
+        rank, seen = q * self.count, 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += bucket_count
+            if seen >= rank: return bound
+        return float('inf')
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, span_name: str, seconds: float, error: bool = False):
+        with self._lock:
+            histogram = self._histograms.get(span_name)
+            if histogram is None:
+                histogram = self._histograms[span_name] = Histogram()
+            histogram.observe(seconds, error)
+
+    def snapshot(self) -> dict:
+        """Per-span count, total seconds, errors and approximate p50/p95, for JSON consumers."""
+        with self._lock:
+            return {name: {'count': h.count, 'sum_seconds': round(h.sum, 6), 'errors': h.errors,
+                           'p50_seconds': h.quantile(0.5), 'p95_seconds': h.quantile(0.95)}
+                    for name, h in sorted(self._histograms.items())}
+
+    def render_prometheus(self) -> str:
+        name = f"{METRIC_PREFIX}_span_duration_seconds"
+        lines = [f"# HELP {name} Duration of instrumented pipeline spans.", f"# TYPE {name} histogram"]
+        error_lines = [f"# HELP {METRIC_PREFIX}_span_errors_total Spans that ended with an exception.",
+                       f"# TYPE {METRIC_PREFIX}_span_errors_total counter"]
+        with self._lock:
+            for span_name, h in sorted(self._histograms.items()):
+                label = span_name.replace('\\', '\\\\').replace('"', '\\"')
+                cumulative = 0
+                for bound, bucket_count in zip(h.buckets, h.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{span="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{span="{label}",le="+Inf"}} {h.count}')
+                lines.append(f'{name}_sum{{span="{label}"}} {h.sum:.6f}')
+                lines.append(f'{name}_count{{span="{label}"}} {h.count}')
+                error_lines.append(f'{METRIC_PREFIX}_span_errors_total{{span="{label}"}} {h.errors}')
+        return "\n".join(lines + error_lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+def record_span(name: str, seconds: float, error: bool = False):
+    """Records an already-measured duration (used where start and end happen in different callbacks)."""
+    if not INSTRUMENTATION_ENABLED: return
+    metrics_registry.observe(name, seconds, error)
+    request_spans = _request_spans.get()
+    if request_spans is not None: request_spans.append((name, seconds))
+
+@contextmanager
+def span(name: str):
+    """Times the enclosed block under `name`. Exceptions are counted and re-raised."""
+    if not INSTRUMENTATION_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        record_span(name, time.perf_counter() - start, error)
+
+def timed(name: str):
+    """Decorator form of span()."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- Per-request timing ---
+def start_request_timing():
+    """Starts collecting this request's spans. Returns a token for finish_request_timing()."""
+    return _request_spans.set([])
+
+def current_request_spans() -> list[tuple[str, float]]:
+    """Spans recorded so far in this request, without ending it (for the response headers)."""
+    return list(_request_spans.get() or [])
+
+def finish_request_timing(token) -> list[tuple[str, float]]:
+    spans = _request_spans.get() or []
+    _request_spans.reset(token)
+    return spans
+
+def format_server_timing(spans: list[tuple[str, float]], total_seconds: float = None, max_entries: int = 20) -> str:
+    """Server-Timing header value: spans with the same name are summed, slowest first."""
+    totals: dict[str, float] = {}
+    for name, seconds in spans:
+        totals[name] = totals.get(name, 0.0) + seconds
+    entries = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:max_entries]
+    if total_seconds is not None: entries.insert(0, ('total', total_seconds))
+    return ", ".join(f"{name.replace(' ', '_')};dur={seconds * 1000:.1f}" for name, seconds in entries)
+
+
+# --- MongoDB command timing ---
+try:
+    from pymongo import monitoring
+
+    class MongoCommandTimer(monitoring.CommandListener):
+        """Records every MongoDB command (find, aggregate, update, ...) as a mongo.<command> span."""
+        def started(self, event): pass
+
+        def succeeded(self, event):
+            record_span(f"mongo.{event.command_name}", event.duration_micros / 1e6)
+
+        def failed(self, event):
+            record_span(f"mongo.{event.command_name}", event.duration_micros / 1e6, error=True)
+except ImportError:
+    MongoCommandTimer = None
@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+from datetime import datetime, timezone, timedelta
+from dotenv import load_dotenv
+
+try:
+    from core.job_scrapper_api_v3 import scrape_jobs
+    from core.job_deduplicator import NearDuplicateIndex
+    from core.database_manager import (
+        connect_db,
+        bulk_upsert_recommended_jobs,
+        expire_stale_recommended_jobs,
+        make_refresh_query_key,
+        record_catalog_refresh,
+        get_catalog_refresh_state
+    )
+except ImportError: # Allows running this file directly from inside core/
+    from job_scrapper_api_v3 import scrape_jobs
+    from job_deduplicator import NearDuplicateIndex
+    from database_manager import (
+        connect_db,
+        bulk_upsert_recommended_jobs,
+        expire_stale_recommended_jobs,
+        make_refresh_query_key,
+        record_catalog_refresh,
+        get_catalog_refresh_state
+    )
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# Popular keyword/location pairs crawled on every cycle. Override with a JSON file of
+# [{"keywords": [...], "location": "..."}] via CATALOG_REFRESH_QUERIES_PATH or --queries.
+DEFAULT_REFRESH_QUERIES = [
+    {"keywords": ["python", "django", "flask"], "location": None},
+    {"keywords": ["javascript", "react", "node.js"], "location": None},
+    {"keywords": ["java", "spring boot"], "location": None},
+    {"keywords": ["data science", "machine learning", "sql"], "location": None},
+    {"keywords": ["aws", "docker", "kubernetes"], "location": None},
+    {"keywords": ["c#", ".net core"], "location": None},
+    {"keywords": ["software engineer"], "location": "London"},
+    {"keywords": ["software engineer"], "location": "New York"},
+]
+CATALOG_REFRESH_QUERIES_PATH = os.environ.get("CATALOG_REFRESH_QUERIES_PATH")
+REFRESH_INTERVAL_SECONDS = int(os.environ.get("CATALOG_REFRESH_INTERVAL_SECONDS", 6 * 60 * 60))
+MAX_JOBS_PER_SOURCE = int(os.environ.get("CATALOG_REFRESH_JOBS_PER_SOURCE", 10))
+
+_stop_requested = False
+
+
+def load_refresh_queries(path: str = None) -> list[dict]:
+    """Reads the refresher queries from a JSON file, falling back to DEFAULT_REFRESH_QUERIES."""
+    path = path or CATALOG_REFRESH_QUERIES_PATH
+    if not path: return DEFAULT_REFRESH_QUERIES
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            queries = json.load(f)
+        queries = [q for q in queries if isinstance(q, dict) and q.get('keywords')]
+        print(f"Loaded {len(queries)} refresh queries from '{path}'.")
+        return queries
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"WARNING: Could not read refresh queries from '{path}' ({e}). Using defaults.")
+        return DEFAULT_REFRESH_QUERIES
+
+def is_query_fresh(state: dict, max_age_seconds: int) -> bool:
+    last_refreshed_at = (state or {}).get('last_refreshed_at')
+    if not last_refreshed_at or state.get('status') != "ok": return False
+    if last_refreshed_at.tzinfo is None: last_refreshed_at = last_refreshed_at.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - last_refreshed_at < timedelta(seconds=max_age_seconds)
+
+def refresh_query(keywords: list, location: str = None, max_jobs_per_source: int = MAX_JOBS_PER_SOURCE) -> dict:
+    """Scrapes every source for one keyword/location pair and bulk upserts the results into the job cache."""
+    query_key = make_refresh_query_key(keywords, location)
+    print(f"\n--- Refreshing catalog query {query_key}: {keywords} @ {location or 'anywhere'} ---")
+    try:
+        jobs = scrape_jobs(keywords=keywords, location=location, max_jobs_per_source=max_jobs_per_source,
+                           skills_json_path=None, dedup_index=NearDuplicateIndex(), priority="low")
+        stats = {'jobs_found': len(jobs)}
+        stats.update(bulk_upsert_recommended_jobs(jobs, source_keywords=keywords, query_key=query_key))
+        # An empty result usually means every source was skipped (quota, outage); retry it next cycle
+        status = "ok" if jobs else "empty"
+    except Exception as e:
+        print(f"Error refreshing catalog query {query_key}: {e}")
+        stats, status = {'error': str(e)}, "error"
+    record_catalog_refresh(query_key, keywords, location, stats, status=status)
+    return stats
+
+def run_refresh_cycle(queries: list[dict], max_age_seconds: int = REFRESH_INTERVAL_SECONDS, force: bool = False) -> dict:
+    """Refreshes every query that is older than `max_age_seconds` (or all with force), then expires gone postings."""
+    state = get_catalog_refresh_state()
+    summary = {'refreshed': 0, 'skipped_fresh': 0, 'jobs_found': 0}
+    for query in queries:
+        if _stop_requested: break
+        keywords, location = query['keywords'], query.get('location')
+        if not force and is_query_fresh(state.get(make_refresh_query_key(keywords, location)), max_age_seconds):
+            summary['skipped_fresh'] += 1
+            continue
+        stats = refresh_query(keywords, location, query.get('max_jobs_per_source', MAX_JOBS_PER_SOURCE))
+        summary['refreshed'] += 1
+        summary['jobs_found'] += stats.get('jobs_found', 0)
+    summary.update(expire_stale_recommended_jobs())
+    print(f"Catalog refresh cycle finished: {summary}")
+    return summary
+
+def run_forever(queries: list[dict], interval_seconds: int = REFRESH_INTERVAL_SECONDS):
+    """Runs refresh cycles until SIGINT/SIGTERM. Each query is only re-crawled once it is older than the interval."""
+    def _request_stop(signum, frame):
+        global _stop_requested
+        print(f"Received signal {signum}, stopping after the current query...")
+        _stop_requested = True
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+
+    check_every = max(60, min(interval_seconds // 4, 15 * 60)) # Wake up often enough to catch queries that failed last time
+    while not _stop_requested:
+        run_refresh_cycle(queries, max_age_seconds=interval_seconds)
+        slept = 0
+        while slept < check_every and not _stop_requested:
+            time.sleep(1)
+            slept += 1
+
+def print_refresh_status(queries: list[dict]):
+    state = get_catalog_refresh_state()
+    for query in queries:
+        key = make_refresh_query_key(query['keywords'], query.get('location'))
+        doc = state.get(key) or {}
+        print(f"{key}  {doc.get('status', 'never'):6}  {doc.get('last_refreshed_at', '-')}  "
+              f"{query['keywords']} @ {query.get('location') or 'anywhere'}  {doc.get('stats', {})}")
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Keeps the recommended job cache warm by periodically crawling popular queries.")
+    parser.add_argument('--once', action='store_true', help="Run a single refresh cycle and exit.")
+    parser.add_argument('--force', action='store_true', help="Refresh every query, even ones that are still fresh.")
+    parser.add_argument('--status', action='store_true', help="Print when each query was last refreshed and exit.")
+    parser.add_argument('--queries', help="JSON file with [{\"keywords\": [...], \"location\": ...}] entries.")
+    parser.add_argument('--interval', type=int, default=REFRESH_INTERVAL_SECONDS, help="Seconds before a query is considered stale.")
+    args = parser.parse_args(argv)
+
+    try:
+        connect_db()
+    except Exception as e:
+        print(f"CRITICAL: Could not connect to MongoDB ({e}). The catalog refresher needs the database.")
+        return 1
+    queries = load_refresh_queries(args.queries)
+    if args.status:
+        print_refresh_status(queries)
+    elif args.once:
+        run_refresh_cycle(queries, max_age_seconds=args.interval, force=args.force)
+    else:
+        run_forever(queries, interval_seconds=args.interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
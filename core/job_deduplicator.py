@@ -0,0 +1,234 @@
+import re
+import zlib
+import random
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None # type: ignore
+
+# --- Configuration & Constants ---
+# A job's description is turned into word shingles, hashed with NUM_PERMUTATIONS
+# independent hash functions and reduced to a MinHash signature. The signature is
+# split into LSH bands; two jobs sharing any band bucket become candidates and are
+# then compared on the estimated Jaccard similarity of their shingle sets.
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS_PER_BAND = NUM_PERMUTATIONS // LSH_BANDS
+NEAR_DUPLICATE_THRESHOLD = 0.8 # Estimated Jaccard above which descriptions are treated as the same posting
+SAME_ROLE_THRESHOLD = 0.5 # Looser threshold used when normalized title and company already agree
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(1337) # Fixed seed so signatures stay comparable across processes and stored cache docs
+# Coefficients are kept below 2**31 so that a * hash + b (hash < 2**32) never exceeds 2**63:
+# the numpy path then computes exactly the same values as the pure Python fallback.
+_PERMUTATIONS = [(_rng.randint(1, (1 << 31) - 1), _rng.randint(0, (1 << 31) - 1)) for _ in range(NUM_PERMUTATIONS)]
+if NUMPY_AVAILABLE:
+    _PERM_A = np.array([a for a, _ in _PERMUTATIONS], dtype=np.uint64).reshape(-1, 1)
+    _PERM_B = np.array([b for _, b in _PERMUTATIONS], dtype=np.uint64).reshape(-1, 1)
+
+COMPANY_SUFFIXES = {'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+                    'gmbh', 'plc', 'pvt', 'private', 'ag', 'sa', 'bv', 'group', 'holdings'}
+_NON_WORD_RE = re.compile(r'[^a-z0-9+#]+')
+# Locations that say nothing about where the job is; they match any location
+WILDCARD_LOCATIONS = {'remote', 'anywhere', 'worldwide', 'global', 'online', 'not specified', 'n a', 'various locations',
+                      'multiple locations', 'multiple cities', 'work from home', 'home office', 'flexible'}
+
+
+# --- Normalization Helpers ---
+def _normalize_words(text: str) -> list[str]:
+    if not text: return []
+    return [w for w in _NON_WORD_RE.split(text.lower()) if w]
+
+def normalize_title(title: str) -> str:
+    """Lowercases a job title and strips punctuation and bracketed qualifiers like '(m/f/d)'."""
+    if not title: return ""
+    title = re.sub(r'\([^)]*\)', ' ', title)
+    return " ".join(_normalize_words(title))
+
+def normalize_company(company: str) -> str:
+    """Lowercases a company name and drops legal suffixes (Inc, Ltd, GmbH, ...)."""
+    words = _normalize_words(company)
+    while words and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+def normalize_location(location: str) -> str:
+    """
+    Lowercases a location and strips punctuation, keeping its comma-separated parts
+    ('Berlin, BE, DE' -> 'berlin, be, de'). '' for wildcard locations such as 'Remote'.
+    """
+    parts = [" ".join(_normalize_words(part)) for part in (location or "").split(',')]
+    parts = [part for part in parts if part]
+    if not parts or any(part in WILDCARD_LOCATIONS for part in parts): return ""
+    return ", ".join(parts)
+
+def locations_compatible(location_a: str, location_b: str) -> bool:
+    """
+    Whether two normalized locations can be the same place. Sources format locations differently
+    ('Berlin, BE, DE', 'Berlin', 'Remote'), so the city (first part) of one only has to appear among
+    the words of the other; an empty (unknown or remote) location matches anything.
+    """
+    if not location_a or not location_b: return True
+    words_a, words_b = set(location_a.replace(',', ' ').split()), set(location_b.replace(',', ' ').split())
+    city_a, city_b = set(location_a.split(',')[0].split()), set(location_b.split(',')[0].split())
+    return city_a <= words_b or city_b <= words_a
+
+def title_company_key(job: dict) -> str:
+    """Returns the normalized 'title|company' key, or '' if either part is missing."""
+    title_key = normalize_title(job.get('title'))
+    company_key = normalize_company(job.get('company'))
+    if not title_key or not company_key: return ""
+    return f"{title_key}|{company_key}"
+
+def exact_key(job: dict) -> str:
+    """
+    Normalized 'title|company' key for jobs that have no URL or no company, which the URL and
+    same-role checks cannot catch (two such jobs also need matching locations). '' for jobs with both.
+    """
+    url = (job.get('url') or "").strip()
+    if url and normalize_company(job.get('company')): return ""
+    title_key, company_key = normalize_title(job.get('title')), normalize_company(job.get('company'))
+    return f"{title_key}|{company_key}" if title_key or company_key else ""
+
+
+# --- MinHash / LSH ---
+def shingle_text(text: str, k: int = SHINGLE_SIZE) -> set[int]:
+    """Hashes the k-word shingles of `text` into a set of 32-bit integers."""
+    words = _normalize_words(text)
+    if not words: return set()
+    if len(words) < k:
+        return {zlib.crc32(" ".join(words).encode('utf-8'))}
+    return {zlib.crc32(" ".join(words[i:i + k]).encode('utf-8')) for i in range(len(words) - k + 1)}
+
+def compute_signature(shingles: set[int]) -> list[int] | None:
+    """Computes the MinHash signature of a shingle set. Returns None for an empty set."""
+    if not shingles: return None
+    if NUMPY_AVAILABLE:
+        hashes = np.fromiter(shingles, dtype=np.uint64, count=len(shingles)).reshape(1, -1)
+        permuted = ((_PERM_A * hashes + _PERM_B) % np.uint64(_MERSENNE_PRIME)) & np.uint64(_MAX_HASH)
+        return [int(v) for v in permuted.min(axis=1)]
+    signature = []
+    for a, b in _PERMUTATIONS:
+        signature.append(min(((a * s + b) % _MERSENNE_PRIME) & _MAX_HASH for s in shingles))
+    return signature
+
+def signature_band_keys(signature: list[int]) -> list[str]:
+    """Splits a signature into LSH band keys. Keys embed the band index so buckets never collide across bands."""
+    if not signature: return []
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS_PER_BAND:(band + 1) * LSH_ROWS_PER_BAND]
+        keys.append(f"{band}:{zlib.crc32(','.join(map(str, rows)).encode('ascii')):08x}")
+    return keys
+
+def estimate_similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    """Estimated Jaccard similarity of two signatures (fraction of equal MinHash rows)."""
+    if not sig_a or not sig_b or len(sig_a) != len(sig_b): return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+def fingerprint_job(job: dict) -> dict:
+    """
+    Builds the dedup fingerprint for a job dict: MinHash signature of `description_text`,
+    its LSH band keys, the normalized title/company key, the normalized location and, for jobs
+    without a URL or company, the exact key. This is what gets persisted alongside
+    cached jobs so later searches can match against them.
+    """
+    description = job.get('description_text') or ""
+    signature = compute_signature(shingle_text(description))
+    return {
+        'signature': signature,
+        'bands': signature_band_keys(signature),
+        'title_company_key': title_company_key(job),
+        'location_key': normalize_location(job.get('location')),
+        'exact_key': exact_key(job)
+    }
+
+def is_near_duplicate(fp_a: dict, fp_b: dict) -> bool:
+    """Decides whether two fingerprints describe the same posting."""
+    if not locations_compatible(fp_a.get('location_key'), fp_b.get('location_key')):
+        return False # The same text posted for two cities is two openings
+    similarity = estimate_similarity(fp_a.get('signature'), fp_b.get('signature'))
+    if similarity >= NEAR_DUPLICATE_THRESHOLD:
+        return True
+    same_role = fp_a.get('title_company_key') and fp_a.get('title_company_key') == fp_b.get('title_company_key')
+    if same_role:
+        # Same title at the same company: only keep both if the descriptions clearly differ
+        if not fp_a.get('signature') or not fp_b.get('signature'): return True
+        return similarity >= SAME_ROLE_THRESHOLD
+    return False
+
+
+class NearDuplicateIndex:
+    """
+    In-memory LSH index over job fingerprints. Adding a job costs O(bands) bucket lookups
+    plus a signature comparison per candidate, so deduplicating n jobs is linear in n.
+    One index is shared by the result lists of a single search; database_manager builds one
+    over cached postings to match results against the job cache.
+    """
+    def __init__(self):
+        self._urls: dict[str, int] = {}
+        self._exact_keys: dict[str, list[int]] = {}
+        self._buckets: dict[str, list[int]] = {}
+        self._keys: dict[str, list[int]] = {}
+        self._fingerprints: list[dict] = []
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def find_duplicate(self, fingerprint: dict, url: str = None) -> int | None:
+        """Returns the position of an already indexed duplicate, or None."""
+        if url and url in self._urls:
+            return self._urls[url]
+        location = fingerprint.get('location_key')
+        for idx in self._exact_keys.get(fingerprint.get('exact_key') or "", ()):
+            # Nothing but title and company to go on, so an unknown location is not a wildcard here
+            other_location = self._fingerprints[idx].get('location_key')
+            if bool(location) == bool(other_location) and locations_compatible(location, other_location):
+                return idx
+        candidates = set()
+        for band_key in fingerprint.get('bands', []):
+            candidates.update(self._buckets.get(band_key, ()))
+        if fingerprint.get('title_company_key'):
+            candidates.update(self._keys.get(fingerprint['title_company_key'], ()))
+        for idx in sorted(candidates):
+            if is_near_duplicate(fingerprint, self._fingerprints[idx]):
+                return idx
+        return None
+
+    def add(self, fingerprint: dict, url: str = None) -> int:
+        idx = len(self._fingerprints)
+        self._fingerprints.append(fingerprint)
+        if url: self._urls.setdefault(url, idx)
+        if fingerprint.get('exact_key'): self._exact_keys.setdefault(fingerprint['exact_key'], []).append(idx)
+        for band_key in fingerprint.get('bands', []):
+            self._buckets.setdefault(band_key, []).append(idx)
+        if fingerprint.get('title_company_key'):
+            self._keys.setdefault(fingerprint['title_company_key'], []).append(idx)
+        return idx
+
+    def add_if_new(self, job: dict, fingerprint: dict = None) -> bool:
+        """Indexes the job and returns True, or returns False if it duplicates an indexed job."""
+        if fingerprint is None: fingerprint = fingerprint_job(job)
+        url = (job.get('url') or "").strip() or None
+        if self.find_duplicate(fingerprint, url) is not None:
+            return False
+        self.add(fingerprint, url)
+        return True
+
+
+def deduplicate_jobs(jobs: list[dict], index: NearDuplicateIndex = None) -> list[dict]:
+    """
+    Drops exact-URL and near-duplicate jobs, keeping the first occurrence (fetch order).
+    Pass a shared `index` to deduplicate across several result lists or against cached jobs.
+    """
+    if index is None: index = NearDuplicateIndex()
+    unique_jobs = []
+    for job in jobs:
+        if index.add_if_new(job):
+            unique_jobs.append(job)
+    return unique_jobs
@@ -0,0 +1,66 @@
+# --- Configuration & Constants ---
+# Results pages show the first page of a search's jobs and fetch the rest through
+# /api/searches/<search_id>/jobs. Job summaries carry a description snippet only; the full
+# text is fetched per job on demand.
+JOB_PAGE_SIZE = 20
+JOB_PAGE_MAX_SIZE = 100
+DESCRIPTION_SNIPPET_CHARS = 250
+JOB_SORT_ORDERS = ('relevance', 'date') # relevance = the ranked order the search was saved in
+SUMMARY_FIELDS = ('title', 'company', 'location', 'source_site', 'url', 'publication_date', 'relevance_score')
+
+
+def parse_page_args(args) -> dict:
+    """
+    Validates cursor/limit/source/skill/sort query parameters (a Flask `request.args` or a dict).
+    Raises ValueError with a user-facing message on bad input.
+    """
+    cursor = args.get('cursor') or "0"
+    if not cursor.isdigit():
+        raise ValueError("Invalid cursor.")
+    try:
+        limit = int(args.get('limit', JOB_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise ValueError("Limit must be an integer.")
+    sort = args.get('sort') or 'relevance'
+    if sort not in JOB_SORT_ORDERS:
+        raise ValueError(f"Sort must be one of: {', '.join(JOB_SORT_ORDERS)}.")
+    return {
+        'offset': int(cursor),
+        'limit': max(1, min(limit, JOB_PAGE_MAX_SIZE)),
+        'source': (args.get('source') or "").strip() or None,
+        'skill': (args.get('skill') or "").strip() or None,
+        'sort': sort
+    }
+
+def next_cursor(offset: int, page_length: int, total: int) -> str | None:
+    end = offset + page_length
+    return str(end) if end < total else None
+
+def summarize_job(job: dict, position: int | None, snippet_chars: int = DESCRIPTION_SNIPPET_CHARS) -> dict:
+    """Card-sized view of a job: no full description, just a snippet and whether it was cut."""
+    description = job.get('description_text') or ""
+    summary = {field: job.get(field) for field in SUMMARY_FIELDS}
+    summary['extracted_skills'] = job.get('extracted_skills') or []
+    summary['description_text'] = description[:snippet_chars]
+    summary['description_truncated'] = len(description) > snippet_chars
+    summary['position'] = position
+    return summary
+
+def page_jobs(jobs: list[dict], offset: int = 0, limit: int = JOB_PAGE_SIZE, source: str = None,
+              skill: str = None, sort: str = 'relevance') -> tuple[list[dict], int]:
+    """
+    In-memory counterpart of database_manager.get_search_session_jobs_page, for results kept in
+    the session. Returns (summaries, total matching). `position` indexes into `jobs`.
+    """
+    positions = range(len(jobs))
+    if source:
+        positions = [i for i in positions if (jobs[i].get('source_site') or "").lower() == source.lower()]
+    if skill:
+        positions = [i for i in positions if skill.lower() in {s.lower() for s in jobs[i].get('extracted_skills') or [] if isinstance(s, str)}]
+    positions = list(positions)
+    if sort == 'date':
+        # ISO-8601 UTC strings sort chronologically; undated jobs go last
+        dated = sorted((i for i in positions if jobs[i].get('publication_date')), key=lambda i: jobs[i]['publication_date'], reverse=True)
+        positions = dated + [i for i in positions if not jobs[i].get('publication_date')]
+    page = positions[offset:offset + limit]
+    return [summarize_job(jobs[i], i) for i in page], len(positions)
@@ -0,0 +1,181 @@
+import math
+import time
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+try:
+    from core.job_record import JobRecord, parse_utc_datetime
+    from core.skill_ontology import get_skill_ontology
+except ImportError: # Allows running this file directly from inside core/
+    from job_record import JobRecord, parse_utc_datetime
+    from skill_ontology import get_skill_ontology
+
+# --- Configuration & Constants ---
+# Hashed features are stateless, so new jobs can be vectorized and appended to an
+# existing catalog matrix without refitting a vocabulary.
+TEXT_FEATURES = 2 ** 18
+SKILL_FEATURES = 2 ** 12
+TEXT_WEIGHT = 0.55 # Cosine similarity of job description vs resume text
+SKILL_WEIGHT = 0.35 # Share of the job's listed skills that the candidate has
+RECENCY_WEIGHT = 0.10 # Newer postings rank slightly higher
+RECENCY_HALF_LIFE_DAYS = 21.0
+
+_text_vectorizer = HashingVectorizer(n_features=TEXT_FEATURES, alternate_sign=False, norm='l2',
+                                     ngram_range=(1, 2), stop_words='english', dtype=np.float32)
+_skill_hasher = FeatureHasher(n_features=SKILL_FEATURES, input_type='string', alternate_sign=False, dtype=np.float32)
+
+
+# --- Feature Helpers ---
+def parse_publication_timestamp(value) -> float | None:
+    """Parses a source's publication date (ISO string, datetime or epoch) into a UTC epoch timestamp."""
+    dt = parse_utc_datetime(value)
+    return dt.timestamp() if dt else None
+
+def _job_text(job: dict) -> str:
+    return " ".join(filter(None, [job.get('title'), job.get('title'), job.get('description_text')])) # Title counted twice
+
+def _skill_tokens(skills) -> list[str]:
+    """Lowercased skills, aliases folded into their canonical skill ("postgres" -> "postgresql") so both sides overlap."""
+    alias_map = get_skill_ontology().alias_map
+    return sorted({alias_map.get(key, key) for key in (s.strip().lower() for s in (skills or []) if isinstance(s, str)) if key})
+
+def vectorize_jobs(jobs: list[dict]) -> tuple:
+    """Returns (text_matrix, skill_matrix, skill_counts, timestamps) for a list of job dicts."""
+    text_matrix = _text_vectorizer.transform([_job_text(job) for job in jobs]).tocsr()
+    skill_lists = [_skill_tokens(job.get('extracted_skills')) for job in jobs]
+    skill_matrix = _skill_hasher.transform(skill_lists).tocsr()
+    skill_matrix.data[:] = 1.0 # Binary presence, even if two skills hash to the same column
+    skill_counts = np.array([len(s) for s in skill_lists], dtype=np.float32)
+    timestamps = np.array([parse_publication_timestamp(job.get('publication_date')) or np.nan for job in jobs], dtype=np.float64)
+    return text_matrix, skill_matrix, skill_counts, timestamps
+
+def vectorize_resume(resume_skills: list[str], resume_text: str = None) -> tuple:
+    """Returns (text_vector, skill_vector) for the candidate. Skills are appended to the text so they always count."""
+    skills = _skill_tokens(resume_skills)
+    text = " ".join(filter(None, [resume_text, " ".join(skills)]))
+    text_vector = _text_vectorizer.transform([text]).tocsr()
+    skill_vector = _skill_hasher.transform([skills]).tocsr()
+    skill_vector.data[:] = 1.0
+    return text_vector, skill_vector
+
+def score_matrices(text_matrix, skill_matrix, skill_counts, timestamps, text_vector, skill_vector, now: float = None) -> np.ndarray:
+    """Scores every job in one pass: two sparse matrix-vector products plus a vectorized recency term."""
+    if text_matrix.shape[0] == 0: return np.zeros(0, dtype=np.float32)
+    text_scores = np.asarray((text_matrix @ text_vector.T).todense()).ravel()
+    overlap = np.asarray((skill_matrix @ skill_vector.T).todense()).ravel()
+    skill_scores = overlap / np.maximum(skill_counts, 1.0)
+    now = time.time() if now is None else now
+    age_days = np.clip((now - timestamps) / 86400.0, 0.0, None)
+    recency = np.where(np.isnan(age_days), 0.0, np.exp(-math.log(2) * age_days / RECENCY_HALF_LIFE_DAYS))
+    return (TEXT_WEIGHT * text_scores + SKILL_WEIGHT * skill_scores + RECENCY_WEIGHT * recency).astype(np.float32)
+
+def top_k_indices(scores: np.ndarray, top_k: int = None) -> np.ndarray:
+    """Indices of the top_k highest scores, best first (all indices if top_k is None)."""
+    if top_k is None or top_k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    if top_k <= 0: return np.zeros(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+# --- Public API ---
+def rank_jobs(jobs: list[dict], resume_skills: list[str], resume_text: str = None, top_k: int = None) -> list[dict]:
+    """
+    Orders a freshly scraped job list by relevance to the candidate and returns the top_k.
+    Each returned job gets a `relevance_score` in [0, 1].
+    """
+    if not jobs: return []
+    text_matrix, skill_matrix, skill_counts, timestamps = vectorize_jobs(jobs)
+    text_vector, skill_vector = vectorize_resume(resume_skills, resume_text)
+    scores = score_matrices(text_matrix, skill_matrix, skill_counts, timestamps, text_vector, skill_vector)
+    ranked = []
+    for idx in top_k_indices(scores, top_k):
+        job = jobs[idx]
+        job['relevance_score'] = round(float(scores[idx]), 4)
+        ranked.append(job)
+    return ranked
+
+
+class JobCatalogRanker:
+    """
+    Keeps precomputed feature matrices for the cached job catalog so that ranking it for a
+    request is just two sparse products and a top-k selection. New or updated jobs are
+    vectorized on arrival and appended (`add_jobs`); replaced rows are masked out and
+    dropped on the next `compact()`. Jobs are held as compact JobRecords, not dicts.
+    Every method holds `lock` (re-entrant) while it touches the matrices, so one instance can be
+    shared by request threads; callers serialize their own read-`last_synced_at`/fetch/add sync.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.jobs: list[JobRecord] = []
+        self._row_by_url: dict[str, int] = {}
+        self._active = np.zeros(0, dtype=bool)
+        self._text_matrix = sp.csr_matrix((0, TEXT_FEATURES), dtype=np.float32)
+        self._skill_matrix = sp.csr_matrix((0, SKILL_FEATURES), dtype=np.float32)
+        self._skill_counts = np.zeros(0, dtype=np.float32)
+        self._timestamps = np.zeros(0, dtype=np.float64)
+        self.last_synced_at: tuple | None = None # (last_updated_at, _id) of the last synced catalog job
+
+    def __len__(self) -> int:
+        with self.lock:
+            return int(self._active.sum())
+
+    def add_jobs(self, jobs: list[dict]) -> int:
+        """Vectorizes and appends jobs. A job whose URL is already in the catalog replaces the old row."""
+        jobs = [job for job in jobs if job]
+        if not jobs: return 0
+        text_matrix, skill_matrix, skill_counts, timestamps = vectorize_jobs(jobs) # Outside the lock; rank() keeps serving meanwhile
+        records = [JobRecord.from_dict(job) for job in jobs]
+        with self.lock:
+            start = len(self.jobs)
+            self.jobs.extend(records)
+            self._text_matrix = sp.vstack([self._text_matrix, text_matrix], format='csr')
+            self._skill_matrix = sp.vstack([self._skill_matrix, skill_matrix], format='csr')
+            self._skill_counts = np.concatenate([self._skill_counts, skill_counts])
+            self._timestamps = np.concatenate([self._timestamps, timestamps])
+            self._active = np.concatenate([self._active, np.ones(len(jobs), dtype=bool)])
+            for offset, record in enumerate(records): # After the append, so a URL repeated in this batch masks its earlier row
+                url = record.url
+                if url in self._row_by_url:
+                    self._active[self._row_by_url[url]] = False
+                if url: self._row_by_url[url] = start + offset
+            if len(self.jobs) > 2 * max(len(self), 1): self.compact()
+        return len(jobs)
+
+    def remove_urls(self, urls) -> None:
+        with self.lock:
+            for url in urls:
+                row = self._row_by_url.pop(url, None)
+                if row is not None: self._active[row] = False
+
+    def compact(self) -> None:
+        """Physically drops replaced/removed rows."""
+        with self.lock:
+            keep = np.flatnonzero(self._active)
+            self.jobs = [self.jobs[i] for i in keep]
+            self._text_matrix = self._text_matrix[keep]
+            self._skill_matrix = self._skill_matrix[keep]
+            self._skill_counts = self._skill_counts[keep]
+            self._timestamps = self._timestamps[keep]
+            self._active = np.ones(len(keep), dtype=bool)
+            self._row_by_url = {record.url: i for i, record in enumerate(self.jobs) if record.url}
+
+    def rank(self, resume_skills: list[str], resume_text: str = None, top_k: int = 20) -> list[dict]:
+        """Returns copies of the top_k catalog jobs for this candidate, each with a `relevance_score`."""
+        text_vector, skill_vector = vectorize_resume(resume_skills, resume_text)
+        with self.lock:
+            active_count = len(self)
+            if not active_count: return []
+            scores = score_matrices(self._text_matrix, self._skill_matrix, self._skill_counts, self._timestamps,
+                                    text_vector, skill_vector)
+            scores[~self._active] = -np.inf
+            results = []
+            for idx in top_k_indices(scores, min(top_k, active_count) if top_k is not None else active_count):
+                if not self._active[idx]: continue
+                job = self.jobs[idx].to_dict()
+                job['relevance_score'] = round(float(scores[idx]), 4)
+                results.append(job)
+        return results
@@ -0,0 +1,216 @@
+import sys
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import dateutil.parser as date_parser
+
+# --- Canonical Job Record ---
+# Fetchers still build plain dicts (title, company, location, description_text,
+# extracted_skills, url, publication_date, source_site). JobRecord is the normalized
+# form those dicts are converted to: one UTC datetime instead of each source's date
+# format, interned source/location/company strings, and skills as a bitmask over a
+# fixed vocabulary. to_dict() gives back the exact dict shape templates and the
+# session expect; to_bson() adds the native datetime for Mongo queries.
+
+JOB_FIELDS = ('title', 'company', 'location', 'description_text', 'url', 'source_site')
+
+
+class SkillVocabulary:
+    """
+    Fixed, ordered list of canonical skills. A job's skills are stored as an int bitmask over it.
+    `aliases` maps lowercased alias -> lowercased canonical skill; an alias sets its canonical skill's bit.
+    """
+    __slots__ = ('skills', '_bit_by_skill')
+
+    def __init__(self, skills: list[str], aliases: dict[str, str] = None):
+        self.skills: list[str] = []
+        self._bit_by_skill: dict[str, int] = {}
+        for skill in skills:
+            key = skill.strip().lower() if isinstance(skill, str) else ""
+            if key and key not in self._bit_by_skill:
+                self._bit_by_skill[key] = len(self.skills)
+                self.skills.append(sys.intern(skill.strip()))
+        for alias, canonical in (aliases or {}).items():
+            if canonical in self._bit_by_skill: self._bit_by_skill.setdefault(alias, self._bit_by_skill[canonical])
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def encode(self, skills) -> tuple[int, tuple]:
+        """Returns (mask, extras): the bitmask of known skills and a tuple of skills outside the vocabulary."""
+        mask, extras = 0, []
+        for skill in skills or ():
+            if not isinstance(skill, str): continue
+            bit = self._bit_by_skill.get(skill.strip().lower())
+            if bit is None:
+                if skill.strip(): extras.append(sys.intern(skill.strip()))
+            else:
+                mask |= 1 << bit
+        return mask, tuple(extras)
+
+    def mask_for(self, skills) -> int:
+        return self.encode(skills)[0]
+
+    def decode(self, mask: int) -> list[str]:
+        """Skills set in `mask`, in vocabulary order."""
+        skills = []
+        while mask:
+            low_bit = mask & -mask
+            skills.append(self.skills[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return skills
+
+
+_default_vocabulary: SkillVocabulary | None = None
+
+def set_default_skill_vocabulary(vocabulary: SkillVocabulary):
+    global _default_vocabulary
+    _default_vocabulary = vocabulary
+
+def get_default_skill_vocabulary() -> SkillVocabulary:
+    """The shared skill ontology (core/skill_ontology.py) with its aliases, unless another vocabulary was registered."""
+    global _default_vocabulary
+    if _default_vocabulary is None:
+        try:
+            from core.skill_ontology import get_skill_ontology
+        except ImportError: # Allows running from inside core/
+            from skill_ontology import get_skill_ontology
+        ontology = get_skill_ontology()
+        _default_vocabulary = SkillVocabulary(ontology.job_keywords(), aliases=ontology.alias_map)
+    return _default_vocabulary
+
+
+def parse_utc_datetime(value) -> datetime | None:
+    """
+    Parses the publication dates the sources return (ISO strings with or without offset,
+    'YYYY-MM-DD', epoch seconds or milliseconds, datetimes) into an aware UTC datetime.
+    """
+    if value is None or value == "": return None
+    try:
+        if isinstance(value, datetime):
+            dt = value
+        elif isinstance(value, (int, float)):
+            dt = datetime.fromtimestamp(value / 1000.0 if value > 1e11 else value, tz=timezone.utc)
+        else:
+            text = str(value).strip()
+            try:
+                dt = datetime.fromisoformat(text) # Fast path; covers most sources
+            except ValueError:
+                dt = date_parser.parse(text)
+        if dt.tzinfo is None: return dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc)
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None
+
+def format_utc_datetime(dt: datetime | None) -> str | None:
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ') if dt else None
+
+def _intern(value) -> str:
+    return sys.intern(value) if isinstance(value, str) else ("" if value is None else str(value))
+
+
+@dataclass(slots=True)
+class JobRecord:
+    title: str
+    company: str
+    location: str
+    description_text: str
+    url: str
+    source_site: str
+    published_at: datetime | None = None
+    skills_mask: int = 0
+    extra_skills: tuple = ()
+    relevance_score: float | None = None
+
+    @classmethod
+    def from_dict(cls, job: dict, vocabulary: SkillVocabulary = None) -> "JobRecord":
+        """Builds a record from a fetcher/cached job dict. Also accepts to_bson() output."""
+        vocabulary = vocabulary or get_default_skill_vocabulary()
+        skills_mask, extra_skills = vocabulary.encode(job.get('extracted_skills'))
+        published_at = job.get('published_at')
+        if not isinstance(published_at, datetime):
+            published_at = parse_utc_datetime(job.get('publication_date'))
+        elif published_at.tzinfo is None:
+            published_at = published_at.replace(tzinfo=timezone.utc) # pymongo returns naive UTC datetimes
+        return cls(
+            title=job.get('title') or "N/A",
+            company=_intern(job.get('company') or "N/A"),
+            location=_intern(job.get('location') or "N/A"),
+            description_text=job.get('description_text') or "",
+            url=job.get('url') or "",
+            source_site=_intern(job.get('source_site') or ""),
+            published_at=published_at,
+            skills_mask=skills_mask,
+            extra_skills=extra_skills,
+            relevance_score=job.get('relevance_score')
+        )
+
+    from_bson = from_dict
+
+    def skills(self, vocabulary: SkillVocabulary = None) -> list[str]:
+        return (vocabulary or get_default_skill_vocabulary()).decode(self.skills_mask) + list(self.extra_skills)
+
+    def has_skills(self, mask: int) -> bool:
+        """True if the job lists every skill in `mask` (see SkillVocabulary.mask_for)."""
+        return self.skills_mask & mask == mask
+
+    @property
+    def published_timestamp(self) -> float | None:
+        return self.published_at.timestamp() if self.published_at else None
+
+    def to_dict(self, vocabulary: SkillVocabulary = None) -> dict:
+        """JSON-safe dict in the shape the fetchers produce; `publication_date` becomes ISO-8601 UTC."""
+        job = {
+            'title': self.title,
+            'company': self.company,
+            'location': self.location,
+            'description_text': self.description_text,
+            'extracted_skills': self.skills(vocabulary),
+            'url': self.url,
+            'publication_date': format_utc_datetime(self.published_at),
+            'source_site': self.source_site
+        }
+        if self.relevance_score is not None: job['relevance_score'] = self.relevance_score
+        return job
+
+    def to_bson(self, vocabulary: SkillVocabulary = None) -> dict:
+        """to_dict() plus `published_at` as a native datetime, so Mongo can index and range-query it."""
+        doc = self.to_dict(vocabulary)
+        doc['published_at'] = self.published_at
+        return doc
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':'))
+
+
+# --- Batch Helpers ---
+def records_from_dicts(jobs: list[dict], vocabulary: SkillVocabulary = None) -> list[JobRecord]:
+    vocabulary = vocabulary or get_default_skill_vocabulary()
+    return [JobRecord.from_dict(job, vocabulary) for job in jobs if job]
+
+def records_to_dicts(records: list[JobRecord], vocabulary: SkillVocabulary = None) -> list[dict]:
+    vocabulary = vocabulary or get_default_skill_vocabulary()
+    return [record.to_dict(vocabulary) for record in records]
+
+def normalize_jobs(jobs: list[dict]) -> list[dict]:
+    """Round-trips fetcher dicts through JobRecord: canonical UTC dates and skill names, no stray keys."""
+    return records_to_dicts(records_from_dicts(jobs))
+
+def dumps_records(records: list[JobRecord]) -> str:
+    return json.dumps(records_to_dicts(records), ensure_ascii=False, separators=(',', ':'))
+
+def loads_records(data: str | bytes) -> list[JobRecord]:
+    return records_from_dicts(json.loads(data))
+
+def sort_by_published(records: list[JobRecord], newest_first: bool = True) -> list[JobRecord]:
+    """Sorts on the parsed timestamp; undated jobs go last either way."""
+    dated = [r for r in records if r.published_at]
+    undated = [r for r in records if not r.published_at]
+    dated.sort(key=lambda r: r.published_at, reverse=newest_first)
+    return dated + undated
+
+def filter_by_skills(records: list[JobRecord], skills: list[str], vocabulary: SkillVocabulary = None) -> list[JobRecord]:
+    """Jobs listing every one of `skills` (skills outside the vocabulary are ignored)."""
+    mask = (vocabulary or get_default_skill_vocabulary()).mask_for(skills)
+    return [r for r in records if r.has_skills(mask)]
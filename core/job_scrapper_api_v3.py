@@ -4,6 +4,18 @@ import json
 import re
 from urllib.parse import quote_plus # For URL encoding search terms
 from dotenv import load_dotenv # To load .env file for local development
+try:
+    from core.job_deduplicator import NearDuplicateIndex, deduplicate_jobs
+    from core.source_quota import quota_manager, response_cache, RESPONSE_CACHE_FRESH_SECONDS, RESPONSE_CACHE_STALE_SECONDS
+    from core.job_record import SkillVocabulary, set_default_skill_vocabulary, normalize_jobs
+    from core.instrumentation import span, timed
+    from core.skill_ontology import get_skill_ontology
+except ImportError: # Allows running this file directly from inside core/
+    from job_deduplicator import NearDuplicateIndex, deduplicate_jobs
+    from source_quota import quota_manager, response_cache, RESPONSE_CACHE_FRESH_SECONDS, RESPONSE_CACHE_STALE_SECONDS
+    from job_record import SkillVocabulary, set_default_skill_vocabulary, normalize_jobs
+    from instrumentation import span, timed
+    from skill_ontology import get_skill_ontology
 
 load_dotenv() # This loads all variables from .env into environment variables
 
@@ -16,98 +28,16 @@ RAPIDAPI_HOST = "jsearch.p.rapidapi.com"
 ADZUNA_APP_ID = os.environ.get('ADZUNA_APP_ID')
 ADZUNA_APP_KEY = os.environ.get('ADZUNA_APP_KEY')
 
+USAJOBS_FALLBACK_MAX_CALLS = 5 # Cap on keyword requests the USAJOBS fallback search may spend per scrape
+
 DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 ResumeJobMatcher/1.0'
 
-PREDEFINED_SKILLS_KEYWORDS = [
-    # Programming Languages
-    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift',
-    'kotlin', 'scala', 'r', 'matlab', 'perl', 'shell scripting', 'bash', 'powershell', 'c',
-    'objective-c', 'groovy', 'dart', 'lua', 'assembly',
-    # Web Development - Frontend
-    'html', 'html5', 'css', 'css3', 'react', 'react.js', 'angular', 'angular.js', 'vue', 'vue.js',
-    'next.js', 'nuxt.js', 'gatsby', 'jquery', 'bootstrap', 'tailwind css', 'sass', 'less',
-    'webpack', 'babel', 'gulp', 'grunt', 'ember.js', 'svelte', 'webassembly', 'restful apis',
-    'soap apis', 'graphql', 'ajax', 'json', 'xml', 'jwt', 'websockets', 'ssr', 'csr', 'pwa',
-    'responsive design', 'cross-browser compatibility',
-    # Web Development - Backend
-    'node.js', 'express', 'express.js', 'django', 'flask', 'spring', 'spring boot', 'asp.net', '.net core',
-    'laravel', 'ruby on rails', 'phoenix', 'elixir', 'fastapi', 'hapi', 'koa', 'nestJS', 'strapi',
-    'serverless framework', 'firebase', 'api development', 'api design',
-    # Databases & Data Storage
-    'sql', 'mysql', 'postgresql', 'postgres', 'mongodb', 'mongo', 'redis', 'oracle db', 'sqlite',
-    'cassandra', 'dynamodb', 'elasticsearch', 'neo4j', 'couchdb', 'mariadb', 'ms sql server',
-    'nosql', 'firebase realtimedb', 'firebase firestore', 'influxdb', 'etcd', 'data warehousing',
-    'database design', 'database administration', 'data modeling', 'query optimization', 'sql alchemy',
-    'hibernate', 'typeorm', 'prisma',
-    # Cloud Platforms & Services
-    'aws', 'amazon web services', 'azure', 'microsoft azure', 'gcp', 'google cloud platform',
-    'google cloud', 'heroku', 'digitalocean', 'linode', 'ovh', 'alibaba cloud', 'ibm cloud',
-    'oracle cloud infrastructure', 'oci', 'vmware', 'openshift', 'lambda', 'azure functions',
-    'google cloud functions', 's3', 'ec2', 'rds', 'azure blob storage', 'azure virtual machines',
-    'google cloud storage', 'google compute engine', 'cloudformation', 'azure resource manager',
-    'google cloud deployment manager', 'cloudwatch', 'azure monitor', 'stackdriver',
-    # DevOps & Infrastructure
-    'docker', 'kubernetes', 'k8s', 'terraform', 'ansible', 'jenkins', 'gitlab ci', 'github actions',
-    'circleci', 'travis ci', 'chef', 'puppet', 'vagrant', 'prometheus', 'grafana', 'elk stack',
-    'splunk', 'nagios', 'zabbix', 'infrastructure as code', 'iac', 'ci/cd', 'continuous integration',
-    'continuous delivery', 'continuous deployment', 'configuration management', 'monitoring',
-    'logging', 'alerting', 'site reliability engineering', 'sre', 'devops', 'sysadmin',
-    # Operating Systems
-    'linux', 'unix', 'windows server', 'macos', 'ubuntu', 'centos', 'debian', 'red hat', 'fedora',
-    'coreos', 'alpine linux',
-    # Data Science, Machine Learning, AI
-    'machine learning', 'ml', 'deep learning', 'dl', 'data analysis', 'data science', 'statistics',
-    'natural language processing', 'nlp', 'computer vision', 'cv', 'artificial intelligence', 'ai',
-    'pandas', 'numpy', 'scipy', 'scikit-learn', 'sklearn', 'tensorflow', 'keras', 'pytorch', 'torch',
-    'matplotlib', 'seaborn', 'plotly', 'jupyter notebooks', 'rstudio', 'tableau', 'power bi',
-    'apache spark', 'spark', 'hadoop', 'kafka', 'apache kafka', 'airflow', 'apache airflow',
-    'hive', 'presto', 'dask', 'xgboost', 'lightgbm', 'catboost', 'shap', 'nltk', 'spacy', 'opencv',
-    'data mining', 'data visualization', 'big data', 'etl', 'feature engineering', 'model deployment',
-    'recommender systems', 'time series analysis', 'a/b testing', 'reinforcement learning', 'mlops',
-    # Mobile Development
-    'mobile development', 'ios', 'android development', 'react native', 'flutter', 'xamarin',
-    'cordova', 'ionic', 'swift', 'objective-c', 'kotlin', 'java (android)', 'swiftui',
-    'jetpack compose', 'kotlin multiplatform', 'xcode', 'android studio',
-    # Software Engineering Practices & Tools
-    'git', 'github', 'gitlab', 'bitbucket', 'svn', 'jira', 'confluence', 'slack',
-    'microsoft teams', 'trello', 'asana', 'notion', 'unit testing', 'integration testing',
-    'end-to-end testing', 'test driven development', 'tdd', 'behavior driven development', 'bdd',
-    'design patterns', 'software architecture', 'microservices architecture', 'agile', 'scrum',
-    'kanban', 'waterfall', 'lean', 'six sigma', 'oop', 'object-oriented programming',
-    'functional programming', 'rest api design', 'api security', 'oauth', 'saml', 'sso',
-    'software development life cycle', 'sdlc', 'code review', 'pair programming', 'version control',
-    # Cybersecurity
-    'cybersecurity', 'information security', 'network security', 'application security',
-    'penetration testing', 'ethical hacking', 'vulnerability assessment', 'siem', 'ids/ips',
-    'firewalls', 'cryptography', 'iam', 'identity and access management', 'gdpr', 'hipaa',
-    'iso 27001', 'soc2', 'owasp', 'malware analysis', 'digital forensics',
-    # Design & UX/UI
-    'ui/ux', 'ui design', 'ux design', 'user interface design', 'user experience design',
-    'figma', 'adobe xd', 'sketch', 'invision', 'zeplin', 'adobe photoshop', 'photoshop',
-    'adobe illustrator', 'illustrator', 'user research', 'wireframing', 'prototyping',
-    'usability testing', 'design thinking', 'interaction design', 'visual design', 'design systems',
-    # Business & Management
-    'project management', 'product management', 'business analysis', 'stakeholder management',
-    'requirements gathering', 'business development', 'strategy', 'market research',
-    'financial analysis', 'risk management', 'quality assurance', 'qa', 'erp', 'sap', 'salesforce',
-    'microsoft dynamics', 'supply chain management', 'logistics',
-    # Soft Skills
-    'communication', 'verbal communication', 'written communication', 'teamwork', 'collaboration',
-    'problem solving', 'analytical skills', 'critical thinking', 'leadership', 'team leadership',
-    'time management', 'adaptability', 'flexibility', 'creativity', 'innovation',
-    'attention to detail', 'mentoring', 'coaching', 'negotiation', 'conflict resolution',
-    'decision making', 'public speaking', 'presentation skills', 'customer service', 'client relations',
-    # General/Entry Level Terms
-    'fresher', 'entry level', 'trainee', 'intern', 'junior', 'Software Development', 'Design', 'Product',
-    'Data Analysis','DevOps','Sysadmin',
-    # Domain Specific
-    'healthcare IT', 'fintech', 'ecommerce', 'blockchain', 'iot', 'internet of things',
-    'bioinformatics', 'gis', 'game development', 'unreal engine', 'unity',
-    # Certifications
-    'aws certified', 'azure certified', 'gcp certified', 'pmp', 'csm', 'comptia',
-    'cissp', 'ccna', 'cisa'
-]
-PREDEFINED_SKILLS_LOWER = [skill.lower() for skill in PREDEFINED_SKILLS_KEYWORDS]
+# Skills come from the ontology shared with the resume parser (core/skill_ontology.json). Aliases share
+# their canonical skill's bit, so "postgres" in a resume and "PostgreSQL" in a posting set the same bit.
+SKILL_ONTOLOGY = get_skill_ontology()
+PREDEFINED_SKILLS_KEYWORDS = SKILL_ONTOLOGY.job_keywords()
+SKILL_VOCABULARY = SkillVocabulary(PREDEFINED_SKILLS_KEYWORDS, aliases=SKILL_ONTOLOGY.alias_map) # Bit positions for JobRecord.skills_mask
+set_default_skill_vocabulary(SKILL_VOCABULARY)
 
 # --- Helper Functions ---
 def make_request(url: str, headers: dict = None, params: dict = None, timeout: int = 15) -> dict | None:
@@ -131,39 +61,46 @@ def make_request(url: str, headers: dict = None, params: dict = None, timeout: i
             print(f"Response content that failed to parse: {response.text[:500]}")
     return None
 
-def extract_skills_from_text(text: str, skill_list: list) -> list[str]:
+def quota_request(source: str, url: str, headers: dict = None, params: dict = None, priority: str = "high") -> dict | None:
+    """
+    make_request behind the source's rate limiter and quota budget.
+    Recent identical requests are answered from the response cache without spending quota. When the
+    limiter or quota refuses the call, a stale cached response is served if one exists; otherwise the
+    source is skipped (None) instead of failing the whole search.
+    """
+    cache_key = response_cache.make_key(source, url, params)
+    cached = response_cache.get(cache_key, RESPONSE_CACHE_FRESH_SECONDS)
+    if cached is not None:
+        print(f"{source}: Serving cached response (no quota spent).")
+        return cached
+    if not quota_manager.acquire(source, priority=priority):
+        stale = response_cache.get(cache_key, RESPONSE_CACHE_STALE_SECONDS)
+        if stale is not None:
+            print(f"{source}: Rate limit or quota reached. Serving stale cached response.")
+            return stale
+        print(f"{source}: Rate limit or quota reached (remaining: {quota_manager.remaining(source)}). Skipping source.")
+        return None
+    with span(f"jobs.http.{source}"):
+        data = make_request(url, headers=headers, params=params)
+    if data is not None:
+        response_cache.put(cache_key, data)
+    return data
+
+def extract_skills_from_text(text: str) -> list[str]:
+    """Canonical names of the ontology skills (or their aliases) mentioned in `text`, matched on whole tokens."""
     if not text: return []
-    found_skills = set()
-    text_lower = text.lower()
-    # Sort skill_list by length in descending order to match longer phrases first
-    sorted_skill_list = sorted(skill_list, key=len, reverse=True) # skill_list here is PREDEFINED_SKILLS_LOWER
-    for skill_keyword_lower in sorted_skill_list:
-        try:
-            # Use word boundaries to match whole words/phrases
-            pattern = r'\b' + re.escape(skill_keyword_lower) + r'\b'
-            if re.search(pattern, text_lower):
-                # Try to get the original casing from PREDEFINED_SKILLS_KEYWORDS
-                try:
-                    original_casing_skill = PREDEFINED_SKILLS_KEYWORDS[PREDEFINED_SKILLS_LOWER.index(skill_keyword_lower)]
-                    found_skills.add(original_casing_skill)
-                except ValueError: # Should not happen if PREDEFINED_SKILLS_LOWER is derived correctly
-                    found_skills.add(skill_keyword_lower) # Fallback to the lowercased keyword
-        except re.error as e_re:
-            # This might happen if a skill keyword contains special regex characters
-            # that re.escape didn't fully handle or if the skill itself forms an invalid pattern.
-            print(f"Regex error for skill '{skill_keyword_lower}': {e_re}")
-            continue # Skip this skill and continue with the next
-    return sorted(list(found_skills))
+    return SKILL_ONTOLOGY.extract(text)
 
 # --- API Specific Fetch Functions ---
 
-def fetch_remotive_jobs(keywords: list[str], limit: int = 5) -> list[dict]:
+@timed("jobs.fetch.remotive")
+def fetch_remotive_jobs(keywords: list[str], limit: int = 5, priority: str = "high") -> list[dict]:
     print(f"\nFetching jobs from Remotive for keywords: {keywords}...")
     if not keywords: print("Remotive: No keywords provided."); return []
     base_url = "https://remotive.com/api/remote-jobs"
     search_query = " ".join(keywords)
     params = {'search': search_query, 'limit': limit}
-    data = make_request(base_url, params=params)
+    data = quota_request('remotive', base_url, params=params, priority=priority)
     jobs = []
     if data and 'jobs' in data:
         for job_entry in data['jobs']:
@@ -175,7 +112,7 @@ def fetch_remotive_jobs(keywords: list[str], limit: int = 5) -> list[dict]:
                 'company': job_entry.get('company_name'),
                 'location': job_entry.get('candidate_required_location', 'Remote'),
                 'description_text': cleaned_description,
-                'extracted_skills': extract_skills_from_text(cleaned_description, PREDEFINED_SKILLS_LOWER),
+                'extracted_skills': extract_skills_from_text(cleaned_description),
                 'url': job_entry.get('url'),
                 'publication_date': job_entry.get('publication_date'),
                 'source_site': 'Remotive API'
@@ -185,7 +122,8 @@ def fetch_remotive_jobs(keywords: list[str], limit: int = 5) -> list[dict]:
         print("No jobs found or error fetching from Remotive.")
     return jobs
 
-def fetch_arbeitnow_jobs(keywords: list[str], limit: int = 5, location_query: str = None) -> list[dict]:
+@timed("jobs.fetch.arbeitnow")
+def fetch_arbeitnow_jobs(keywords: list[str], limit: int = 5, location_query: str = None, priority: str = "high") -> list[dict]:
     print(f"\nFetching jobs from Arbeitnow for keywords: {keywords}, location: {location_query if location_query else 'Global'}...")
     if not keywords: print("Arbeitnow: No keywords provided."); return []
     base_url = "https://arbeitnow.com/api/job-board-api"
@@ -200,7 +138,7 @@ def fetch_arbeitnow_jobs(keywords: list[str], limit: int = 5, location_query: st
     # For more specific location filtering with Arbeitnow, one might need to explore if their API supports structured location fields.
     # For now, `location_query` is mainly for print statement and potentially for `q`.
 
-    data = make_request(base_url, params=params)
+    data = quota_request('arbeitnow', base_url, params=params, priority=priority)
     jobs = []
     if data and 'data' in data:
         for i, job_entry in enumerate(data['data']):
@@ -213,7 +151,7 @@ def fetch_arbeitnow_jobs(keywords: list[str], limit: int = 5, location_query: st
                 'company': job_entry.get('company_name'),
                 'location': job_entry.get('location', location_query if location_query and location_query.lower() != "any" else "Not specified"),
                 'description_text': cleaned_description,
-                'extracted_skills': extract_skills_from_text(cleaned_description, PREDEFINED_SKILLS_LOWER),
+                'extracted_skills': extract_skills_from_text(cleaned_description),
                 'url': job_entry.get('url'),
                 'publication_date': job_entry.get('created_at'),
                 'source_site': 'Arbeitnow API'
@@ -223,7 +161,8 @@ def fetch_arbeitnow_jobs(keywords: list[str], limit: int = 5, location_query: st
         print("No jobs found or error fetching from Arbeitnow.")
     return jobs
 
-def fetch_usajobs(keywords: list[str], limit: int = 5, location_name: str = None) -> list[dict]:
+@timed("jobs.fetch.usajobs")
+def fetch_usajobs(keywords: list[str], limit: int = 5, location_name: str = None, priority: str = "high") -> list[dict]:
     # This function will now primarily be used when skills_json is successfully loaded.
     # The extensive fallback is handled directly in scrape_jobs.
     print(f"\nFetching jobs from USAJOBS (standard search) for keywords: {keywords[:5]}..., location: {location_name if location_name else 'US Nationwide'}...")
@@ -240,7 +179,7 @@ def fetch_usajobs(keywords: list[str], limit: int = 5, location_name: str = None
     if location_name:
         params['LocationName'] = location_name
 
-    data = make_request(base_url, headers=headers, params=params)
+    data = quota_request('usajobs', base_url, headers=headers, params=params, priority=priority)
     jobs = []
     if data and data.get('SearchResult', {}).get('SearchResultItems'):
         for item in data['SearchResult']['SearchResultItems']:
@@ -257,7 +196,7 @@ def fetch_usajobs(keywords: list[str], limit: int = 5, location_name: str = None
                 'company': job_entry.get('OrganizationName'),
                 'location': job_entry.get('PositionLocationDisplay'),
                 'description_text': cleaned_desc,
-                'extracted_skills': extract_skills_from_text(cleaned_desc, PREDEFINED_SKILLS_LOWER),
+                'extracted_skills': extract_skills_from_text(cleaned_desc),
                 'url': job_entry.get('PositionURI'),
                 'publication_date': job_entry.get('PublicationStartDate'),
                 'source_site': 'USAJOBS API'
@@ -267,7 +206,8 @@ def fetch_usajobs(keywords: list[str], limit: int = 5, location_name: str = None
         print("No jobs found or error fetching from USAJOBS (standard search).")
     return jobs
 
-def fetch_adzuna_jobs(keywords: list[str], limit: int = 5, location_query: str = None, country_code: str = "gb") -> list[dict]:
+@timed("jobs.fetch.adzuna")
+def fetch_adzuna_jobs(keywords: list[str], limit: int = 5, location_query: str = None, country_code: str = "gb", priority: str = "high") -> list[dict]:
     print(f"\nFetching jobs from Adzuna for keywords: {keywords}, country: {country_code}" + (f", location: {location_query}" if location_query and location_query.lower() != "any" else ", location: Global within country") + "...")
     if not ADZUNA_APP_ID or not ADZUNA_APP_KEY:
         print("ADZUNA_APP_ID or ADZUNA_APP_KEY not set. Skipping Adzuna.")
@@ -287,7 +227,7 @@ def fetch_adzuna_jobs(keywords: list[str], limit: int = 5, location_query: str =
     if location_query and location_query.lower() != "any":
         params['where'] = location_query # Location for the 'where' parameter
 
-    data = make_request(base_url, params=params)
+    data = quota_request('adzuna', base_url, params=params, priority=priority)
     jobs = []
     if data and 'results' in data:
         for job_entry in data['results']:
@@ -298,7 +238,7 @@ def fetch_adzuna_jobs(keywords: list[str], limit: int = 5, location_query: str =
                 'company': job_entry.get('company', {}).get('display_name'),
                 'location': job_entry.get('location', {}).get('display_name'),
                 'description_text': cleaned_desc,
-                'extracted_skills': extract_skills_from_text(cleaned_desc, PREDEFINED_SKILLS_LOWER),
+                'extracted_skills': extract_skills_from_text(cleaned_desc),
                 'url': job_entry.get('redirect_url'), # Adzuna uses redirect_url
                 'publication_date': job_entry.get('created'), # 'created' is typically the posting date
                 'source_site': 'Adzuna API'
@@ -309,7 +249,8 @@ def fetch_adzuna_jobs(keywords: list[str], limit: int = 5, location_query: str =
         if data: print(f"Adzuna response keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
     return jobs
 
-def fetch_github_jobs_mirror(keywords: list[str], limit: int = 5, location_query: str = None) -> list[dict]:
+@timed("jobs.fetch.github_mirror")
+def fetch_github_jobs_mirror(keywords: list[str], limit: int = 5, location_query: str = None, priority: str = "high") -> list[dict]:
     print(f"\nFetching jobs from GitHub Jobs Mirror for keywords: {keywords}...")
     # GitHub Jobs API is deprecated. This function now acts as a proxy or conceptual placeholder.
     # We can try to find GitHub-related or general developer jobs via another source like Arbeitnow.
@@ -323,13 +264,14 @@ def fetch_github_jobs_mirror(keywords: list[str], limit: int = 5, location_query
         print("Attempting to find GitHub-like jobs via Arbeitnow as a proxy...")
         # Enhance keywords for better proxy search if needed
         proxy_keywords = list(set(keywords + ["developer", "engineer", "software", "remote"]))
-        return fetch_arbeitnow_jobs(proxy_keywords, limit, location_query)
+        return fetch_arbeitnow_jobs(proxy_keywords, limit, location_query, priority=priority)
     
     print("Direct GitHub Jobs API is deprecated. Could not determine suitable proxy search via GitHub Mirror.")
     return []
 
 
-def fetch_jsearch_jobs(keywords: list[str], limit: int = 5, location_query: str = None) -> list[dict]:
+@timed("jobs.fetch.jsearch")
+def fetch_jsearch_jobs(keywords: list[str], limit: int = 5, location_query: str = None, priority: str = "high") -> list[dict]:
     print(f"\nFetching jobs from JSearch (RapidAPI) for keywords: {keywords}, location: {location_query if location_query else 'Global'}...")
     if not RAPIDAPI_JSEARCH_KEY:
         print("RAPIDAPI_JSEARCH_KEY not set. Skipping JSearch.")
@@ -358,7 +300,7 @@ def fetch_jsearch_jobs(keywords: list[str], limit: int = 5, location_query: str
         "X-RapidAPI-Host": RAPIDAPI_HOST
     }
 
-    data = make_request(base_url, headers=headers, params=querystring)
+    data = quota_request('jsearch', base_url, headers=headers, params=querystring, priority=priority)
     jobs = []
     if data and 'data' in data:
         for i, job_entry in enumerate(data['data']):
@@ -379,7 +321,7 @@ def fetch_jsearch_jobs(keywords: list[str], limit: int = 5, location_query: str
                 'company': job_entry.get('employer_name'),
                 'location': job_loc,
                 'description_text': cleaned_desc,
-                'extracted_skills': extract_skills_from_text(cleaned_desc, PREDEFINED_SKILLS_LOWER),
+                'extracted_skills': extract_skills_from_text(cleaned_desc),
                 'url': job_entry.get('job_apply_link') or job_entry.get('job_google_link'), # Prefer apply link
                 'publication_date': job_entry.get('job_posted_at_datetime_utc'),
                 'source_site': 'JSearch API (RapidAPI)'
@@ -391,12 +333,23 @@ def fetch_jsearch_jobs(keywords: list[str], limit: int = 5, location_query: str
     return jobs
 
 # --- Main Orchestrator ---
+@timed("jobs.scrape")
 def scrape_jobs(
     keywords: list[str],
     location: str = None,
     max_jobs_per_source: int = 2,
-    skills_json_path: str = "extracted_skills.json"
+    skills_json_path: str = "extracted_skills.json",
+    dedup_index: NearDuplicateIndex = None,
+    priority: str = "high"
 ) -> list[dict]:
+    """
+    Fetches jobs from every configured source and returns them without duplicates.
+    `dedup_index` can be shared between calls so that near-duplicates are also dropped across
+    result lists, not only within this one (database_manager.dedup_against_job_cache matches
+    results against the job cache).
+    `priority="low"` marks non-interactive searches: they stop spending a source's quota once
+    it runs low, and are served from cache or skip the source instead.
+    """
     final_keywords_to_use = []
     using_skills_from_json = False
 
@@ -439,18 +392,18 @@ def scrape_jobs(
     current_remotive_keywords = final_keywords_to_use[:] # Create a copy
     if "remote" not in [kw.lower() for kw in current_remotive_keywords]:
         current_remotive_keywords.append("remote")
-    all_jobs.extend(fetch_remotive_jobs(keywords=current_remotive_keywords, limit=max_jobs_per_source))
+    all_jobs.extend(fetch_remotive_jobs(keywords=current_remotive_keywords, limit=max_jobs_per_source, priority=priority))
 
-    all_jobs.extend(fetch_arbeitnow_jobs(keywords=final_keywords_to_use, limit=max_jobs_per_source, location_query=location))
+    all_jobs.extend(fetch_arbeitnow_jobs(keywords=final_keywords_to_use, limit=max_jobs_per_source, location_query=location, priority=priority))
     
     adzuna_search_location_query = location # Adzuna can take general location query
     adzuna_country_code = "gb" # Default to Great Britain
     if location: # Try to map common locations to Adzuna country codes
         country_code_map = {"india": "in", "usa": "us", "united states": "us", "uk": "gb", "united kingdom": "gb", "germany": "de", "singapore": "sg", "canada": "ca", "australia": "au"}
         adzuna_country_code = country_code_map.get(location.lower(), "gb") # Fallback to 'gb' if not mapped
-    all_jobs.extend(fetch_adzuna_jobs(keywords=final_keywords_to_use, limit=max_jobs_per_source, location_query=adzuna_search_location_query, country_code=adzuna_country_code))
+    all_jobs.extend(fetch_adzuna_jobs(keywords=final_keywords_to_use, limit=max_jobs_per_source, location_query=adzuna_search_location_query, country_code=adzuna_country_code, priority=priority))
 
-    all_jobs.extend(fetch_jsearch_jobs(keywords=final_keywords_to_use, limit=max_jobs_per_source, location_query=location))
+    all_jobs.extend(fetch_jsearch_jobs(keywords=final_keywords_to_use, limit=max_jobs_per_source, location_query=location, priority=priority))
     
     # --- USAJOBS LOGIC: INTEGRATING minimal_usajobs_test.py AS FALLBACK ---
     usajobs_search_location_name = None
@@ -469,7 +422,9 @@ def scrape_jobs(
             keywords_for_usajobs = final_keywords_to_use
             print(f"\nUSAJOBS: Using personalized keywords from JSON: {keywords_for_usajobs[:5]}...")
             print(f"Attempting USAJOBS search with personalized keywords (Targeting US: {usajobs_search_location_name if usajobs_search_location_name else 'Nationwide'})...")
-            all_jobs.extend(fetch_usajobs(keywords=keywords_for_usajobs, limit=max_jobs_per_source, location_name=usajobs_search_location_name))
+            all_jobs.extend(fetch_usajobs(keywords=keywords_for_usajobs, limit=max_jobs_per_source, location_name=usajobs_search_location_name, priority=priority))
+        elif quota_manager.is_low('usajobs'):
+            print(f"\nUSAJOBS: Quota is running low (remaining: {quota_manager.remaining('usajobs')}). Skipping extensive fallback search.")
         else:
             # FALLBACK: Use the extensive search logic from minimal_usajobs_test.py
             print(f"\nUSAJOBS: JSON skills not used. Initiating extensive fallback keyword search (Targeting US: {usajobs_search_location_name if usajobs_search_location_name else 'Nationwide'})...")
@@ -477,11 +432,15 @@ def scrape_jobs(
             usajobs_fallback_jobs = []
             job_ids_displayed_usajobs = set()
             target_fallback_jobs = max_jobs_per_source 
+            fallback_calls_made = 0
 
             for keyword_to_search in PREDEFINED_SKILLS_KEYWORDS: 
                 if len(usajobs_fallback_jobs) >= target_fallback_jobs:
                     print(f"  USAJOBS Fallback: Reached target of {target_fallback_jobs} jobs. Stopping keyword iteration.")
                     break
+                if fallback_calls_made >= USAJOBS_FALLBACK_MAX_CALLS:
+                    print(f"  USAJOBS Fallback: Reached the cap of {USAJOBS_FALLBACK_MAX_CALLS} keyword requests. Stopping keyword iteration.")
+                    break
 
                 # This print can be very verbose, consider removing or reducing frequency
                 # print(f"  USAJOBS Fallback: Searching for keyword: '{keyword_to_search}'...") 
@@ -495,7 +454,11 @@ def scrape_jobs(
 
                 headers_usajobs = {'Authorization-Key': USAJOBS_API_KEY, 'User-Agent': USAJOBS_USER_AGENT, 'Host': 'data.usajobs.gov'}
                 usajobs_api_url = "https://data.usajobs.gov/api/search"
-                data = make_request(usajobs_api_url, headers=headers_usajobs, params=current_usajobs_params)
+                fallback_calls_made += 1
+                data = quota_request('usajobs', usajobs_api_url, headers=headers_usajobs, params=current_usajobs_params, priority="low")
+                if data is None and quota_manager.is_low('usajobs'):
+                    print("  USAJOBS Fallback: Quota exhausted or low. Stopping keyword iteration.")
+                    break
 
                 if data and data.get('SearchResult', {}).get('SearchResultItems'):
                     search_items = data['SearchResult']['SearchResultItems']
@@ -523,7 +486,7 @@ def scrape_jobs(
                                 'company': job_entry_desc.get('OrganizationName'),
                                 'location': job_entry_desc.get('PositionLocationDisplay'),
                                 'description_text': cleaned_desc_usajobs,
-                                'extracted_skills': extract_skills_from_text(cleaned_desc_usajobs, PREDEFINED_SKILLS_LOWER),
+                                'extracted_skills': extract_skills_from_text(cleaned_desc_usajobs),
                                 'url': job_entry_desc.get('PositionURI'),
                                 'publication_date': job_entry_desc.get('PublicationStartDate'),
                                 'source_site': 'USAJOBS API (Fallback Search)'
@@ -537,34 +500,16 @@ def scrape_jobs(
     # If not is_us_search_for_usajobs, USAJOBS is skipped silently unless keys are also missing (which is covered by the outer if)
     # --- END OF USAJOBS LOGIC ---
 
-    all_jobs.extend(fetch_github_jobs_mirror(keywords=final_keywords_to_use, limit=max_jobs_per_source, location_query=location))
+    all_jobs.extend(fetch_github_jobs_mirror(keywords=final_keywords_to_use, limit=max_jobs_per_source, location_query=location, priority=priority))
 
     print(f"\n--- Total jobs fetched before deduplication: {len(all_jobs)} ---")
 
-    seen_identifiers = set() # Use a more generic name as it can store URLs or tuples
-    unique_jobs = []
-    for job in all_jobs:
-        job_url = job.get('url')
-        if job_url and job_url.strip(): # Check if URL exists and is not just whitespace
-            identifier = job_url
-            if identifier not in seen_identifiers:
-                unique_jobs.append(job)
-                seen_identifiers.add(identifier)
-        else: # Fallback for jobs without a URL, using a tuple of other fields
-            # Ensure all parts of the key are strings to avoid issues with None
-            title_key = job.get('title','').lower() if job.get('title') else ""
-            company_key = job.get('company','').lower() if job.get('company') else ""
-            location_key = job.get('location','').lower() if job.get('location') else ""
-            # Add description hash for more uniqueness if other fields are too common
-            # For simplicity now, using title, company, location
-            identifier = (title_key, company_key, location_key) 
-            
-            if identifier not in seen_identifiers: # Only add if truly unique based on this composite key
-                 unique_jobs.append(job)
-                 seen_identifiers.add(identifier)
+    # Drops exact URL matches as well as the same posting re-listed through another
+    # source (different redirect URL, slightly edited description) via MinHash/LSH.
+    unique_jobs = deduplicate_jobs(all_jobs, index=dedup_index)
 
-    print(f"--- Total unique jobs (by URL or content signature): {len(unique_jobs)} ---")
-    return unique_jobs
+    print(f"--- Total unique jobs (by URL or near-duplicate content signature): {len(unique_jobs)} ---")
+    return normalize_jobs(unique_jobs) # Same dict shape, but every source's date becomes ISO-8601 UTC
 
 # --- Example Usage ---
 if __name__ == "__main__":
@@ -0,0 +1,83 @@
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+try:
+    from core.keyword_set import KeywordSet
+except ImportError:
+    from keyword_set import KeywordSet
+
+# --- Configuration & Constants ---
+# Job titles are compiled once per parser. Occurrences are found by looking up word n-grams in a
+# hash index (cost grows with the text, not with the number of titles), "mentions a title" checks
+# use a KeywordSet (core/keyword_set.py), and the prefix/suffix expansion regex is compiled once
+# per title, only for titles that actually occur. Extra titles can be loaded from a plain-text
+# taxonomy (one title per line) named by JOB_TITLE_TAXONOMY_PATH.
+JOB_TITLE_TAXONOMY_PATH = os.environ.get('JOB_TITLE_TAXONOMY_PATH')
+
+TITLE_PREFIX_PATTERN = r"(?:[A-Z][a-z]+(?:[- ](?:of|and|&|for))?\s+){0,2}" # "Senior", "Head of", ...
+TITLE_SUFFIX_PATTERN = r"(?:\s+(?:[A-Z][a-zA-Z0-9.&-]*|[IVXLCDM]+)){0,2}(?:\s*\([\w\s.&-]+\))?" # "II", "(Backend)", ...
+WORD_RE = re.compile(r"\w+")
+
+
+def load_job_title_taxonomy(path: str = JOB_TITLE_TAXONOMY_PATH) -> List[str]:
+    """Titles from a text file, one per line ('#' starts a comment). Empty if no path is configured."""
+    if not path: return []
+    try:
+        with open(path, encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+    except OSError as e:
+        print(f"WARNING: Could not read job title taxonomy '{path}': {e}")
+        return []
+
+class JobTitleRecognizer:
+    """
+    Finds job titles in entry text. Titles are tried longest first, as the parser always has; for each
+    title that occurs, its prefix/suffix pattern expands the keyword to the full title on the line
+    ("Senior Software Engineer II" from "software engineer").
+    """
+    def __init__(self, titles: Iterable[str]):
+        self.titles: List[str] = list(dict.fromkeys(t.strip().lower() for t in titles if t and t.strip()))
+        self._priority: Dict[str, int] = {title: rank for rank, title in enumerate(sorted(self.titles, key=len, reverse=True))}
+        self._index: Dict[Tuple[str, ...], List[str]] = {} # Word tuple -> titles spelled with those words
+        for title in self.titles:
+            self._index.setdefault(tuple(WORD_RE.findall(title)), []).append(title)
+        self._max_words = max((len(key) for key in self._index), default=0)
+        self.mentions = KeywordSet(self.titles)
+        self._expansion_patterns: Dict[str, re.Pattern] = {}
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def mentions_title(self, text: str) -> bool:
+        """True if any title occurs anywhere in `text`, even inside a longer word (same test as `jt in text.lower()`)."""
+        return self.mentions.contains_any(text)
+
+    def mentions_title_many(self, lines: List[str]) -> List[bool]:
+        """mentions_title() for each line, in one scan over all of them."""
+        return self.mentions.contains_any_many(lines)
+
+    def find_titles(self, text: str) -> List[str]:
+        """Titles occurring as whole words in `text`, longest first."""
+        words = WORD_RE.findall(text.lower())
+        found = set()
+        for start in range(len(words)):
+            for length in range(1, min(self._max_words, len(words) - start) + 1):
+                titles = self._index.get(tuple(words[start:start + length]))
+                if titles: found.update(titles)
+        return sorted(found, key=self._priority.__getitem__)
+
+    def find_titles_many(self, lines: Iterable[str]) -> List[List[str]]:
+        return [self.find_titles(line) for line in lines]
+
+    def _expansion_pattern(self, title: str) -> re.Pattern:
+        pattern = self._expansion_patterns.get(title)
+        if pattern is None:
+            pattern = re.compile(r"\b(" + TITLE_PREFIX_PATTERN + re.escape(title) + TITLE_SUFFIX_PATTERN + r")\b", re.IGNORECASE)
+            self._expansion_patterns[title] = pattern
+        return pattern
+
+    def candidates(self, text: str) -> Iterator[Tuple[str, str]]:
+        """(title keyword, expanded candidate) for each title found in `text`, longest title first."""
+        for title in self.find_titles(text):
+            match = self._expansion_pattern(title).search(text)
+            if match: yield title, match.group(1).strip(" .,|-")
@@ -0,0 +1,68 @@
+import re
+import bisect
+from typing import Iterable, Iterator, List, Optional
+
+# --- Configuration & Constants ---
+# Keyword blacklists (non-name words, non-location words, job titles) are compiled once into a
+# single regex shaped as a character trie over the lowercased keywords. One scan of the lowercased
+# text answers "does it contain any keyword", whatever the number of keywords, replacing
+# `any(kw.lower() in text.lower() for kw in keywords)`.
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation shaped as a character trie, so matching cost doesn't grow with the number of words."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word: node = node.setdefault(char, {})
+        node[''] = {} # End of a word
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches: return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+    return build(trie)
+
+
+class KeywordSet:
+    """
+    Lowercased keywords with substring search (contains_any / find_first) and exact membership (`in`).
+    Substring semantics match `kw.lower() in text.lower()`: a keyword also matches inside a longer word.
+    With `whole_words=True` a keyword only matches where it is not part of a longer word ('ai' does
+    not match 'mumbai'), for lists with short entries such as skill aliases.
+    """
+    def __init__(self, keywords: Iterable[str], whole_words: bool = False):
+        self.keywords = frozenset(kw.lower() for kw in keywords if kw)
+        pattern = _trie_pattern(self.keywords)
+        if whole_words: pattern = rf'(?<!\w)(?:{pattern})(?!\w)'
+        self._pattern = re.compile(pattern) if self.keywords else None
+
+    def __contains__(self, text: str) -> bool:
+        """Exact (already lowercased) keyword membership."""
+        return text in self.keywords
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keywords)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find_first(self, text: str) -> Optional[str]:
+        """The leftmost keyword contained in `text`, or None."""
+        match = self._pattern.search(text.lower()) if self._pattern else None
+        return match.group(0) if match else None
+
+    def contains_any(self, text: str) -> bool:
+        return bool(self._pattern and self._pattern.search(text.lower()))
+
+    def contains_any_many(self, texts: List[str]) -> List[bool]:
+        """contains_any() for each text, in one scan over all of them."""
+        flags = [False] * len(texts)
+        if not self._pattern or not texts: return flags
+        lowered = [text.lower() for text in texts]
+        starts, offset = [], 0
+        for text in lowered:
+            starts.append(offset); offset += len(text) + 1
+        for match in self._pattern.finditer("\n".join(lowered)):
+            flags[bisect.bisect_right(starts, match.start()) - 1] = True
+        return flags
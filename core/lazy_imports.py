@@ -0,0 +1,149 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# The web app imports its heavy subsystems (resume parser, job scraper, ranker, Gemini client,
+# WeasyPrint, the MongoDB connection) on first use through LazySubsystem facades, so a worker that
+# only serves login and dashboard pages never pays for spaCy, scikit-learn or the Gemini SDK.
+# Subsystems listed in APP_WARMUP are loaded in a background thread right after import instead
+# (e.g. APP_WARMUP=database,parser,scraper,ranker for workers that take uploads; "none" for nothing).
+# `python -m core.lazy_imports profile app` reports where import time goes (`python -X importtime`)
+# and fails when it exceeds a budget, for CI.
+APP_WARMUP = [name.strip() for name in os.environ.get('APP_WARMUP', 'database').split(',') if name.strip() and name.strip() != 'none']
+IMPORT_TIME_BUDGET_MS = float(os.environ.get('IMPORT_TIME_BUDGET_MS', 1000))
+IMPORTTIME_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class LazySubsystem:
+    """
+    Names loaded from a subsystem on first attribute access. `loader()` imports what it needs and
+    returns {name: object}; if it raises one of `errors` the subsystem is unavailable and attributes
+    come from `fallback` instead (stand-ins that return empty results), as the eager imports did.
+    """
+    def __init__(self, name: str, loader, fallback: dict = None, errors: tuple = (ImportError, OSError)):
+        self.name = name
+        self._loader = loader
+        self._fallback = fallback or {}
+        self._errors = errors
+        self._names: dict | None = None
+        self._error: Exception | None = None
+        self._lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'): # A fork (gunicorn --preload) during a warm-up must not inherit a held lock
+            os.register_at_fork(after_in_child=self._reset_lock)
+
+    def _reset_lock(self):
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """Runs the loader once (concurrent callers wait for it). True if the subsystem is available."""
+        if self._names is None:
+            with self._lock:
+                if self._names is None:
+                    started_at = time.perf_counter()
+                    try:
+                        names = self._loader()
+                        print(f"INFO: {self.name} loaded in {time.perf_counter() - started_at:.2f}s.")
+                    except self._errors as e:
+                        print(f"WARNING: {self.name} not available: {e}")
+                        self._error = e
+                        names = dict(self._fallback)
+                    self._names = names
+        return self._error is None
+
+    @property
+    def available(self) -> bool:
+        return self.load()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the loader has run, without triggering it."""
+        return self._names is not None
+
+    def __getattr__(self, attr: str):
+        if attr.startswith('_'): raise AttributeError(attr)
+        self.load()
+        try:
+            return self._names[attr]
+        except KeyError:
+            raise AttributeError(f"{self.name} has no '{attr}'{' (not available)' if self._error else ''}") from None
+
+
+def start_warmup(subsystems: dict, names: list = APP_WARMUP) -> threading.Thread | None:
+    """Loads the named subsystems, in order, in a daemon thread. Unknown names are reported and skipped."""
+    unknown = [name for name in names if name not in subsystems]
+    if unknown: print(f"WARNING: APP_WARMUP lists unknown subsystems: {', '.join(unknown)} (known: {', '.join(subsystems)}).")
+    to_load = [subsystems[name] for name in names if name in subsystems]
+    if not to_load: return None
+    def warm_up():
+        for subsystem in to_load: subsystem.load()
+    thread = threading.Thread(target=warm_up, name="subsystem-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+# --- Import-time Profile ---
+def profile_imports(target: str = "app", cwd: str = None) -> dict:
+    """
+    Imports `target` in a fresh interpreter under `-X importtime` and returns the total, the cost of
+    each module `target` imports directly, and the modules with the most self time (all in ms).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"], cwd=cwd,
+                            capture_output=True, text=True, env={**os.environ, 'APP_WARMUP': 'none'})
+    if result.returncode != 0:
+        raise RuntimeError(f"'import {target}' failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE_RE.match(line)
+        if match: rows.append((match.group(4), int(match.group(1)) / 1000.0, int(match.group(2)) / 1000.0, len(match.group(3)) // 2))
+    # importtime lists a module after everything it imported, so the target is the last depth-0 row
+    target_index = max(i for i, row in enumerate(rows) if row[0] == target and row[3] == 0)
+    start = max((i for i, row in enumerate(rows[:target_index]) if row[3] == 0), default=-1) + 1
+    children = [row for row in rows[start:target_index] if row[3] == 1]
+    return {
+        'target': target,
+        'total_ms': round(rows[target_index][2], 1),
+        'interpreter_ms': round(sum(row[2] for row in rows[:start] if row[3] == 0), 1), # site, encodings, ... before the target
+        'direct_imports': sorted(({'module': name, 'ms': round(cumulative, 1)} for name, _, cumulative, _ in children), key=lambda item: -item['ms']),
+        'slowest_modules': sorted(({'module': name, 'self_ms': round(self_ms, 1)} for name, self_ms, _, _ in rows[start:target_index + 1]),
+                                  key=lambda item: -item['self_ms']),
+    }
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time profile of the web app (or any module), with a budget for CI.")
+    parser.add_argument('command', choices=['profile'], help="profile: import the target under -X importtime and report.")
+    parser.add_argument('target', nargs='?', default="app", help="Module to import (default: app).")
+    parser.add_argument('--budget-ms', type=float, default=IMPORT_TIME_BUDGET_MS, help="Exit 1 when the import takes longer than this.")
+    parser.add_argument('--top', type=int, default=15, help="Rows per table.")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+
+    try:
+        report = profile_imports(args.target, cwd=os.getcwd())
+    except (RuntimeError, ValueError) as e:
+        print(f"CRITICAL: Could not profile the import of '{args.target}' ({e}).")
+        return 1
+    over_budget = report['total_ms'] > args.budget_ms
+    if args.json:
+        print(json.dumps({**report, 'budget_ms': args.budget_ms, 'over_budget': over_budget}, indent=2))
+    else:
+        print(f"import {report['target']}: {report['total_ms']:.0f} ms (budget {args.budget_ms:.0f} ms), interpreter startup {report['interpreter_ms']:.0f} ms")
+        print("\nDirect imports (cumulative ms):")
+        for row in report['direct_imports'][:args.top]: print(f"  {row['ms']:8.1f}  {row['module']}")
+        print("\nSlowest modules (self ms):")
+        for row in report['slowest_modules'][:args.top]: print(f"  {row['self_ms']:8.1f}  {row['module']}")
+    if over_budget: print(f"CRITICAL: import {report['target']} took {report['total_ms']:.0f} ms, over the {args.budget_ms:.0f} ms budget.")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
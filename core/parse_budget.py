@@ -0,0 +1,78 @@
+import os
+import time
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# Per-resume parse budget. Each parse gets a wall-clock budget and a budget of tokens tagged by spaCy
+# (summed over the full document and every section/entry/line Doc). Extractors run in order of value;
+# once the budget is spent the remaining optional extractors are skipped and the per-line loops stop
+# early, and the result's metadata says which parts are partial. The full-document text is also capped
+# at PARSE_MAX_CHARS, since a single spaCy call cannot be interrupted. A value of 0 disables a limit.
+PARSE_TIME_BUDGET_MS = float(os.environ.get('PARSE_TIME_BUDGET_MS', 4000))
+PARSE_TOKEN_BUDGET = int(os.environ.get('PARSE_TOKEN_BUDGET', 40000))
+PARSE_MAX_CHARS = int(os.environ.get('PARSE_MAX_CHARS', 60000))
+BUDGET_CHECK_EVERY_LINES = 32 # Line loops look at the clock every this many lines
+
+
+def cap_text(text: str, max_chars: Optional[int] = PARSE_MAX_CHARS) -> str:
+    """`text` cut to at most `max_chars`, at the last line break before the limit when there is one."""
+    if not max_chars or len(text) <= max_chars: return text
+    cut = text.rfind('\n', 0, max_chars)
+    return text[:cut if cut > 0 else max_chars]
+
+
+class ParseBudget:
+    """Wall-clock and token budget for one parse, plus a record of what was skipped or cut short."""
+    def __init__(self, time_budget_ms: float = PARSE_TIME_BUDGET_MS, token_budget: int = PARSE_TOKEN_BUDGET,
+                 max_chars: int = PARSE_MAX_CHARS):
+        self.time_budget_ms = time_budget_ms or None
+        self.token_budget = token_budget or None
+        self.max_chars = max_chars or None
+        self.started_at = time.perf_counter()
+        self.deadline = self.started_at + self.time_budget_ms / 1000.0 if self.time_budget_ms else None
+        self.tokens = 0
+        self.skipped: List[str] = []
+        self.truncated: List[str] = []
+
+    @classmethod
+    def unlimited(cls) -> "ParseBudget":
+        return cls(time_budget_ms=0, token_budget=0, max_chars=0)
+
+    def charge(self, tokens: int):
+        self.tokens += tokens
+
+    @property
+    def exhausted(self) -> bool:
+        if self.token_budget is not None and self.tokens >= self.token_budget: return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def exhausted_at(self, line_index: int) -> bool:
+        """`exhausted`, checked only every BUDGET_CHECK_EVERY_LINES lines so tight loops stay cheap."""
+        return line_index % BUDGET_CHECK_EVERY_LINES == 0 and line_index > 0 and self.exhausted
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000.0
+
+    def cap_text(self, text: str, name: str) -> str:
+        """`text` cut to max_chars at a line break (recorded as truncated), or unchanged."""
+        capped = cap_text(text, self.max_chars)
+        if len(capped) < len(text): self.note_truncated(name)
+        return capped
+
+    def note_skipped(self, name: str):
+        if name not in self.skipped: self.skipped.append(name)
+
+    def note_truncated(self, name: str):
+        if name not in self.truncated: self.truncated.append(name)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.skipped or self.truncated)
+
+    def report(self) -> Dict[str, Optional[object]]:
+        return {'partial': self.partial, 'skipped': list(self.skipped), 'truncated': list(self.truncated),
+                'elapsed_ms': round(self.elapsed_ms(), 1), 'time_budget_ms': self.time_budget_ms,
+                'tokens': self.tokens, 'token_budget': self.token_budget}
@@ -0,0 +1,395 @@
+import os
+import sys
+import json
+import time
+import queue
+import signal
+import socket
+import argparse
+import threading
+import http.client
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+
+try:
+    from core.instrumentation import span
+except ImportError: # Allows running this file directly from inside core/
+    from instrumentation import span
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# One resume parser process per host instead of one spaCy model per web worker. The service holds a
+# single warm AdvancedResumeParser; concurrent requests are queued and gathered into micro-batches
+# (everything that arrives within PARSER_BATCH_WINDOW_MS of the first request, up to
+# PARSER_MAX_BATCH_SIZE), and each batch goes through parse_resumes(), so the full documents are
+# tagged together with nlp.pipe(). The queue is bounded: when PARSER_MAX_PENDING requests are waiting,
+# new ones get 503 and the client backs off and retries until its timeout. Web workers reach the
+# service through RemoteResumeParser when PARSER_SERVICE_URL is set (http://127.0.0.1:8770 or
+# unix:///run/resume_parser.sock); unset, they parse in-process as before.
+PARSER_SERVICE_URL = os.environ.get('PARSER_SERVICE_URL')
+PARSER_SERVICE_MODEL = os.environ.get('PARSER_SERVICE_MODEL', "en_core_web_sm")
+PARSER_BATCH_WINDOW_MS = float(os.environ.get('PARSER_BATCH_WINDOW_MS', 5))
+PARSER_MAX_BATCH_SIZE = int(os.environ.get('PARSER_MAX_BATCH_SIZE', 8))
+PARSER_MAX_PENDING = int(os.environ.get('PARSER_MAX_PENDING', 64))
+PARSER_SERVICE_TIMEOUT_SECONDS = float(os.environ.get('PARSER_SERVICE_TIMEOUT_SECONDS', 30))
+# Parse in the web worker when the service can't be reached (not when it is merely busy)
+PARSER_SERVICE_FALLBACK_LOCAL = os.environ.get('PARSER_SERVICE_FALLBACK_LOCAL', 'true').lower() != 'false'
+DEFAULT_SERVICE_URL = "http://127.0.0.1:8770"
+LISTEN_BACKLOG = 128
+BUSY_RETRY_INITIAL_SECONDS = 0.05 # Client backoff after a 503, doubled up to BUSY_RETRY_MAX_SECONDS
+BUSY_RETRY_MAX_SECONDS = 1.0
+WARMUP_TEXT = "Jane Doe\njane@example.com\nSkills\nPython, SQL\nExperience\nSoftware Engineer, Acme Corp, 2020 - Present"
+
+
+class ParserServiceError(Exception):
+    """The parser service could not be reached or returned an error."""
+
+class ParserServiceUnavailable(ParserServiceError):
+    """The parser service could not be connected to (not running, or the connection broke)."""
+
+class ParserServiceBusy(ParserServiceError):
+    """The parser service's request queue is full (for the client: stayed full until its timeout)."""
+
+
+# --- Micro-batching ---
+class MicroBatcher:
+    """
+    Bounded request queue drained by one batching thread. `submit()` returns a Future for the parse
+    result, or raises ParserServiceBusy when the queue is full. `parse_batch(texts)` returns one result
+    (or Exception) per text and is only ever called from the batching thread.
+    """
+    def __init__(self, parse_batch, window_ms: float = PARSER_BATCH_WINDOW_MS, max_batch_size: int = PARSER_MAX_BATCH_SIZE,
+                 max_pending: int = PARSER_MAX_PENDING):
+        self.parse_batch = parse_batch
+        self.window_seconds = max(0.0, window_ms) / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'rejected': 0, 'cancelled': 0, 'failed': 0, 'batches': 0, 'batched_requests': 0, 'max_batch_size': 0}
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="parser-batcher", daemon=True)
+        self._thread.start()
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for key, value in increments.items(): self._stats[key] += value
+
+    def submit(self, text: str) -> Future:
+        future = Future()
+        try:
+            self._queue.put_nowait((text, future))
+        except queue.Full:
+            self._count(rejected=1)
+            raise ParserServiceBusy(f"{self._queue.maxsize} parse requests already queued.")
+        self._count(requests=1)
+        return future
+
+    def _collect(self) -> list:
+        """Blocks for the first request, then takes whatever else arrives within the window."""
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.window_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopped.is_set():
+            # Requests whose caller already gave up (timed out and cancelled) are dropped here
+            collected = self._collect()
+            batch = [(text, future) for text, future in collected if future.set_running_or_notify_cancel()]
+            if len(batch) < len(collected): self._count(cancelled=len(collected) - len(batch))
+            if not batch: continue
+            self._count(batches=1, batched_requests=len(batch))
+            with self._stats_lock:
+                self._stats['max_batch_size'] = max(self._stats['max_batch_size'], len(batch))
+            try:
+                with span("parser_service.batch"):
+                    results = self.parse_batch([text for text, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    self._count(failed=1)
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['pending'] = self._queue.qsize()
+        stats['mean_batch_size'] = round(stats['batched_requests'] / stats['batches'], 2) if stats['batches'] else 0.0
+        return stats
+
+    def close(self):
+        self._stopped.set()
+        self._thread.join(timeout=2)
+
+
+def make_parse_batch(parser, use_doc_cache: bool = False):
+    """parse_batch for MicroBatcher: parse_resumes() on the whole batch, one by one if that raises."""
+    def parse_batch(texts: list) -> list:
+        try:
+            return parser.parse_resumes(texts, use_doc_cache=use_doc_cache)
+        except Exception: # Retry one by one, so a single bad resume doesn't fail the whole batch
+            results = []
+            for text in texts:
+                try:
+                    results.append(parser.parse_resume(text, use_doc_cache=use_doc_cache))
+                except Exception as e:
+                    results.append(e)
+            return results
+    return parse_batch
+
+
+# --- HTTP Server ---
+class ParserRequestHandler(BaseHTTPRequestHandler):
+    """POST /parse {"text": ...} -> {"status": "success", "result": <parse_resume() output>}; GET /health -> batcher stats."""
+    batcher: MicroBatcher = None
+    timeout_seconds = PARSER_SERVICE_TIMEOUT_SECONDS
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items(): self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass # The client gave up (timed out) while its parse was queued or running
+
+    def do_GET(self):
+        if self.path != '/health':
+            return self._send_json(404, {"status": "error", "message": "Not found."})
+        self._send_json(200, {"status": "success", **self.batcher.stats()})
+
+    def do_POST(self):
+        if self.path != '/parse':
+            return self._send_json(404, {"status": "error", "message": "Not found."})
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            text = payload['text']
+            if not isinstance(text, str): raise TypeError("'text' must be a string")
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send_json(400, {"status": "error", "message": f"Expected a JSON body with 'text': {e}"})
+        try:
+            future = self.batcher.submit(text)
+        except ParserServiceBusy as e:
+            return self._send_json(503, {"status": "busy", "message": str(e)}, {'Retry-After': '1'})
+        try:
+            result = future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            future.cancel() # Dropped by the batcher if it has not been picked up yet
+            return self._send_json(504, {"status": "error", "message": f"Parse did not finish within {self.timeout_seconds:.0f}s."})
+        except Exception as e:
+            return self._send_json(500, {"status": "error", "message": f"Parser error: {e}"})
+        self._send_json(200, {"status": "success", "result": result})
+
+    def log_message(self, format, *args):
+        pass # One line per parse request would drown the service's output
+
+
+class ThreadingTCPHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG # socketserver's default of 5 resets connections under a burst of uploads
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0) # BaseHTTPRequestHandler expects a (host, port) client address
+
+
+def create_server(url: str, batcher: MicroBatcher, timeout_seconds: float = PARSER_SERVICE_TIMEOUT_SECONDS):
+    """HTTP server bound to `url` (http://host:port or unix:///path), handing requests to `batcher`."""
+    handler = type("BoundParserRequestHandler", (ParserRequestHandler,), {'batcher': batcher, 'timeout_seconds': timeout_seconds})
+    parts = urlsplit(url)
+    if parts.scheme == 'unix':
+        if os.path.exists(parts.path): os.unlink(parts.path) # Stale socket from a previous run
+        return ThreadingUnixHTTPServer(parts.path, handler)
+    if parts.scheme != 'http':
+        raise ValueError(f"Unsupported parser service URL '{url}' (use http://host:port or unix:///path).")
+    return ThreadingTCPHTTPServer((parts.hostname or "127.0.0.1", parts.port or 80), handler)
+
+
+# --- Client ---
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+class ParserClient:
+    """Talks to the parser service. A full queue (503) is retried with backoff until `timeout` runs out."""
+    def __init__(self, url: str = PARSER_SERVICE_URL or DEFAULT_SERVICE_URL, timeout: float = PARSER_SERVICE_TIMEOUT_SECONDS):
+        self.url = url
+        self.timeout = timeout
+        self._parts = urlsplit(url)
+
+    def _connection(self, timeout: float) -> http.client.HTTPConnection:
+        if self._parts.scheme == 'unix': return _UnixHTTPConnection(self._parts.path, timeout)
+        return http.client.HTTPConnection(self._parts.hostname or "127.0.0.1", self._parts.port or 80, timeout=timeout)
+
+    def _request(self, method: str, path: str, payload: dict = None, timeout: float = None) -> tuple[int, dict]:
+        connection = self._connection(timeout or self.timeout)
+        try:
+            body = json.dumps(payload).encode('utf-8') if payload is not None else None
+            connection.request(method, path, body=body, headers={'Content-Type': 'application/json'} if body else {})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read() or b'{}')
+        except TimeoutError as e: # Accepted but not answered in time: overloaded, not down
+            raise ParserServiceBusy(f"Parser service at {self.url} did not answer in time: {e}") from e
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            raise ParserServiceUnavailable(f"Parser service at {self.url} unavailable: {e}") from e
+        finally:
+            connection.close()
+
+    def parse_resume(self, text: str) -> dict:
+        deadline = time.monotonic() + self.timeout
+        backoff = BUSY_RETRY_INITIAL_SECONDS
+        while True:
+            with span("parser_service.request"):
+                status, payload = self._request('POST', '/parse', {'text': text}, timeout=max(0.1, deadline - time.monotonic()))
+            if status == 200: return payload['result']
+            if status != 503: raise ParserServiceError(payload.get('message') or f"Parser service returned HTTP {status}.")
+            if time.monotonic() + backoff >= deadline:
+                raise ParserServiceBusy(f"Parser service still busy after {self.timeout:.0f}s: {payload.get('message')}")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, BUSY_RETRY_MAX_SECONDS)
+
+    def health(self) -> dict:
+        status, payload = self._request('GET', '/health', timeout=min(self.timeout, 5))
+        if status != 200: raise ParserServiceError(payload.get('message') or f"Parser service returned HTTP {status}.")
+        return payload
+
+
+class LocalResumeParser:
+    """One in-process parser built on first use. Parses are serialized: the parser keeps per-parse state on itself."""
+    def __init__(self, parser_factory):
+        self.parser_factory = parser_factory
+        self._parser = None
+        self._lock = threading.Lock()
+
+    def parse_resume(self, resume_text: str) -> dict:
+        with self._lock:
+            if self._parser is None: self._parser = self.parser_factory()
+            return self._parser.parse_resume(resume_text)
+
+
+class RemoteResumeParser:
+    """
+    Stand-in for AdvancedResumeParser in the web workers: parse_resume() goes to the parser service. If
+    the service can't be reached and a local factory is given, this worker parses in-process until it is back.
+    """
+    def __init__(self, client: ParserClient, local_parser_factory=None):
+        self.client = client
+        self.local_parser = LocalResumeParser(local_parser_factory) if local_parser_factory else None
+        self._warned = False
+
+    def parse_resume(self, resume_text: str) -> dict:
+        try:
+            return self.client.parse_resume(resume_text)
+        except ParserServiceUnavailable as e: # Busy or failed parses are not retried here: another model in this worker would make an overload worse
+            if self.local_parser is None: raise
+            if not self._warned:
+                print(f"WARNING: {e}. Parsing resumes in this worker until it is back.")
+                self._warned = True
+            return self.local_parser.parse_resume(resume_text)
+
+
+_resume_parser = None
+_resume_parser_lock = threading.Lock()
+
+def get_resume_parser(local_parser_factory):
+    """
+    Process-wide parser for the web app: a RemoteResumeParser when PARSER_SERVICE_URL is set, otherwise
+    a LocalResumeParser that builds one parser with `local_parser_factory` (e.g. AdvancedResumeParser) on first use.
+    """
+    global _resume_parser
+    with _resume_parser_lock:
+        if _resume_parser is None:
+            if PARSER_SERVICE_URL:
+                _resume_parser = RemoteResumeParser(ParserClient(PARSER_SERVICE_URL), local_parser_factory if PARSER_SERVICE_FALLBACK_LOCAL else None)
+            else:
+                _resume_parser = LocalResumeParser(local_parser_factory)
+    return _resume_parser
+
+
+# --- Service Entry Point ---
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local resume parser service: one warm parser, micro-batched requests.")
+    parser.add_argument('--url', default=PARSER_SERVICE_URL or DEFAULT_SERVICE_URL, help="Listen address: http://host:port or unix:///path.")
+    parser.add_argument('--model', default=PARSER_SERVICE_MODEL, help="spaCy model for the parser.")
+    parser.add_argument('--window-ms', type=float, default=PARSER_BATCH_WINDOW_MS, help="How long the first request of a batch waits for others.")
+    parser.add_argument('--max-batch', type=int, default=PARSER_MAX_BATCH_SIZE, help="Most resumes parsed in one batch.")
+    parser.add_argument('--max-pending', type=int, default=PARSER_MAX_PENDING, help="Queued requests before new ones get 503.")
+    parser.add_argument('--doc-cache', action='store_true', help="Read and write the spaCy DocBin cache (stores the text of every parsed resume on disk).")
+    parser.add_argument('--health', action='store_true', help="Print the running service's stats and exit.")
+    args = parser.parse_args(argv)
+
+    if args.health:
+        try:
+            print(json.dumps(ParserClient(args.url, timeout=5).health(), indent=2))
+        except ParserServiceError as e:
+            print(f"CRITICAL: {e}")
+            return 1
+        return 0
+
+    try:
+        from core.python_resume_parser_v9 import AdvancedResumeParser
+    except ImportError:
+        from python_resume_parser_v9 import AdvancedResumeParser
+    started_at = time.perf_counter()
+    resume_parser = AdvancedResumeParser(args.model)
+    resume_parser.parse_resume(WARMUP_TEXT, use_doc_cache=False) # Builds the lazily initialized parts before the first request
+    print(f"INFO: Parser loaded and warmed up in {time.perf_counter() - started_at:.1f}s.")
+
+    batcher = MicroBatcher(make_parse_batch(resume_parser, use_doc_cache=args.doc_cache), window_ms=args.window_ms,
+                           max_batch_size=args.max_batch, max_pending=args.max_pending)
+    try:
+        server = create_server(args.url, batcher)
+    except (OSError, ValueError) as e:
+        print(f"CRITICAL: Could not listen on {args.url} ({e}).")
+        return 1
+
+    def _request_stop(signum, frame):
+        print(f"Received signal {signum}, shutting down the parser service...")
+        threading.Thread(target=server.shutdown, daemon=True).start() # shutdown() blocks until serve_forever() returns
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+
+    print(f"Parser service listening on {args.url} (batches of up to {args.max_batch} within {args.window_ms:g} ms, {args.max_pending} pending max).")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        batcher.close()
+        url_parts = urlsplit(args.url)
+        if url_parts.scheme == 'unix' and os.path.exists(url_parts.path): os.unlink(url_parts.path)
+    print(f"Parser service stopped: {batcher.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
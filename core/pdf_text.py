@@ -0,0 +1,25 @@
+from typing import List
+try:
+    from core.instrumentation import timed
+    from core.structured_logging import get_logger
+except ImportError: # Allows running this file directly from inside core/
+    from instrumentation import timed
+    from structured_logging import get_logger
+
+# PDF text extraction, kept apart from the parser so the web app can read uploads without importing
+# spaCy (the text may be parsed by the parser service; see core/parser_service.py). PyPDF2 itself is
+# imported on the first upload.
+LINE_LOG = get_logger("parser.lines")
+
+
+@timed("pdf.extract_text")
+def extract_text_from_pdf(pdf_file) -> str: # Path or seekable binary file object (e.g. a spooled upload)
+    from PyPDF2 import PdfReader
+    reader = PdfReader(pdf_file) #
+    text_parts: List[str] = [] #
+    for page_num, page in enumerate(reader.pages): #
+        page_text = page.extract_text() #
+        if page_text: text_parts.append(page_text) #
+        else: LINE_LOG.debug("No text extracted from page %s", page_num + 1) #
+    if not text_parts: LINE_LOG.debug("No text extracted from any page of the PDF.") #
+    return "\n\n".join(text_parts) #
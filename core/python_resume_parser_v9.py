@@ -2,22 +2,70 @@ import spacy
 import re
 import json
 from collections import defaultdict
-import dateutil.parser as date_parser
-from spacy.matcher import Matcher, PhraseMatcher
+from spacy.language import Language
+from spacy.matcher import Matcher
+from spacy.tokens import Span
 from spacy.util import filter_spans
 import phonenumbers
 from email_validator import validate_email, EmailNotValidError
-from PyPDF2 import PdfReader
 from typing import Dict, List, Optional, Tuple, Set, Any
+import sys
+try:
+    from core.instrumentation import span
+except ImportError: # Allows running this file directly from inside core/
+    from instrumentation import span
 
-# --- START DEBUG FLAGS (DEFINE THESE AT THE VERY TOP OF THE SCRIPT) ---
-DEBUG_LINE_PROCESSING = True
-DEBUG_FIND_SECTION = True
-DEBUG_CONTACT_INFO = True
-DEBUG_ENTITY_EXTRACTION = True
-DEBUG_NLP_CALLS = True
-DEBUG_JOB_TITLE = True
-# --- END DEBUG FLAGS ---
+try:
+    from core.pdf_text import extract_text_from_pdf # Re-exported: callers import it from the parser module
+except ImportError:
+    from pdf_text import extract_text_from_pdf
+try:
+    from core.date_normalizer import normalize_date, normalize_dates, date_sort_key
+except ImportError:
+    from date_normalizer import normalize_date, normalize_dates, date_sort_key
+try:
+    from core.doc_cache import doc_cache, pipeline_fingerprint, text_key
+except ImportError:
+    from doc_cache import doc_cache, pipeline_fingerprint, text_key
+try:
+    from core.contact_tokens import tokenize_contacts, space_contact_tokens, ENTITY_LABELS
+except ImportError:
+    from contact_tokens import tokenize_contacts, space_contact_tokens, ENTITY_LABELS
+try:
+    from core.keyword_set import KeywordSet
+except ImportError:
+    from keyword_set import KeywordSet
+try:
+    from core.job_titles import JobTitleRecognizer, load_job_title_taxonomy
+except ImportError:
+    from job_titles import JobTitleRecognizer, load_job_title_taxonomy
+try:
+    from core.structured_logging import get_logger, start_trace_sample, trace_enabled
+except ImportError:
+    from structured_logging import get_logger, start_trace_sample, trace_enabled
+try:
+    from core.skill_ontology import get_skill_ontology
+except ImportError:
+    from skill_ontology import get_skill_ontology
+try:
+    from core.parse_budget import ParseBudget, cap_text, PARSE_MAX_CHARS
+except ImportError:
+    from parse_budget import ParseBudget, cap_text, PARSE_MAX_CHARS
+
+# --- Debug Loggers ---
+# Former DEBUG_* flags. Enable per subsystem, e.g. LOG_LEVELS="parser.contact=DEBUG" (see core/structured_logging.py).
+LINE_LOG = get_logger("parser.lines")
+SECTION_LOG = get_logger("parser.sections")
+CONTACT_LOG = get_logger("parser.contact")
+ENTITY_LOG = get_logger("parser.entities")
+NLP_LOG = get_logger("parser.nlp")
+JOB_TITLE_LOG = get_logger("parser.job_title")
+
+DOC_PIPELINE_REVISION = "contact-entities-1" # Bump when a custom pipeline component changes, to invalidate cached Docs
+# Extractors in order of value. Once the parse budget is spent (see core/parse_budget.py) only the essential ones still run.
+EXTRACTOR_PRIORITY = ('contact_info', 'skills', 'experience', 'education', 'summary', 'projects', 'certifications', 'languages', 'awards')
+ESSENTIAL_EXTRACTORS = frozenset({'contact_info', 'skills'})
+NLP_PIPE_BATCH_SIZE = 16 # Full-document texts tagged per nlp.pipe() batch in parse_resumes()
 
 try:
     import nltk
@@ -35,15 +83,31 @@ except ImportError:
     fuzz = None # type: ignore
     process = None # type: ignore
 
-def extract_text_from_pdf(file_path: str) -> str: #
-    reader = PdfReader(file_path) #
-    text_parts: List[str] = [] #
-    for page_num, page in enumerate(reader.pages): #
-        page_text = page.extract_text() #
-        if page_text: text_parts.append(page_text) #
-        elif DEBUG_LINE_PROCESSING: print(f"DEBUG: No text extracted from page {page_num + 1}") #
-    if DEBUG_LINE_PROCESSING and not text_parts: print("DEBUG: No text extracted from any page of the PDF.") #
-    return "\n\n".join(text_parts) #
+class TimedPipeline: #
+    """
+    Wraps the spaCy pipeline so every self.nlp(...) call is timed as parser.nlp.<calling method>. While a
+    cached parse is running, Docs are served from `replay` and newly tagged ones are collected in `recorded`.
+    Tokens of newly tagged Docs are charged to `budget`, the current parse's ParseBudget.
+    """
+    def __init__(self, nlp): self._nlp = nlp; self.replay: Optional[Dict[str, Any]] = None; self.recorded: Optional[Dict[str, Any]] = None; self.budget: Optional[ParseBudget] = None #
+    def __call__(self, text, *args, **kwargs): #
+        if self.replay is not None and not args and not kwargs: #
+            cached_doc = self.replay.get(text) #
+            if cached_doc is not None: return cached_doc #
+        with span(f"parser.nlp.{sys._getframe(1).f_code.co_name}"): doc = self._nlp(text, *args, **kwargs) #
+        if self.recorded is not None: self.recorded[text] = doc #
+        if self.budget is not None: self.budget.charge(len(doc)) #
+        return doc #
+    def pipe(self, texts, **kwargs): # Pre-tagging for parse_resumes(); charged to no single parse #
+        with span("parser.nlp.pipe"): return list(self._nlp.pipe(texts, **kwargs)) #
+    def __getattr__(self, name): return getattr(self._nlp, name) # vocab, pipe_names, make_doc, ... #
+
+@Language.component("contact_entities")
+def contact_entities(doc): #
+    """Labels emails, phones and profile URLs found by the contact tokenizer, before NER runs, in one regex pass."""
+    spans = [doc.char_span(t.start, t.end, label=ENTITY_LABELS[t.kind], alignment_mode="expand") for t in tokenize_contacts(doc.text)] #
+    doc.ents = filter_spans([span for span in spans if span is not None] + list(doc.ents)) #
+    return doc #
 
 class AdvancedResumeParser: #
     def __init__(self, model_name: str = "en_core_web_sm"): #
@@ -53,31 +117,29 @@ class AdvancedResumeParser: #
             print(f"Model {model_name} not found. Downloading {model_name}..."); spacy.cli.download(model_name); self.nlp = spacy.load(model_name) #
         self._setup_entity_ruler() #
         self.matcher = Matcher(self.nlp.vocab) #
-        self.phrase_matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER") #
         self._setup_patterns() #
+        self.skill_ontology = get_skill_ontology() # Shared with the job scraper; see core/skill_ontology.py #
         self.skills_db: Dict[str, List[str]] = self._load_skills_database() #
         self._setup_skill_matchers() #
+        self.nlp = TimedPipeline(self.nlp) # Pipeline setup above used the bare Language object #
+        self.pipeline_fingerprint = pipeline_fingerprint(self.nlp, DOC_PIPELINE_REVISION) #
+        self.parse_budget = ParseBudget.unlimited() # Replaced per parse; extractors called directly are not limited #
+        self.budget_factory = ParseBudget # Builds each parse's budget; offline callers (the re-parser) use ParseBudget.unlimited #
         self.degree_patterns: List[str] = ["bachelor of technology", "b.tech", "bachelor of engineering", "b.e.", "bachelor of science", "b.s.", "b.sc.", "bachelor of arts", "b.a.", "bachelor of commerce", "b.com.", "master of technology", "m.tech", "master of engineering", "m.e.", "master of science", "m.s.", "m.sc.", "master of arts", "m.a.", "master of commerce", "m.com.", "master of business administration", "m.b.a.", "ph.d.", "doctor of philosophy", "doctorate", "associate degree", "diploma", "post graduate diploma", "pgdm", "certificate", "intermediate", "higher secondary certificate", "hsc", "secondary school certificate", "ssc", "10th", "12th", "xth", "xiith", "class x", "class xii"] #
         self.job_titles: List[str] = ["engineer", "developer", "programmer", "analyst", "consultant", "manager", "director", "lead", "specialist", "trainee", "intern", "fellow", "architect", "scientist", "researcher", "executive", "officer", "coordinator", "assistant", "associate", "senior", "junior", "principal", "software engineer", "data scientist", "product manager", "project manager", "business analyst", "qa engineer", "devops engineer", "full stack developer", "frontend developer", "backend developer", "technical lead", "solutions architect", "data analyst", "machine learning engineer", "research intern", "technical trainee", "associate software engineer", "research analyst", "member technical staff"] #
-        self.non_name_keywords: List[str] = [kw.lower() for kw in ['university', 'inc', 'corp', 'llc', 'ltd', 'school', 'college', 'institute', 'resume', 'cv', 'summary', 'experience', 'education', 'technologies', 'consulting', 'limited', 'solutions', 'coursera', 'udemy', 'infosys', 'springboard', 'nptel', 'profile', 'objective', 'contact', 'details', 'gmail.com', '@', 'http', 'www', 'curriculum vitae', 'biodata', 'linkedin', 'github', 'portfolio', 'address', 'phone', 'email', 'website', 'date of birth', 'nationality', 'technical', 'skills', 'projects', 'internship', 'certification', 'award', 'references', 'declaration', 'page', 'confidential', 'contact number', 'e-mail', 'pvt', 'private']] #
-        self.non_location_keywords: List[str] = list(set([skill.lower() for cat_skills in self._load_skills_database().values() for skill in cat_skills] + ['logistic regression', 'machine learning', 'data analysis', 'data science', 'remote', 'online', 'various locations', 'multiple cities', 'n/a', 'tbd', 'work from home', 'headquarters'] + self.job_titles)) #
+        self.job_title_recognizer = JobTitleRecognizer(self.job_titles + load_job_title_taxonomy()) # Compiled once; see core/job_titles.py #
+        self.non_name_keywords = KeywordSet(['university', 'inc', 'corp', 'llc', 'ltd', 'school', 'college', 'institute', 'resume', 'cv', 'summary', 'experience', 'education', 'technologies', 'consulting', 'limited', 'solutions', 'coursera', 'udemy', 'infosys', 'springboard', 'nptel', 'profile', 'objective', 'contact', 'details', 'gmail.com', '@', 'http', 'www', 'curriculum vitae', 'biodata', 'linkedin', 'github', 'portfolio', 'address', 'phone', 'email', 'website', 'date of birth', 'nationality', 'technical', 'skills', 'projects', 'internship', 'certification', 'award', 'references', 'declaration', 'page', 'confidential', 'contact number', 'e-mail', 'pvt', 'private']) # Compiled once; see core/keyword_set.py #
+        self.non_location_keywords = KeywordSet(['logistic regression', 'machine learning', 'data analysis', 'data science', 'remote', 'online', 'various locations', 'multiple cities', 'n/a', 'tbd', 'work from home', 'headquarters'] + self.job_titles) #
+        self.non_location_skills = KeywordSet([skill for cat_skills in self.skills_db.values() for skill in cat_skills], whole_words=True) # Whole words: short aliases (ai, qa, sap) are inside city names #
         if NLTK_AVAILABLE and stopwords: #
             try: self.stop_words: Set[str] = set(stopwords.words('english')) #
             except LookupError: print("NLTK stopwords not found. Downloading..."); nltk.download('stopwords', quiet=True); self.stop_words = set(stopwords.words('english')) #
         else: self.stop_words = set(['i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she', 'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them', 'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that', 'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for', 'with', 'about', 'against', 'between', 'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 's', 't', 'can', 'will', 'just', 'don', 'should', 'now']) #
 
     def _setup_entity_ruler(self): #
-        if "custom_entity_ruler" not in self.nlp.pipe_names: #
-            ruler = self.nlp.add_pipe("entity_ruler", name="custom_entity_ruler", before="ner") #
-            patterns = [ #
-                {"label": "EMAIL", "pattern": [{"TEXT": {"REGEX": r"\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b"}}]}, # Added word boundary #
-                {"label": "PHONE", "pattern": [{"TEXT": {"REGEX": r"(?:\+91[ -]?)?(?:[6-9]\d{9}|[6-9]\d{2}[ -]?\d{3}[ -]?\d{4})\b"}}]}, #
-                {"label": "LINKEDIN_URL", "pattern": [{"LOWER": {"REGEX": r"(?:https?://)?(?:www\.)?linkedin\.com/in/[\w%\.-]+/?$"}}]}, #
-                {"label": "GITHUB_URL", "pattern": [{"LOWER": {"REGEX": r"(?:https?://)?(?:www\.)?github\.com/[\w%\.-]+/?$"}}]}, #
-                {"label": "URL", "pattern": [{"TEXT": {"REGEX": r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"}}]} #
-            ]
-            ruler.add_patterns(patterns) #
-            if DEBUG_ENTITY_EXTRACTION: print("DEBUG: Custom Entity Ruler added to pipeline.") #
+        if "contact_entities" not in self.nlp.pipe_names: #
+            self.nlp.add_pipe("contact_entities", before="ner") # Replaces per-token regex EntityRuler patterns #
+            ENTITY_LOG.debug("Contact entity component added to pipeline.") #
 
     def _setup_patterns(self): #
         date_patterns: List[List[Dict[str,Any]]] = [ #
@@ -86,32 +148,21 @@ class AdvancedResumeParser: #
             [{"TEXT": {"REGEX": r"^\d{1,2}[/\s.-]+\d{4}$"}}], [{"TEXT": {"REGEX": r"^(19|20)\d{2}$"}}]] #
         for i, pattern in enumerate(date_patterns): self.matcher.add(f"DATE_PATTERN_{i}", [pattern]) #
 
+    def _is_non_location(self, text: str) -> bool: #
+        return self.non_location_keywords.contains_any(text) or self.non_location_skills.contains_any(text) #
+
+    def _matched_skills(self, doc: spacy.tokens.Doc, match_id: int) -> list: #
+        return self.skill_ontology.with_implied(doc.vocab.strings[match_id]) # phrase_matcher ids are canonical skill ids; "AWS Certified" also counts as AWS #
+
     def _load_skills_database(self) -> Dict[str, List[str]]: #
-        return {'programming_languages': ['python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'shell', 'bash', 'powershell', 'c', 'objective-c'], 'web_technologies': ['html', 'css', 'react', 'angular', 'vue', 'vue.js', 'node.js', 'express', 'express.js', 'django', 'flask', 'spring', 'spring boot', 'asp.net', 'laravel', 'ruby on rails', 'jquery', 'bootstrap', 'tailwind css', 'sass', 'less', 'webpack', 'gulp', 'grunt', 'next.js', 'nuxt.js', 'gatsby', 'restful apis', 'soap apis', 'graphql', 'ajax', 'json', 'xml', 'jwt'], 'databases': ['sql', 'mysql', 'postgresql', 'postgres', 'mongodb', 'mongo', 'redis', 'oracle', 'sqlite', 'cassandra', 'dynamodb', 'elasticsearch', 'neo4j', 'couchdb', 'mariadb', 'firebase', 'ms sql server', 'nosql'], 'cloud_platforms': ['aws', 'amazon web services', 'azure', 'microsoft azure', 'gcp', 'google cloud platform', 'google cloud', 'heroku', 'digitalocean', 'linode', 'docker', 'kubernetes', 'k8s', 'terraform', 'ansible', 'jenkins', 'gitlab ci', 'github actions', 'openshift', 'serverless', 'lambda', 'azure functions', 'google cloud functions', 'ibm cloud'], 'data_science': ['pandas', 'numpy', 'scipy', 'scikit-learn', 'sklearn', 'tensorflow', 'pytorch', 'torch', 'keras', 'matplotlib', 'seaborn', 'plotly', 'jupyter', 'jupyter notebook', 'tableau', 'power bi', 'apache spark', 'spark', 'hadoop', 'kafka', 'apache kafka', 'shap', 'nltk', 'spacy', 'opencv', 'excel', 'vba', 'statistics', 'statistical analysis', 'machine learning', 'ml', 'deep learning', 'dl', 'data mining', 'data analysis', 'data visualization', 'nlp', 'natural language processing', 'computer vision', 'big data'], 'mobile_development': ['ios', 'android', 'react native', 'flutter', 'xamarin', 'cordova', 'ionic', 'swiftui', 'jetpack compose', 'kotlin multiplatform'], 'tools_and_software': ['git', 'github', 'gitlab', 'bitbucket', 'svn', 'jira', 'confluence', 'slack', 'microsoft teams', 'trello', 'asana', 'notion', 'adobe photoshop', 'photoshop', 'adobe illustrator', 'illustrator', 'figma', 'sketch', 'invision', 'zeplin', 'intellij idea', 'pycharm', 'vs code', 'visual studio code', 'visual studio', 'android studio', 'xcode', 'mongodb compass', 'oracle sql developer', 'eclipse', 'postman', 'selenium', 'webdriver', 'junit', 'testng', 'maven', 'gradle', 'npm', 'yarn', 'linux', 'unix', 'bash shell', 'powershell script'], 'methodologies': ['agile', 'scrum', 'kanban', 'devops', 'ci/cd', 'continuous integration', 'continuous deployment', 'tdd', 'test driven development', 'bdd', 'behavior driven development', 'microservices', 'rest api', 'graphql api', 'soap', 'oauth', 'saml', 'sso', 'waterfall', 'lean', 'six sigma', 'design patterns'], 'operating_systems': ['linux', 'windows', 'macos', 'mac os x', 'unix', 'ubuntu', 'centos', 'debian', 'red hat', 'fedora', 'ios operating system', 'android operating system'], 'soft_skills': ['leadership', 'team leadership', 'communication', 'verbal communication', 'written communication', 'teamwork', 'collaboration', 'problem solving', 'analytical skills', 'critical thinking', 'project management', 'time management', 'adaptability', 'flexibility', 'creativity', 'innovation', 'analytical thinking', 'mentoring', 'coaching', 'negotiation', 'conflict resolution', 'decision making', 'public speaking', 'presentation skills', 'client relations', 'stakeholder management']} #
+        return self.skill_ontology.skills_by_category() # {category: skill names and aliases} #
 
     def _setup_skill_matchers(self): #
-        for category, skills in self.skills_db.items(): #
-            try:
-                skill_patterns = [self.nlp.make_doc(skill) for skill in skills] #
-                self.phrase_matcher.add(f"SKILL_{category.upper()}", skill_patterns) #
-            except Exception as e: #
-                if DEBUG_LINE_PROCESSING: print(f"Error creating PhraseMatcher pattern for skill in {category}: {e}") #
+        self.phrase_matcher = self.skill_ontology.phrase_matcher(self.nlp.vocab, lang=self.nlp.lang, make_doc=self.nlp.make_doc) # One match id per canonical skill #
 
     def _preprocess_contact_text(self, lines: List[str], num_lines_to_check: int = 3) -> List[str]: #
         processed_lines = lines[:] #
-        if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: Preprocessing first {num_lines_to_check} lines for contact info spacing (V7)...") #
-
-        email_re_str = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b' #
-        phone_re_str = r'\b(?:\+91[ -]?)?(?:[6-9]\d{9}|[6-9]\d{2}[ -]?\d{3}[ -]?\d{4})\b' #
-        linkedin_re_str = r'\b(?:https?://)?(?:www\.)?linkedin\.com/in/[\w%\.-]+/?\b' #
-        github_re_str = r'\b(?:https?://)?(?:www\.)?github\.com/[\w%\.-]+/?\b' #
-        leetcode_re_str = r'\b(?:https?://)?(?:www\.)?leetcode\.com/u/[\w%\.-]+/?\b' #
-        url_re_str = r'\b(?:https?://|www\.)[\w\.-]+(?:\.[a-zA-Z]{2,63})+(?:/[\w%\.\-\=\&\?\!\*~(),$]*)*\b' #
-
-        patterns_to_extract_and_space = [ #
-            linkedin_re_str, github_re_str, leetcode_re_str, #
-            email_re_str, phone_re_str, url_re_str #
-        ]
+        CONTACT_LOG.debug("Preprocessing first %s lines for contact info spacing (V7)...", num_lines_to_check) #
 
         for i in range(min(num_lines_to_check, len(processed_lines))): #
             line = processed_lines[i] #
@@ -124,43 +175,17 @@ class AdvancedResumeParser: #
                         any(line.lower().strip(": ").startswith(hdr_kw.lower()) for hdr_kw in all_major_headers_for_check if len(hdr_kw)>5) #
             
             if not is_potential_contact_line or is_header: #
-                if DEBUG_CONTACT_INFO and i < num_lines_to_check and is_potential_contact_line : print(f"  Skipping line {i+1} for contact preprocessing: '{line[:70]}...' (is header or no indicators)") #
+                if i < num_lines_to_check and is_potential_contact_line : CONTACT_LOG.debug("Skipping line %s for contact preprocessing: '%s...' (is header or no indicators)", i+1, line[:70]) #
                 continue #
             
             line = line.replace('|', ' ').replace('•', ' ') #
             line = re.sub(r'\s+', ' ', line).strip() #
 
-            found_matches = [] #
-            for pattern_str in patterns_to_extract_and_space: #
-                for match in re.finditer(pattern_str, line, re.IGNORECASE): #
-                    found_matches.append((match.start(), match.end(), match.group(0))) #
-            
-            found_matches.sort(key=lambda x: (x[0], -(x[1] - x[0]))) #
-            
-            unique_matches_final = [] #
-            last_end_pos = -1 #
-            for start, end, text_match in found_matches: #
-                if start >= last_end_pos: #
-                    unique_matches_final.append({'start': start, 'end': end, 'text': text_match}) #
-                    last_end_pos = end #
-            
-            if unique_matches_final: #
-                reconstructed_parts = [] #
-                current_pos = 0 #
-                for match_info in unique_matches_final: #
-                    if match_info['start'] > current_pos: #
-                        reconstructed_parts.append(line[current_pos:match_info['start']]) #
-                    reconstructed_parts.append(match_info['text']) #
-                    current_pos = match_info['end'] #
-                if current_pos < len(line): #
-                    reconstructed_parts.append(line[current_pos:]) #
-                
-                line = " ".join(p.strip() for p in reconstructed_parts if p.strip()) #
-            
+            line = space_contact_tokens(line) # One pass of the combined contact regex; see core/contact_tokens.py #
             line = re.sub(r'\s+', ' ', line).strip() #
 
-            if line != original_line_for_debug and DEBUG_CONTACT_INFO: #
-                print(f"  Contact Preprocessing (V7): Line {i+1} changed from '{original_line_for_debug}' to '{line}'") #
+            if line != original_line_for_debug: #
+                CONTACT_LOG.debug("Contact Preprocessing (V7): Line %s changed from '%s' to '%s'", i+1, original_line_for_debug, line) #
             processed_lines[i] = line #
         return processed_lines #
         
@@ -171,86 +196,138 @@ class AdvancedResumeParser: #
         cleaned_text = re.sub(r' +', ' ', cleaned_text) #
         return cleaned_text.strip() #
 
-    def parse_resume(self, resume_text: str) -> Dict[str, Any]: #
-        if DEBUG_LINE_PROCESSING: print(f"--- RAW PDF TEXT (first 1000 chars) ---\n{resume_text[:1000]}\n--- END RAW PDF TEXT ---") #
-        initial_lines = resume_text.split('\n') #
+    def parse_resume(self, resume_text: str, use_doc_cache: bool = False) -> Dict[str, Any]: #
+        """
+        Parses resume text. With use_doc_cache (the bulk re-parser opts in), a text parsed
+        before reuses its spaCy Docs and only the extractors run. Off by default: the cache keeps resume text on disk.
+        """
+        if not (use_doc_cache and doc_cache.enabled): return self._parse_resume(resume_text) #
+        cache_key = text_key(resume_text, self.pipeline_fingerprint) #
+        self.nlp.replay = doc_cache.load(cache_key, self.nlp.vocab) or {}; self.nlp.recorded = {} #
+        try:
+            return self._parse_resume(resume_text) #
+        finally:
+            if self.nlp.recorded: doc_cache.save(cache_key, [*self.nlp.replay.values(), *self.nlp.recorded.values()]) # New texts tagged #
+            self.nlp.replay = self.nlp.recorded = None #
+
+    def parse_resumes(self, resume_texts: List[str], use_doc_cache: bool = False, batch_size: int = NLP_PIPE_BATCH_SIZE) -> List[Dict[str, Any]]: #
+        """Batch form of parse_resume(). Full-document Docs not found in the doc cache are tagged together with nlp.pipe()."""
+        use_doc_cache = use_doc_cache and doc_cache.enabled #
+        cache_keys = [text_key(text, self.pipeline_fingerprint) if use_doc_cache else None for text in resume_texts] #
+        cached_docs = [doc_cache.load(key, self.nlp.vocab) if key else None for key in cache_keys] #
+        full_doc_texts = {i: cap_text(self._full_doc_text(text.split('\n')), PARSE_MAX_CHARS) for i, text in enumerate(resume_texts) if cached_docs[i] is None} #
+        texts_to_tag = list(dict.fromkeys(text for text in full_doc_texts.values() if text)) #
+        tagged_docs = dict(zip(texts_to_tag, self.nlp.pipe(texts_to_tag, batch_size=batch_size))) if texts_to_tag else {} #
+        results: List[Dict[str, Any]] = [] #
+        for i, resume_text in enumerate(resume_texts): #
+            self.nlp.replay = dict(cached_docs[i] or {}); self.nlp.recorded = {} if cache_keys[i] else None #
+            main_doc = tagged_docs.get(full_doc_texts.get(i)) #
+            if main_doc is not None: self.nlp.replay[full_doc_texts[i]] = main_doc #
+            try:
+                results.append(self._parse_resume(resume_text)) #
+            finally:
+                if cache_keys[i] and (self.nlp.recorded or cached_docs[i] is None): doc_cache.save(cache_keys[i], [*self.nlp.replay.values(), *self.nlp.recorded.values()]) #
+                self.nlp.replay = self.nlp.recorded = None #
+        return results #
+
+    def _full_doc_text(self, initial_lines: List[str]) -> str: #
+        """Text the full-document Doc is built from: contact lines spaced out, whitespace collapsed."""
         lines_after_contact_preprocessing = self._preprocess_contact_text(initial_lines, num_lines_to_check=3) #
-        self.cleaned_resume_lines: List[str] = [] #
-        for line_content in initial_lines: # Use original lines for section finding logic base #
-            normalized_for_section_finding = re.sub(r'\s+', ' ', line_content).strip() #
-            if normalized_for_section_finding: self.cleaned_resume_lines.append(normalized_for_section_finding) #
-        
         final_lines_for_full_doc = [] #
         for i, original_line_content in enumerate(initial_lines): #
             if i < len(lines_after_contact_preprocessing): final_lines_for_full_doc.append(lines_after_contact_preprocessing[i]) #
             else: final_lines_for_full_doc.append(re.sub(r'\s+', ' ', original_line_content).strip()) #
+        text_for_full_doc = "\n".join(final_lines_for_full_doc); return re.sub(r'\n{3,}', '\n\n', text_for_full_doc).strip() #
+
+    def _parse_resume(self, resume_text: str) -> Dict[str, Any]: #
+        start_trace_sample("parser") # One sampling decision per resume, so a kept trace is complete #
+        self.parse_budget = self.budget_factory(); self.nlp.budget = self.parse_budget #
+        try:
+            return self._parse_within_budget(resume_text) #
+        finally:
+            self.nlp.budget = None #
+
+    def _parse_within_budget(self, resume_text: str) -> Dict[str, Any]: #
+        if trace_enabled(LINE_LOG): LINE_LOG.debug("--- RAW PDF TEXT (first 1000 chars) ---\n%s\n--- END RAW PDF TEXT ---", resume_text[:1000]) #
+        initial_lines = resume_text.split('\n') #
+        self.cleaned_resume_lines: List[str] = [] #
+        for line_content in initial_lines: # Use original lines for section finding logic base #
+            normalized_for_section_finding = re.sub(r'\s+', ' ', line_content).strip() #
+            if normalized_for_section_finding: self.cleaned_resume_lines.append(normalized_for_section_finding) #
         
-        text_for_full_doc = "\n".join(final_lines_for_full_doc); text_for_full_doc = re.sub(r'\n{3,}', '\n\n', text_for_full_doc).strip() #
+        text_for_full_doc = self.parse_budget.cap_text(self._full_doc_text(initial_lines), 'full_doc') # A single spaCy call can't be interrupted #
         
-        if DEBUG_LINE_PROCESSING: #
-            print(f"--- TEXT FOR FULL NLP DOC (first 1000 chars after contact preprocessing) ---\n{text_for_full_doc[:1000]}\n--- END TEXT ---") #
-            print(f"--- CLEANED LINES FOR SECTION FINDING (first 20 lines from initial_lines normalized) ---") #
-            for i, ln in enumerate(self.cleaned_resume_lines[:20]): print(f"  Line {i+1}: {ln}") #
-            if len(self.cleaned_resume_lines) > 20: print("  ...") #
-            print("--- END CLEANED LINES ---") #
+        if trace_enabled(LINE_LOG): #
+            LINE_LOG.debug("--- TEXT FOR FULL NLP DOC (first 1000 chars after contact preprocessing) ---\n%s\n--- END TEXT ---", text_for_full_doc[:1000]) #
+            LINE_LOG.debug("--- CLEANED LINES FOR SECTION FINDING (first 20 lines from initial_lines normalized) ---\n%s%s", #
+                           "\n".join(f"  Line {i+1}: {ln}" for i, ln in enumerate(self.cleaned_resume_lines[:20])), #
+                           "\n  ..." if len(self.cleaned_resume_lines) > 20 else "") #
         
         doc: Optional[spacy.tokens.Doc] = None #
         if text_for_full_doc: #
-            if DEBUG_NLP_CALLS: print(f"NLP_CALL_MAIN_DOC_START: Processing FULL DOC ({len(text_for_full_doc)} chars)...") #
+            NLP_LOG.debug("NLP_CALL_MAIN_DOC_START: Processing FULL DOC (%s chars)...", len(text_for_full_doc)) #
             try:
                 doc = self.nlp(text_for_full_doc) #
-                if DEBUG_NLP_CALLS: print("NLP_CALL_MAIN_DOC_END: FULL DOC NLP processing complete.") #
-            except Exception as e_main_nlp: print(f"ERROR: Main NLP processing failed: {e_main_nlp}"); doc = self.nlp("") #
+                NLP_LOG.debug("NLP_CALL_MAIN_DOC_END: FULL DOC NLP processing complete.") #
+            except Exception as e_main_nlp: NLP_LOG.error("Main NLP processing failed: %s", e_main_nlp); doc = self.nlp("") #
         else: doc = self.nlp(""); #
         
         if doc is None: # Should not happen if self.nlp("") is used as fallback #
             doc = self.nlp("") # Ensure doc is always a spacy.tokens.Doc #
 
-        if DEBUG_LINE_PROCESSING and hasattr(doc, 'sents'): #
+        if trace_enabled(LINE_LOG) and hasattr(doc, 'sents'): #
             sents_list = list(doc.sents) #
-            print(f"--- TOTAL SENTENCES FOUND BY SPACY on FULL DOC: {len(sents_list)} ---") #
-            for i, sent in enumerate(sents_list[:10]): print(f"  Full Doc Sentence {i+1}: {sent.text[:100].strip()}...") #
-            if len(sents_list) > 10: print(f"  ... and {len(sents_list) - 10} more sentences.") #
-        
-        if DEBUG_ENTITY_EXTRACTION: #
-            print("\n--- DETECTED ENTITIES IN FULL DOC ---") #
-            for ent_idx, ent in enumerate(doc.ents): #
-                if ent_idx < 40 : print(f"  Entity: '{ent.text}', Label: '{ent.label_}' ({ent.start_char}-{ent.end_char})") #
-            if len(doc.ents) > 40: print(f"  ... and {len(doc.ents) - 40} more entities.") #
-            print("--- END DETECTED ENTITIES ---\n") #
-        
-        parsed_data: Dict[str, Any] = { #
-            'contact_info': self.extract_contact_info_advanced(doc), #
-            'summary': self.extract_summary_advanced(), #
-            'skills': self.extract_skills_advanced(doc), #
-            'experience': self.extract_experience_advanced(), #
-            'education': self.extract_education_advanced(), #
-            'certifications': self.extract_certifications_advanced(), #
-            'languages': self.extract_languages(), #
-            'projects': self.extract_projects(), #
-            'awards': self.extract_awards()} #
+            LINE_LOG.debug("--- TOTAL SENTENCES FOUND BY SPACY on FULL DOC: %s ---\n%s%s", len(sents_list), #
+                           "\n".join(f"  Full Doc Sentence {i+1}: {sent.text[:100].strip()}..." for i, sent in enumerate(sents_list[:10])), #
+                           f"\n  ... and {len(sents_list) - 10} more sentences." if len(sents_list) > 10 else "") #
+        
+        if trace_enabled(ENTITY_LOG): #
+            ENTITY_LOG.debug("--- DETECTED ENTITIES IN FULL DOC ---\n%s%s", #
+                             "\n".join(f"  Entity: '{ent.text}', Label: '{ent.label_}' ({ent.start_char}-{ent.end_char})" for ent in doc.ents[:40]), #
+                             f"\n  ... and {len(doc.ents) - 40} more entities." if len(doc.ents) > 40 else "") #
+        
+        extractors = { # Output order; they run in EXTRACTOR_PRIORITY order #
+            'contact_info': lambda: self.extract_contact_info_advanced(doc), #
+            'summary': self.extract_summary_advanced, #
+            'skills': lambda: self.extract_skills_advanced(doc), #
+            'experience': self.extract_experience_advanced, #
+            'education': self.extract_education_advanced, #
+            'certifications': self.extract_certifications_advanced, #
+            'languages': self.extract_languages, #
+            'projects': self.extract_projects, #
+            'awards': self.extract_awards} #
+        results: Dict[str, Any] = {} #
+        for section_name in EXTRACTOR_PRIORITY: #
+            if section_name not in ESSENTIAL_EXTRACTORS and self.parse_budget.exhausted: #
+                self.parse_budget.note_skipped(section_name); results[section_name] = None if section_name == 'summary' else [] #
+                continue #
+            with span(f"parser.extract.{section_name}"): results[section_name] = extractors[section_name]() #
+        parsed_data: Dict[str, Any] = {section_name: results[section_name] for section_name in extractors} #
+        if self.parse_budget.partial: #
+            NLP_LOG.warning("Parse budget spent after %.0f ms / %s tokens; skipped %s, truncated %s.", self.parse_budget.elapsed_ms(), #
+                            self.parse_budget.tokens, self.parse_budget.skipped, self.parse_budget.truncated) #
         
         parsed_data['metadata'] = { #
             'total_lines_for_sections': len(self.cleaned_resume_lines), #
             'total_tokens_in_full_doc': len(doc), #
             'parsing_confidence': self.calculate_parsing_confidence(parsed_data), #
-            'resume_score': self.calculate_parsing_confidence(parsed_data) # Added resume_score, same as confidence for now #
+            'resume_score': self.calculate_parsing_confidence(parsed_data), # Added resume_score, same as confidence for now #
+            'partial': self.parse_budget.partial, # True when the parse budget cut extractors short; see parse_budget #
+            'parse_budget': self.parse_budget.report() #
         }
         return parsed_data #
 
     def extract_contact_info_advanced(self, doc: spacy.tokens.Doc) -> Dict[str, Any]: #
         contact_info: Dict[str, Any] = {'name': None, 'email': None, 'phone': None, 'location': None, 'urls': [], 'social_profiles': {}} #
-        if DEBUG_CONTACT_INFO: print("DEBUG_CONTACT: Starting contact info extraction...") #
+        CONTACT_LOG.debug("Starting contact info extraction...") #
         if hasattr(self, 'cleaned_resume_lines') and self.cleaned_resume_lines: #
             first_line_text = self.cleaned_resume_lines[0] #
-            if DEBUG_CONTACT_INFO: #
-                print(f"DEBUG_CONTACT: First line candidate for name: '{first_line_text}'") #
-                print(f"DEBUG_CONTACT: Word count: {len(first_line_text.split())}, istitle: {first_line_text.istitle()}, isupper: {first_line_text.isupper()}") #
+            CONTACT_LOG.debug("First line candidate for name: '%s'", first_line_text) #
+            if trace_enabled(CONTACT_LOG): #
+                CONTACT_LOG.debug("Word count: %s, istitle: %s, isupper: %s", len(first_line_text.split()), first_line_text.istitle(), first_line_text.isupper()) #
             if 1 < len(first_line_text.split()) <= 4 and (first_line_text.istitle() or (first_line_text.isupper() and len(first_line_text.split())<=2) ): #
-                failing_keyword = None; is_likely_name = True #
-                for kw_meta in self.non_name_keywords: #
-                    if kw_meta.lower() in first_line_text.lower(): failing_keyword = kw_meta; is_likely_name = False; break #
-                if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: First line keyword check for name (is_likely_name): {is_likely_name}" + (f", Failing Keyword: '{failing_keyword}'" if failing_keyword else "")) #
+                failing_keyword = self.non_name_keywords.find_first(first_line_text); is_likely_name = failing_keyword is None #
+                CONTACT_LOG.debug("First line keyword check for name (is_likely_name): %s, Failing Keyword: %r", is_likely_name, failing_keyword) #
                 if is_likely_name: contact_info['name'] = first_line_text; #
         
         if not contact_info['name']: #
@@ -259,22 +336,22 @@ class AdvancedResumeParser: #
                 if ent.label_ == "PERSON" and ent.start_char < 300: # Only consider PERSON entities near the top #
                     name_text = ent.text.strip() #
                     # Further heuristics for PERSON entities to be considered names
-                    if len(name_text) > 3 and 1 < len(name_text.split()) <= 4 and not any(kw.lower() in name_text.lower() for kw in self.non_name_keywords): #
+                    if len(name_text) > 3 and 1 < len(name_text.split()) <= 4 and not self.non_name_keywords.contains_any(name_text): #
                         potential_names_ner.append({'text': name_text, 'start': ent.start_char}) #
             if potential_names_ner: #
                 potential_names_ner.sort(key=lambda x: x['start']); contact_info['name'] = potential_names_ner[0]['text'] #
-                if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: Name from NER PERSON entity: '{contact_info['name']}'") #
+                CONTACT_LOG.debug("Name from NER PERSON entity: '%s'", contact_info['name']) #
         
         extracted_emails, extracted_phones, extracted_linkedin, extracted_github = set(), set(), set(), set() #
-        for ent in doc.ents: #
-            ent_text = ent.text.strip() #
+        for token in tokenize_contacts(doc.text): # Emails, phones and URLs in one scan, without consulting NER #
+            ent_text = token.text.strip() #
             try:
-                if ent.label_ == "EMAIL" and not contact_info['email'] and ent_text not in extracted_emails: #
-                    if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: Trying email entity: '{ent_text}'") #
+                if token.kind == "email" and not contact_info['email'] and ent_text not in extracted_emails: #
+                    CONTACT_LOG.debug("Trying email entity: '%s'", ent_text) #
                     validated_email = validate_email(ent_text, check_deliverability=False); contact_info['email'] = validated_email.email; extracted_emails.add(ent_text) #
-                    if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: Email found and set: {contact_info['email']}") #
-                elif ent.label_ == "PHONE" and not contact_info['phone'] and ent_text not in extracted_phones: #
-                    if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: Trying phone entity: '{ent_text}'") #
+                    CONTACT_LOG.debug("Email found and set: %s", contact_info['email']) #
+                elif token.kind == "phone" and not contact_info['phone'] and ent_text not in extracted_phones: #
+                    CONTACT_LOG.debug("Trying phone entity: '%s'", ent_text) #
                     parsed_phone = None #
                     try: parsed_phone = phonenumbers.parse(ent_text, "IN") #
                     except phonenumbers.phonenumberutil.NumberParseException: #
@@ -282,41 +359,44 @@ class AdvancedResumeParser: #
                         except phonenumbers.phonenumberutil.NumberParseException: pass #
                     if parsed_phone and phonenumbers.is_valid_number(parsed_phone): contact_info['phone'] = phonenumbers.format_number(parsed_phone, phonenumbers.PhoneNumberFormat.E164); extracted_phones.add(ent_text) #
                     elif not contact_info['phone'] and re.match(r'(?:\+91[ -]?)?(?:[6-9]\d{9}|[6-9]\d{2}[ -]?\d{3}[ -]?\d{4})\b', ent_text): contact_info['phone'] = ent_text; extracted_phones.add(ent_text) # Fallback regex if lib fails #
-                    if contact_info['phone'] and DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: Phone found and set: {contact_info['phone']}") #
-                elif ent.label_ == "LINKEDIN_URL" and ent_text not in extracted_linkedin: #
+                    if contact_info['phone']: CONTACT_LOG.debug("Phone found and set: %s", contact_info['phone']) #
+                elif token.kind == "linkedin" and ent_text not in extracted_linkedin: #
                     url = ent_text if ent_text.lower().startswith("http") else "https://" + ent_text.lower().replace("www.","") #
                     if "linkedin.com/in/" in url: #
                         contact_info['social_profiles']['linkedin'] = url #
                         if url not in contact_info['urls']: contact_info['urls'].append(url); extracted_linkedin.add(ent_text) #
-                        if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: LinkedIn URL found: {url}") #
-                elif ent.label_ == "GITHUB_URL" and ent_text not in extracted_github: #
+                        CONTACT_LOG.debug("LinkedIn URL found: %s", url) #
+                elif token.kind == "github" and ent_text not in extracted_github: #
                     url = ent_text if ent_text.lower().startswith("http") else "https://" + ent_text.lower().replace("www.","") #
                     if "github.com/" in url: #
                         contact_info['social_profiles']['github'] = url #
                         if url not in contact_info['urls']: contact_info['urls'].append(url); extracted_github.add(ent_text) #
-                        if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: GitHub URL found: {url}") #
-                elif ent.label_ == "URL" and ent_text.startswith("http") and ent_text not in contact_info['urls'] and not any(known_url_part in ent_text for known_url_part in ["linkedin.com", "github.com"]): #
+                        CONTACT_LOG.debug("GitHub URL found: %s", url) #
+                elif token.kind in ("url", "leetcode") and ent_text.startswith("http") and ent_text not in contact_info['urls'] and not any(known_url_part in ent_text for known_url_part in ["linkedin.com", "github.com"]): #
                     contact_info['urls'].append(ent_text) #
-                    if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: General URL found: {ent_text}") #
-                elif ent.label_ in ["GPE", "LOC"] and not contact_info['location'] and ent.start_char < 500: # Location usually near top #
-                    loc_text = ent.text.strip() #
-                    if 2 < len(loc_text) < 35 and len(loc_text.split()) <= 4 and not any(kw_loc.lower() in loc_text.lower() for kw_loc in self.non_location_keywords): #
-                        contact_info['location'] = loc_text #
-                        if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: Location from NER: {loc_text}") #
+                    CONTACT_LOG.debug("General URL found: %s", ent_text) #
             except EmailNotValidError: #
-                if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: Invalid email format for '{ent_text}'") #
+                CONTACT_LOG.debug("Invalid email format for '%s'", ent_text) #
             except Exception as e_contact_inner: #
-                 if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: Inner error processing entity '{ent_text}' for {ent.label_}: {e_contact_inner}") #
-        if DEBUG_CONTACT_INFO: print(f"DEBUG_CONTACT: Final Contact Info: {contact_info}") #
+                 CONTACT_LOG.debug("Inner error processing contact token '%s' (%s): %s", ent_text, token.kind, e_contact_inner) #
+        for ent in doc.ents: # Location still needs NER #
+            if ent.label_ in ["GPE", "LOC"] and ent.start_char < 500: # Location usually near top #
+                loc_text = ent.text.strip() #
+                if 2 < len(loc_text) < 35 and len(loc_text.split()) <= 4 and not self._is_non_location(loc_text): #
+                    contact_info['location'] = loc_text #
+                    CONTACT_LOG.debug("Location from NER: %s", loc_text) #
+                    break #
+        CONTACT_LOG.debug("Final Contact Info: %s", contact_info) #
         return contact_info #
 
     def find_section(self, section_keywords: List[str]) -> Optional[spacy.tokens.Doc]: #
         if not hasattr(self, 'cleaned_resume_lines') or not self.cleaned_resume_lines: #
-            if DEBUG_FIND_SECTION: print(f"DEBUG_FIND_SECTION: `cleaned_resume_lines` unavailable for: {section_keywords}") #
+            SECTION_LOG.debug("`cleaned_resume_lines` unavailable for: %s", section_keywords) #
             return None #
         section_start_line_idx = -1; header_line_text_found = ""; fuzzy_threshold = 80 #
-        if DEBUG_FIND_SECTION: print(f"\nDEBUG_FIND_SECTION: Searching for section (line-based): {section_keywords}") #
+        SECTION_LOG.debug("Searching for section (line-based): %s", section_keywords) #
         for i, line_text in enumerate(self.cleaned_resume_lines): #
+            if self.parse_budget.exhausted_at(i): self.parse_budget.note_truncated(f"section:{section_keywords[0]}"); break #
             line_text_lower = line_text.lower() #
             if not line_text_lower or len(line_text.split()) > 7: continue # Skip empty or very long lines for headers #
             for keyword in section_keywords: #
@@ -330,10 +410,10 @@ class AdvancedResumeParser: #
             if section_start_line_idx != -1: break #
         
         if section_start_line_idx == -1: #
-            if DEBUG_FIND_SECTION: print(f"  Section header NOT FOUND for: {section_keywords}") #
+            SECTION_LOG.debug("Section header NOT FOUND for: %s", section_keywords) #
             return None #
         
-        if DEBUG_FIND_SECTION: print(f"  FOUND header '{header_line_text_found}' at line index {section_start_line_idx} for {section_keywords}") #
+        SECTION_LOG.debug("FOUND header '%s' at line index %s for %s", header_line_text_found, section_start_line_idx, section_keywords) #
         
         section_content_lines: List[str] = [] #
         # Check if content is on the same line as the header
@@ -347,12 +427,13 @@ class AdvancedResumeParser: #
         
         if content_on_header_line and content_on_header_line.lower() != header_line_text_found.lower(): # If content was indeed on the header line #
              section_content_lines.append(content_on_header_line) #
-             if DEBUG_FIND_SECTION: print(f"    Content found on header line: '{content_on_header_line}'") #
+             SECTION_LOG.debug("Content found on header line: '%s'", content_on_header_line) #
 
         # Collect subsequent lines until another known section header is found
         all_known_section_starters_lower: List[str] = list(set([kw.lower() for kw in ['summary', 'profile', 'objective', 'overview', 'experience', 'employment', 'internship', 'project', 'portfolio', 'education', 'academic', 'qualification', 'scholastic', 'skills', 'technical skills', 'technologies', 'certification', 'certificate', 'license', 'credential', 'award', 'honor', 'recognition', 'scholarship', 'language', 'publication', 'reference', 'contact', 'declaration', 'personal detail', 'activity', 'extracurricular', 'achievement']] + [jt.lower() for jt in self.job_titles if len(jt.split()) <=2 and len(jt)>3])) #
         
         for j in range(section_start_line_idx + 1, len(self.cleaned_resume_lines)): #
+            if self.parse_budget.exhausted_at(j - section_start_line_idx): self.parse_budget.note_truncated(f"section:{section_keywords[0]}"); break #
             current_line_text = self.cleaned_resume_lines[j]; current_line_lower = current_line_text.lower(); is_next_section_header = False #
             # Heuristic for a new section header: short line, often title case or all caps
             if len(current_line_text.split()) < 5 and len(current_line_text) < 40: # Arbitrary limits, can be tuned #
@@ -364,43 +445,42 @@ class AdvancedResumeParser: #
                     if other_header_kw == current_line_lower or \
                        (FUZZY_AVAILABLE and fuzz and fuzz.ratio(current_line_lower, other_header_kw) > 85 and \
                         (current_line_text.istitle() or current_line_text.isupper() or len(current_line_text.split())<=2)): #
-                        if DEBUG_FIND_SECTION: print(f"    Stopping section '{section_keywords[0]}' (header: '{header_line_text_found}') due to new header line '{current_line_text}' matching '{other_header_kw}'") #
+                        SECTION_LOG.debug("Stopping section '%s' (header: '%s') due to new header line '%s' matching '%s'", section_keywords[0], header_line_text_found, current_line_text, other_header_kw) #
                         is_next_section_header = True; break #
             if is_next_section_header: break #
             section_content_lines.append(current_line_text) #
         
         if not section_content_lines: #
-            if DEBUG_FIND_SECTION: print(f"  No content lines collected for section {section_keywords} (after header line check).") #
+            SECTION_LOG.debug("No content lines collected for section %s (after header line check).", section_keywords) #
             return None #
             
         full_section_text = "\n".join(section_content_lines).strip() #
         if not full_section_text: #
-             if DEBUG_FIND_SECTION: print(f"  Collected section text is empty for {section_keywords}.") #
+             SECTION_LOG.debug("Collected section text is empty for %s.", section_keywords) #
              return None #
 
         text_to_process_nlp = self._apply_nlp_preprocessing(full_section_text) #
-        if DEBUG_FIND_SECTION: #
-            print(f"  Successfully extracted text for section '{section_keywords[0]}', original length: {len(full_section_text)}, processed for NLP length: {len(text_to_process_nlp)}.") #
+        if trace_enabled(SECTION_LOG): #
+            SECTION_LOG.debug("Successfully extracted text for section '%s', original length: %s, processed for NLP length: %s.", section_keywords[0], len(full_section_text), len(text_to_process_nlp)) #
             if len(text_to_process_nlp) != len(full_section_text) or "•" in full_section_text or "|" in full_section_text: # If cleaning changed the text #
-                 print(f"--- DEBUG: Text about to be NLP'd for section '{section_keywords[0]}' (after specific cleaning) ---") #
-                 print(f"'''{text_to_process_nlp[:500].strip()}...'''"); print(f"--- END DEBUG TEXT ---") #
+                 SECTION_LOG.debug("--- Text about to be NLP'd for section '%s' (after specific cleaning) ---\n'''%s...'''\n--- END TEXT ---", section_keywords[0], text_to_process_nlp[:500].strip()) #
         
         section_doc: Optional[spacy.tokens.Doc] = None #
         try:
             if text_to_process_nlp: #
-                if DEBUG_NLP_CALLS: print(f"NLP_CALL_FIND_SECTION_START: Processing section '{section_keywords[0]}' ({len(text_to_process_nlp)} chars)...") #
+                NLP_LOG.debug("NLP_CALL_FIND_SECTION_START: Processing section '%s' (%s chars)...", section_keywords[0], len(text_to_process_nlp)) #
                 section_doc = self.nlp(text_to_process_nlp) #
-                if DEBUG_NLP_CALLS: print(f"NLP_CALL_FIND_SECTION_END: COMPLETED section '{section_keywords[0]}'.") #
+                NLP_LOG.debug("NLP_CALL_FIND_SECTION_END: COMPLETED section '%s'.", section_keywords[0]) #
             else: #
-                if DEBUG_FIND_SECTION: print(f"  Skipping NLP for section '{section_keywords[0]}' as preprocessed text is empty."); return None #
+                SECTION_LOG.debug("Skipping NLP for section '%s' as preprocessed text is empty.", section_keywords[0]); return None #
         except Exception as e_nlp_section: #
-            if DEBUG_FIND_SECTION: print(f"ERROR: NLP processing failed for section '{section_keywords[0]}': {e_nlp_section}"); return None #
+            NLP_LOG.error("NLP processing failed for section '%s': %s", section_keywords[0], e_nlp_section); return None #
         
         return section_doc #
 
     def extract_summary_advanced(self) -> Optional[str]: #
         summary_keywords = ['summary', 'professional summary', 'objective', 'profile', 'about me', 'career objective', 'overview', 'professional profile'] #
-        if DEBUG_FIND_SECTION: print("DEBUG_MAIN_EXTRACTION: Attempting to extract summary...") #
+        SECTION_LOG.debug("Attempting to extract summary...") #
         summary_section_doc = self.find_section(summary_keywords) #
         if summary_section_doc and summary_section_doc.text.strip(): #
             summary_text = summary_section_doc.text.strip() #
@@ -412,24 +492,26 @@ class AdvancedResumeParser: #
         return None #
 
     def extract_skills_advanced(self, doc: spacy.tokens.Doc) -> Dict[str, Any]: #
-        if DEBUG_FIND_SECTION: print("DEBUG_MAIN_EXTRACTION: Attempting to extract skills...") #
+        SECTION_LOG.debug("Attempting to extract skills...") #
         skills_found_global: Dict[str, List[str]] = defaultdict(list) #
         skill_contexts: List[Dict[str,str]] = [] # Store skill and its context #
 
         # 1. Extract skills from the entire document using PhraseMatcher
         if doc and doc.text.strip(): #
             matches = self.phrase_matcher(doc) #
-            # Filter overlapping spans, keeping the longest ones
-            filtered_matches = filter_spans([doc[s:e] for _, s, e in matches]) #
+            # Filter overlapping spans, keeping the longest ones; the label is the matched skill's id
+            filtered_matches = filter_spans([Span(doc, s, e, label=match_id) for match_id, s, e in matches]) #
+            doc_text = doc.text # Doc.text rebuilds the string on every access #
             for span in filtered_matches: #
-                skill_text_original = span.text; skill_text_lower = skill_text_original.lower() #
-                category = self.categorize_skill(skill_text_lower) #
-                if skill_text_lower not in [s.lower() for s in skills_found_global[category]]: # Avoid duplicates within category #
-                    skills_found_global[category].append(skill_text_original) #
+                matched_skills = self.skill_ontology.with_implied(span.label_) # Canonical skills, whatever alias or casing the resume used #
+                for skill in matched_skills: #
+                    if skill.name.lower() not in [s.lower() for s in skills_found_global[skill.category]]: # Avoid duplicates within category #
+                        skills_found_global[skill.category].append(skill.name) #
                 
-                # Capture context around the skill
-                context_start = max(0, span.start_char - 60); context_end = min(len(doc.text), span.end_char + 60) #
-                skill_contexts.append({'skill': skill_text_original, 'category': category, 'context': doc.text[context_start:context_end].replace("\n", " ")}) #
+                # Capture context around the skill (only the first 20 are returned)
+                if len(skill_contexts) < 20: #
+                    context_start = max(0, span.start_char - 60); context_end = min(len(doc_text), span.end_char + 60) #
+                    skill_contexts.append({'skill': matched_skills[0].name, 'category': matched_skills[0].category, 'context': doc_text[context_start:context_end].replace("\n", " ")}) #
 
         # 2. Extract skills specifically from a "Skills" section (if found)
         skills_section_doc = self.find_section(['skills', 'technical skills', 'competencies', 'technologies', 'technical proficiency', 'key skills']) #
@@ -450,9 +532,9 @@ class AdvancedResumeParser: #
         skills: Dict[str, List[str]] = defaultdict(list) #
         # Use PhraseMatcher on the dedicated skills section
         matches_in_section = self.phrase_matcher(section_doc) #
-        for _, start, end in matches_in_section: #
-            skill_text = section_doc[start:end].text; cat = self.categorize_skill(skill_text.lower()) #
-            if skill_text.lower() not in [s.lower() for s in skills[cat]]: skills[cat].append(skill_text) #
+        for match_id, start, end in matches_in_section: #
+            for skill in self._matched_skills(section_doc, match_id): #
+                if skill.name.lower() not in [s.lower() for s in skills[skill.category]]: skills[skill.category].append(skill.name) #
 
         # Fallback: If PhraseMatcher finds few skills, try line-based splitting and categorization
         # This helps with comma-separated lists or skills not perfectly in the phrase_matcher's DB
@@ -492,7 +574,7 @@ class AdvancedResumeParser: #
         return best_category #
 
     def extract_experience_advanced(self) -> List[Dict[str, Any]]: #
-        if DEBUG_FIND_SECTION: print("DEBUG_MAIN_EXTRACTION: Attempting to extract experience...") #
+        SECTION_LOG.debug("Attempting to extract experience...") #
         experiences: List[Dict[str, Any]] = [] #
         experience_section_doc = self.find_section(['experience', 'work experience', 'professional experience', 'employment history', 'internship experience', 'internships', 'work history', 'career summary', 'career progression']) #
         
@@ -501,18 +583,15 @@ class AdvancedResumeParser: #
         job_entries_docs = self.split_experience_entries(experience_section_doc) #
         
         for i, entry_doc in enumerate(job_entries_docs): #
+            if self.parse_budget.exhausted: self.parse_budget.note_truncated('experience'); break #
             if not entry_doc or not entry_doc.text.strip(): continue #
-            if DEBUG_FIND_SECTION: print(f"DEBUG_EXPERIENCE_ENTRY: Parsing job entry {i+1} text: '''{entry_doc.text[:100].strip()}...'''") #
+            SECTION_LOG.debug("Parsing job entry %s text: '''%s...'''", i+1, entry_doc.text[:100].strip()) #
             job_info = self.parse_job_entry_advanced(entry_doc) #
             if job_info and (job_info.get('position') or job_info.get('company')): # Must have at least position or company #
                 experiences.append(job_info) #
         
         if experiences: # Sort by end date (descending), with "Present" being the most recent #
-            try:
-                experiences.sort(key=lambda x: (date_parser.parse(x['end_date'], fuzzy=True, default=date_parser.parse("1900-01-01")) if x.get('end_date') and x['end_date'].lower() != "present" else date_parser.parse("2999-12-31")), reverse=True) #
-            except (date_parser.ParserError, TypeError): # Handle potential parsing errors or None values #
-                if DEBUG_FIND_SECTION: print("DEBUG_EXPERIENCE: Could not sort experience entries by date due to parsing error or None dates.") #
-                pass # Keep unsorted if dates are problematic #
+            experiences.sort(key=lambda x: date_sort_key(x.get('end_date')), reverse=True) # end_date is already normalized #
         return experiences #
 
     def split_experience_entries(self, experience_section_doc: spacy.tokens.Doc) -> List[spacy.tokens.Doc]: #
@@ -521,18 +600,20 @@ class AdvancedResumeParser: #
         # Regex for common date line patterns (e.g., "Month YYYY - Month YYYY", "YYYY - Present")
         date_line_pattern = r'\b(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+)?(?:19|20)\d{2}\s*[-–to]+\s*(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+)?(?:19|20)\d{2}|Present|Current|Till Date\b'
         year_pattern = r'\b(19|20)\d{2}\b' #
+        line_mentions_title = self.job_title_recognizer.mentions_title_many(lines) #
 
         for i, line_text_orig in enumerate(lines): #
+            if self.parse_budget.exhausted: self.parse_budget.note_truncated('experience'); break #
             line_text = line_text_orig.strip() #
             if not line_text: # Blank line often separates entries #
                 if current_entry_lines: # If we have content, process it as an entry #
                     entry_text_block = self._apply_nlp_preprocessing("\n".join(current_entry_lines).strip()) #
                     if entry_text_block: #
-                        if DEBUG_NLP_CALLS: print(f"NLP_CALL_SPLIT_EXP_START: Processing experience entry block ({len(entry_text_block)} chars): '''{entry_text_block[:100]}...'''") #
+                        NLP_LOG.debug("NLP_CALL_SPLIT_EXP_START: Processing experience entry block (%s chars): '''%s...'''", len(entry_text_block), entry_text_block[:100]) #
                         try:
                             entries_docs.append(self.nlp(entry_text_block)) #
-                            if DEBUG_NLP_CALLS: print(f"NLP_CALL_SPLIT_EXP_END: Completed experience entry block.") #
-                        except Exception as e: print(f"ERROR during NLP in split_experience_entries: {e}") #
+                            NLP_LOG.debug("NLP_CALL_SPLIT_EXP_END: Completed experience entry block.") #
+                        except Exception as e: NLP_LOG.error("Error during NLP in split_experience_entries: %s", e) #
                     current_entry_lines = [] #
                 continue # Move to next line #
 
@@ -543,11 +624,11 @@ class AdvancedResumeParser: #
 
                 if not is_bullet and line_is_short_cap: # Potential new job title or company line #
                     # Check if it looks like a job title
-                    if any(jt.lower() in line_text.lower() for jt in self.job_titles): #
+                    if line_mentions_title[i]: #
                         starts_new_entry = True #
                     # Check if it looks like a company name (and previous line was a bullet or long)
                     elif re.search(r'\b(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Solutions|Technologies|Consulting|Group|Limited|University|College|School|Institute|Pvt)\b', line_text, re.IGNORECASE) or \
-                         (len(line_text.split()) <=4 and line_text.istitle() and not any(jt.lower() in line_text.lower() for jt in self.job_titles)): # Likely a company name #
+                         (len(line_text.split()) <=4 and line_text.istitle() and not line_mentions_title[i]): # Likely a company name #
                          if i > 0 and (lines[i-1].strip().startswith(('-', '•', '*', '+', '➢')) or len(lines[i-1].strip().split()) > 6 or not lines[i-1].strip()): # If previous line was descriptive or blank #
                              starts_new_entry = True #
                 
@@ -564,11 +645,11 @@ class AdvancedResumeParser: #
             if starts_new_entry and current_entry_lines: #
                 entry_text_block = self._apply_nlp_preprocessing("\n".join(current_entry_lines).strip()) #
                 if entry_text_block: #
-                    if DEBUG_NLP_CALLS: print(f"NLP_CALL_SPLIT_EXP_START: Processing experience entry block (split) ({len(entry_text_block)} chars): '''{entry_text_block[:100]}...'''") #
+                    NLP_LOG.debug("NLP_CALL_SPLIT_EXP_START: Processing experience entry block (split) (%s chars): '''%s...'''", len(entry_text_block), entry_text_block[:100]) #
                     try:
                         entries_docs.append(self.nlp(entry_text_block)) #
-                        if DEBUG_NLP_CALLS: print(f"NLP_CALL_SPLIT_EXP_END: Completed experience entry block (split).") #
-                    except Exception as e: print(f"ERROR during NLP in split_experience_entries (split): {e}") #
+                        NLP_LOG.debug("NLP_CALL_SPLIT_EXP_END: Completed experience entry block (split).") #
+                    except Exception as e: NLP_LOG.error("Error during NLP in split_experience_entries (split): %s", e) #
                 current_entry_lines = [line_text_orig] # Start new entry with current line #
             else:
                 current_entry_lines.append(line_text_orig) #
@@ -577,11 +658,11 @@ class AdvancedResumeParser: #
         if current_entry_lines: #
             entry_text_block = self._apply_nlp_preprocessing("\n".join(current_entry_lines).strip()) #
             if entry_text_block: #
-                if DEBUG_NLP_CALLS: print(f"NLP_CALL_SPLIT_EXP_START: Processing final experience entry block ({len(entry_text_block)} chars): '''{entry_text_block[:100]}...'''") #
+                NLP_LOG.debug("NLP_CALL_SPLIT_EXP_START: Processing final experience entry block (%s chars): '''%s...'''", len(entry_text_block), entry_text_block[:100]) #
                 try:
                     entries_docs.append(self.nlp(entry_text_block)) #
-                    if DEBUG_NLP_CALLS: print(f"NLP_CALL_SPLIT_EXP_END: Completed final experience entry block.") #
-                except Exception as e: print(f"ERROR during NLP in split_experience_entries (final): {e}") #
+                    NLP_LOG.debug("NLP_CALL_SPLIT_EXP_END: Completed final experience entry block.") #
+                except Exception as e: NLP_LOG.error("Error during NLP in split_experience_entries (final): %s", e) #
         return entries_docs #
 
     def parse_job_entry_advanced(self, entry_doc: spacy.tokens.Doc) -> Optional[Dict[str, Any]]: #
@@ -606,7 +687,7 @@ class AdvancedResumeParser: #
                 company_match = re.match(r"((?:[A-Z][\w.&'-]+(?:\s+|$)){1,4})", company_candidate_text) # Up to 4 capitalized words #
                 if company_match and len(company_match.group(1).strip().split()) <=4 : #
                     potential_companies.append(company_match.group(1).strip()) #
-            elif (first_line_of_entry.istitle() or first_line_of_entry.isupper()) and not any(jt.lower() in first_line_of_entry.lower() for jt in self.job_titles): #
+            elif (first_line_of_entry.istitle() or first_line_of_entry.isupper()) and not self.job_title_recognizer.mentions_title(first_line_of_entry): #
                  if 0 < len(first_line_of_entry.split()) <= 4 and first_line_of_entry.lower() not in self.non_name_keywords: #
                      potential_companies.append(first_line_of_entry) #
         
@@ -619,13 +700,13 @@ class AdvancedResumeParser: #
             if job_info['position']: line_for_loc = re.sub(re.escape(job_info['position']), '', line_for_loc, flags=re.IGNORECASE, count=1) #
             if job_info['company']: line_for_loc = re.sub(re.escape(job_info['company']), '', line_for_loc, flags=re.IGNORECASE, count=1) #
             loc_candidate = line_for_loc.strip(' ,|-@at').strip() #
-            if loc_candidate and 0 < len(loc_candidate.split()) <= 3 and not any(kw.lower() in loc_candidate.lower() for kw in self.non_location_keywords): job_info['location'] = loc_candidate #
+            if loc_candidate and 0 < len(loc_candidate.split()) <= 3 and not self._is_non_location(loc_candidate): job_info['location'] = loc_candidate #
         
         if not job_info['location']: # Fallback to NER for location if not found on first line #
             for ent in entry_doc.ents: #
                 if ent.label_ in ["GPE", "LOC"] and not job_info['location']: #
                     loc_text = ent.text.strip() #
-                    if 2 < len(loc_text) < 25 and len(loc_text.split()) <= 3 and not any(kw.lower() in loc_text.lower() for kw in self.non_location_keywords): #
+                    if 2 < len(loc_text) < 25 and len(loc_text.split()) <= 3 and not self._is_non_location(loc_text): #
                         job_info['location'] = loc_text; break #
         
         # Date extraction
@@ -635,7 +716,7 @@ class AdvancedResumeParser: #
         else: # Fallback if specific range pattern not found #
             date_texts = [entry_doc[s:e].text for _,s,e in self.matcher(entry_doc) if "DATE_PATTERN" in self.nlp.vocab.strings[_]] or [ent.text for ent in entry_doc.ents if ent.label_ == "DATE"] #
             if date_texts: #
-                parsed_dates = sorted(list(set(d for d in [self.parse_date_entity(dt) for dt in date_texts] if d))) #
+                parsed_dates = sorted(set(d for d in normalize_dates(date_texts) if d)) #
                 if len(parsed_dates) >= 2: job_info['start_date'], job_info['end_date'], job_info['duration_text'] = parsed_dates[0], parsed_dates[-1], f"{parsed_dates[0]} - {parsed_dates[-1]}" #
                 elif len(parsed_dates) == 1: #
                     job_info['start_date'] = parsed_dates[0]; job_info['duration_text'] = parsed_dates[0] #
@@ -669,78 +750,65 @@ class AdvancedResumeParser: #
         text_for_skills_in_job = (job_info['position'] or "") + "\n" + "\n".join(job_info['description']) + "\n" + "\n".join(job_info['achievements']) #
         if text_for_skills_in_job.strip(): #
             cleaned_text_for_skills = self._apply_nlp_preprocessing(text_for_skills_in_job) #
-            if DEBUG_NLP_CALLS: print(f"NLP_CALL_JOB_SKILLS_START: Processing skills text for job '{job_info['position'] if job_info['position'] else 'Unknown'}' ({len(cleaned_text_for_skills)} chars). Snippet: '''{cleaned_text_for_skills[:100].replace(chr(10), ' ')}...'''") #
+            NLP_LOG.debug("NLP_CALL_JOB_SKILLS_START: Processing skills text for job '%s' (%s chars). Snippet: '''%s...'''", job_info['position'] if job_info['position'] else 'Unknown', len(cleaned_text_for_skills), cleaned_text_for_skills[:100].replace(chr(10), ' ')) #
             try:
                 job_skills_doc = self.nlp(cleaned_text_for_skills) #
-                if DEBUG_NLP_CALLS: print(f"NLP_CALL_JOB_SKILLS_END: Completed skills text for job '{job_info['position'] if job_info['position'] else 'Unknown'}'.") #
-                for _,s,e in self.phrase_matcher(job_skills_doc): #
+                NLP_LOG.debug("NLP_CALL_JOB_SKILLS_END: Completed skills text for job '%s'.", job_info['position'] if job_info['position'] else 'Unknown') #
+                for match_id,s,e in self.phrase_matcher(job_skills_doc): #
                     tech_text = job_skills_doc[s:e].text #
                     # Avoid adding parts of position/company as tech unless it's a clear tech skill
                     is_in_header = (job_info['position'] and tech_text.lower() in job_info['position'].lower()) or \
                                    (job_info['company'] and tech_text.lower() in job_info['company'].lower()) #
                     if not is_in_header or self.categorize_skill(tech_text.lower()) != 'other': # If it's a known skill category, allow it even if in header #
-                        entry_techs.add(tech_text.lower()) #
+                        entry_techs.update(skill.name.lower() for skill in self._matched_skills(job_skills_doc, match_id)) #
             except Exception as e: #
-                if DEBUG_NLP_CALLS: print(f"ERROR in NLP_CALL_JOB_SKILLS: {e}") #
+                NLP_LOG.error("Error in NLP_CALL_JOB_SKILLS: %s", e) #
         job_info['technologies_used'] = sorted(list(entry_techs)) #
         return job_info #
 
     def extract_job_title(self, doc_entry: spacy.tokens.Doc) -> Optional[str]: #
         if not doc_entry or not doc_entry.text.strip(): return None #
         lines_to_check = doc_entry.text.split('\n')[:2]; text_to_search_in = "\n".join(lines_to_check) #
-        if DEBUG_JOB_TITLE: print(f"DEBUG_JOB_TITLE: Text for title extraction: '''{text_to_search_in}'''") #
-        
-        sorted_job_titles = sorted(self.job_titles, key=len, reverse=True) # Prioritize longer, more specific titles #
-        for title_keyword_idx, title_keyword in enumerate(sorted_job_titles): #
-            prefix_pattern = r"(?:[A-Z][a-z]+(?:[- ](?:of|and|&|for))?\s+){0,2}" #
-            suffix_pattern = r"(?:\s+(?:[A-Z][a-zA-Z0-9.&-]*|[IVXLCDM]+)){0,2}(?:\s*\([\w\s.&-]+\))?" #
-            pattern_str = r"\b(" + prefix_pattern + re.escape(title_keyword) + suffix_pattern + r")\b" #
-            
-            if DEBUG_JOB_TITLE and title_keyword_idx < 5 : print(f"  Trying title pattern for '{title_keyword}': {pattern_str[:100]}...") #
-            try:
-                match = re.search(pattern_str, text_to_search_in, re.IGNORECASE) #
-                if match: #
-                    candidate = match.group(1).strip(" .,|-") #
-                    if DEBUG_JOB_TITLE: print(f"    Regex candidate: '{candidate}' from keyword '{title_keyword}'") #
-                    # Basic validation for the candidate
-                    if 2 < len(candidate) < 70 and len(candidate.split()) <= 7 and \
-                       candidate.lower() not in self.non_name_keywords and \
-                       candidate.lower() not in ['experience', 'education', 'skills', 'project', 'summary', 'objective', 'company', 'location', 'date', 'duration', 'role', 'profile', 'responsibilities', 'achievements', 'description']: #
-                        # Check if it's an ORG entity (less likely to be a title unless it's a common job word)
-                        is_org_entity = any(ent.text.strip().lower() == candidate.lower() and ent.label_ == "ORG" for ent in doc_entry.ents) #
-                        is_common_title_word = any(common_jt.lower() in candidate.lower() for common_jt in ["manager", "director", "lead", "engineer", "developer", "analyst", "consultant", "specialist", "intern", "trainee", "architect"]) #
-                        if not is_org_entity or is_common_title_word: # If not an ORG or contains common job term #
-                            if DEBUG_JOB_TITLE: print(f"  RETURNING job title (regex match): '{candidate}'") #
-                            return candidate #
-            except re.error as e_re: #
-                if DEBUG_JOB_TITLE: print(f"    Regex error for {title_keyword}: {e_re}") #
-                continue #
+        JOB_TITLE_LOG.debug("Text for title extraction: '''%s'''", text_to_search_in) #
+        
+        for title_keyword, candidate in self.job_title_recognizer.candidates(text_to_search_in): # Longer, more specific titles first #
+            JOB_TITLE_LOG.debug("Regex candidate: '%s' from keyword '%s'", candidate, title_keyword) #
+            # Basic validation for the candidate
+            if 2 < len(candidate) < 70 and len(candidate.split()) <= 7 and \
+               candidate.lower() not in self.non_name_keywords and \
+               candidate.lower() not in ['experience', 'education', 'skills', 'project', 'summary', 'objective', 'company', 'location', 'date', 'duration', 'role', 'profile', 'responsibilities', 'achievements', 'description']: #
+                # Check if it's an ORG entity (less likely to be a title unless it's a common job word)
+                is_org_entity = any(ent.text.strip().lower() == candidate.lower() and ent.label_ == "ORG" for ent in doc_entry.ents) #
+                is_common_title_word = any(common_jt.lower() in candidate.lower() for common_jt in ["manager", "director", "lead", "engineer", "developer", "analyst", "consultant", "specialist", "intern", "trainee", "architect"]) #
+                if not is_org_entity or is_common_title_word: # If not an ORG or contains common job term #
+                    JOB_TITLE_LOG.debug("RETURNING job title (regex match): '%s'", candidate) #
+                    return candidate #
         
         # Fallback to noun chunks if regex fails
         first_line = lines_to_check[0].strip() if lines_to_check else "" #
         if 0 < len(first_line.split()) < 10: #
             cleaned_first_line = self._apply_nlp_preprocessing(first_line) #
-            if DEBUG_NLP_CALLS: print(f"NLP_CALL_JOB_TITLE_FALLBACK_START: Processing first line for title: '''{cleaned_first_line}'''") #
+            NLP_LOG.debug("NLP_CALL_JOB_TITLE_FALLBACK_START: Processing first line for title: '''%s'''", cleaned_first_line) #
             try:
                 first_line_doc = self.nlp(cleaned_first_line) #
-                if DEBUG_NLP_CALLS: print("NLP_CALL_JOB_TITLE_FALLBACK_END: Completed first line.") #
+                NLP_LOG.debug("NLP_CALL_JOB_TITLE_FALLBACK_END: Completed first line.") #
                 for chunk in first_line_doc.noun_chunks: #
                     # Check if noun chunk is near the beginning and contains job-like terms
                     if chunk.start_char < 20 and len(chunk.text.split()) <= 5 and any(jt_part.lower() in chunk.text.lower() for jt_part in ['engineer', 'developer', 'analyst', 'manager', 'specialist', 'intern', 'trainee', 'lead']): #
                         # Avoid if it's identified as an ORG by NER
                         if not any(ent.text.strip().lower() == chunk.text.lower() and ent.label_ == "ORG" for ent in doc_entry.ents): #
-                             if DEBUG_JOB_TITLE: print(f"  RETURNING job title (noun chunk fallback): '{chunk.text.strip()}'") #
+                             JOB_TITLE_LOG.debug("RETURNING job title (noun chunk fallback): '%s'", chunk.text.strip()) #
                              return chunk.text.strip() #
             except Exception as e: #
-                 if DEBUG_NLP_CALLS: print(f"ERROR in NLP_CALL_JOB_TITLE_FALLBACK: {e}") #
+                 NLP_LOG.error("Error in NLP_CALL_JOB_TITLE_FALLBACK: %s", e) #
         
         # Simplest fallback: if the first line is short, title-cased, and not a known non-title keyword
         if 1 < len(first_line.split()) <= 4 and first_line.istitle(): #
             if first_line.lower() not in self.non_name_keywords and not any(jt_part.lower() in first_line.lower() for jt_part in self.job_titles[:5]): # Avoid very common job titles here if already missed #
                 if not any(ent.text.strip().lower() == first_line.lower() and ent.label_ == "ORG" for ent in doc_entry.ents): #
-                    if DEBUG_JOB_TITLE: print(f"  RETURNING job title (simple first line fallback): '{first_line}'") #
+                    JOB_TITLE_LOG.debug("RETURNING job title (simple first line fallback): '%s'", first_line) #
                     return first_line #
-        if DEBUG_JOB_TITLE: print(f"  No job title found by extract_job_title for: '''{text_to_search_in[:100].strip()}...'''") #
+        JOB_TITLE_LOG.debug("No job title found by extract_job_title for: '''%s...'''", text_to_search_in[:100].strip()) #
         return None #
     
     def _looks_like_new_education_entry(self, line_text_lower: str) -> bool: #
@@ -758,7 +826,7 @@ class AdvancedResumeParser: #
         return False #
 
     def extract_education_advanced(self) -> List[Dict[str, Any]]: #
-        if DEBUG_FIND_SECTION: print("DEBUG_MAIN_EXTRACTION: Attempting to extract education...") #
+        SECTION_LOG.debug("Attempting to extract education...") #
         education_entries: List[Dict[str, Any]] = [] #
         education_section_doc = self.find_section(['education', 'academic background', 'qualifications', 'academic qualifications', 'scholastics', 'education background']) #
         
@@ -767,6 +835,7 @@ class AdvancedResumeParser: #
         entry_texts_blocks: List[str] = []; current_entry_lines: List[str] = []; lines = education_section_doc.text.split('\n') #
         
         for i, line_content in enumerate(lines): #
+            if self.parse_budget.exhausted: self.parse_budget.note_truncated('education'); break #
             line = line_content.strip() #
             if not line: # Blank line usually separates entries #
                 if current_entry_lines: entry_texts_blocks.append("\n".join(current_entry_lines)); current_entry_lines = [] #
@@ -796,17 +865,18 @@ class AdvancedResumeParser: #
         if current_entry_lines: entry_texts_blocks.append("\n".join(current_entry_lines)) # Add the last entry #
 
         for entry_text in entry_texts_blocks: #
+            if self.parse_budget.exhausted: self.parse_budget.note_truncated('education'); break #
             entry_text_stripped = self._apply_nlp_preprocessing(entry_text.strip()) #
             if entry_text_stripped and len(entry_text_stripped.split()) > 1: # Basic check for meaningful content #
-                if DEBUG_NLP_CALLS: print(f"NLP_CALL_EDU_ENTRY_START: Processing education entry block ({len(entry_text_stripped)} chars): '''{entry_text_stripped[:100]}...'''") #
+                NLP_LOG.debug("NLP_CALL_EDU_ENTRY_START: Processing education entry block (%s chars): '''%s...'''", len(entry_text_stripped), entry_text_stripped[:100]) #
                 try:
                     entry_doc_for_parsing = self.nlp(entry_text_stripped) #
-                    if DEBUG_NLP_CALLS: print(f"NLP_CALL_EDU_ENTRY_END: Completed education entry block.") #
+                    NLP_LOG.debug("NLP_CALL_EDU_ENTRY_END: Completed education entry block.") #
                     parsed_entry = self.parse_single_education_entry(entry_doc_for_parsing) #
                     if parsed_entry.get('degree') or parsed_entry.get('institution'): # Must have degree or institution #
                         education_entries.append(parsed_entry) #
                 except Exception as e: #
-                    if DEBUG_NLP_CALLS: print(f"ERROR in NLP_CALL_EDU_ENTRY: {e}") #
+                    NLP_LOG.error("Error in NLP_CALL_EDU_ENTRY: %s", e) #
         return education_entries #
 
     def parse_single_education_entry(self, entry_doc: spacy.tokens.Doc) -> Dict[str, Any]: #
@@ -858,7 +928,7 @@ class AdvancedResumeParser: #
                         edu_info['institution'] = ent.text.strip() #
             elif ent.label_ in ["GPE", "LOC"] and not edu_info['location']: #
                 loc_text = ent.text.strip() #
-                if 2 < len(loc_text) < 25 and len(loc_text.split()) <= 3 and not any(kw.lower() in loc_text.lower() for kw in self.non_location_keywords): #
+                if 2 < len(loc_text) < 25 and len(loc_text.split()) <= 3 and not self._is_non_location(loc_text): #
                     edu_info['location'] = loc_text #
             elif ent.label_ == "DATE" and not edu_info['graduation_date']: #
                 edu_info['graduation_date'] = self.parse_date_entity(ent.text) #
@@ -877,12 +947,13 @@ class AdvancedResumeParser: #
         return edu_info #
 
     def extract_certifications_advanced(self) -> List[Dict[str, Any]]: #
-        if DEBUG_FIND_SECTION: print("DEBUG_MAIN_EXTRACTION: Attempting to extract certifications...") #
+        SECTION_LOG.debug("Attempting to extract certifications...") #
         certs: List[Dict[str, Any]] = [] #
         section_doc = self.find_section(['certifications', 'certificates', 'credentials', 'licenses', 'training', 'courses', 'online courses', 'professional development']) #
         if not section_doc or not section_doc.text.strip(): return certs #
 
         for line_text_orig in section_doc.text.split('\n'): #
+            if self.parse_budget.exhausted: self.parse_budget.note_truncated('certifications'); break #
             line_text = line_text_orig.strip() #
             if not line_text or len(line_text) < 5: continue # Skip very short lines #
 
@@ -891,10 +962,10 @@ class AdvancedResumeParser: #
             
             # Use NLP on the line to find ORG (issuer) and DATE
             cleaned_line_for_nlp = self._apply_nlp_preprocessing(line_text) #
-            if DEBUG_NLP_CALLS: print(f"NLP_CALL_CERT_LINE_START: Processing cert line ({len(cleaned_line_for_nlp)} chars): '''{cleaned_line_for_nlp[:100]}...'''") #
+            NLP_LOG.debug("NLP_CALL_CERT_LINE_START: Processing cert line (%s chars): '''%s...'''", len(cleaned_line_for_nlp), cleaned_line_for_nlp[:100]) #
             try:
                 line_doc_for_cert = self.nlp(cleaned_line_for_nlp) #
-                if DEBUG_NLP_CALLS: print(f"NLP_CALL_CERT_LINE_END: Completed cert line.") #
+                NLP_LOG.debug("NLP_CALL_CERT_LINE_END: Completed cert line.") #
                 found_org_ner, found_date_ner = None, None #
                 for ent in line_doc_for_cert.ents: #
                     if ent.label_ == "ORG" and not found_org_ner: #
@@ -905,7 +976,7 @@ class AdvancedResumeParser: #
                         found_date_ner = self.parse_date_entity(ent.text) #
                 cert_info['issuer'] = found_org_ner; cert_info['date'] = found_date_ner #
             except Exception as e: #
-                if DEBUG_NLP_CALLS: print(f"ERROR in NLP_CALL_CERT_LINE: {e}") #
+                NLP_LOG.error("Error in NLP_CALL_CERT_LINE: %s", e) #
 
             # Fallback regex if NER fails for issuer/date
             if not cert_info['issuer']: #
@@ -934,7 +1005,7 @@ class AdvancedResumeParser: #
         return certs #
 
     def extract_languages(self) -> List[Dict[str, Any]]: #
-        if DEBUG_FIND_SECTION: print("DEBUG_MAIN_EXTRACTION: Attempting to extract languages...") #
+        SECTION_LOG.debug("Attempting to extract languages...") #
         langs: List[Dict[str, Any]] = [] #
         section_doc = self.find_section(['languages', 'language skills', 'linguistic proficiency', 'language proficiency']) #
         if not section_doc or not section_doc.text.strip(): return langs #
@@ -943,6 +1014,7 @@ class AdvancedResumeParser: #
         proficiency_levels_db = ['native', 'mother tongue', 'bilingual', 'fluent', 'proficient', 'professional working proficiency', 'full professional proficiency', 'professional', 'conversational', 'intermediate', 'upper intermediate', 'lower intermediate', 'basic', 'beginner', 'advanced', 'working proficiency', 'limited working proficiency', 'elementary proficiency', 'good', 'fair', 'excellent'] #
 
         for line in section_doc.text.split('\n'): #
+            if self.parse_budget.exhausted: self.parse_budget.note_truncated('languages'); break #
             line_text_orig, line_text_lower = line.strip(), line.strip().lower() #
             if not line_text_lower or len(line_text_lower) < 3: continue #
 
@@ -965,7 +1037,7 @@ class AdvancedResumeParser: #
         return langs #
 
     def extract_projects(self) -> List[Dict[str, Any]]: #
-        if DEBUG_FIND_SECTION: print("DEBUG_MAIN_EXTRACTION: Attempting to extract projects...") #
+        SECTION_LOG.debug("Attempting to extract projects...") #
         projects: List[Dict[str, Any]] = [] #
         section_doc = self.find_section(['projects', 'personal projects', 'academic projects', 'portfolio', 'key projects', 'github projects']) #
         if not section_doc or not section_doc.text.strip() : return projects #
@@ -993,14 +1065,14 @@ class AdvancedResumeParser: #
             text_for_project_skills = (project_name if project_name != "Unnamed Project" else "") + "\n" + full_desc_text #
             
             if text_for_project_skills.strip(): #
-                if DEBUG_NLP_CALLS: print(f"NLP_CALL_PROJECT_SKILLS_START: Processing project text ({len(text_for_project_skills)} chars) for '{project_name[:30]}...' : '''{text_for_project_skills[:100]}...'''") #
+                NLP_LOG.debug("NLP_CALL_PROJECT_SKILLS_START: Processing project text (%s chars) for '%s...' : '''%s...'''", len(text_for_project_skills), project_name[:30], text_for_project_skills[:100]) #
                 try:
                     project_skills_doc = self.nlp(self._apply_nlp_preprocessing(text_for_project_skills)) #
-                    if DEBUG_NLP_CALLS: print(f"NLP_CALL_PROJECT_SKILLS_END: Completed project text for '{project_name[:30]}...'.") #
-                    for _,s,e in self.phrase_matcher(project_skills_doc): #
-                        tech_used_in_project.add(project_skills_doc[s:e].text.lower()) #
+                    NLP_LOG.debug("NLP_CALL_PROJECT_SKILLS_END: Completed project text for '%s...'.", project_name[:30]) #
+                    for match_id,_,_ in self.phrase_matcher(project_skills_doc): #
+                        tech_used_in_project.update(skill.name.lower() for skill in self._matched_skills(project_skills_doc, match_id)) #
                 except Exception as e: #
-                    if DEBUG_NLP_CALLS: print(f"ERROR in NLP_CALL_PROJECT_SKILLS: {e}") #
+                    NLP_LOG.error("Error in NLP_CALL_PROJECT_SKILLS: %s", e) #
 
             # Explicitly look for "Tech Stack:" or "Technologies:" lines if NLP missed some
             tech_stack_keywords = ["tech stack:", "technologies used:", "technologies:", "tools:"] #
@@ -1009,19 +1081,19 @@ class AdvancedResumeParser: #
                 for ts_kw in tech_stack_keywords: #
                     if ts_kw in d_line_lower: #
                         tech_text_from_stack = d_line_lower.split(ts_kw, 1)[-1].strip() #
-                        if DEBUG_NLP_CALLS: print(f"NLP_CALL_PROJECT_TECH_STACK_EXPLICIT_START: Processing explicit tech line ({len(tech_text_from_stack)} chars): '''{tech_text_from_stack[:100]}...'''") #
+                        NLP_LOG.debug("NLP_CALL_PROJECT_TECH_STACK_EXPLICIT_START: Processing explicit tech line (%s chars): '''%s...'''", len(tech_text_from_stack), tech_text_from_stack[:100]) #
                         try:
                             tech_doc = self.nlp(self._apply_nlp_preprocessing(tech_text_from_stack)) #
-                            if DEBUG_NLP_CALLS: print(f"NLP_CALL_PROJECT_TECH_STACK_EXPLICIT_END: Completed explicit tech line.") #
-                            for _,s,e in self.phrase_matcher(tech_doc): #
-                                tech_used_in_project.add(tech_doc[s:e].text.lower()) #
+                            NLP_LOG.debug("NLP_CALL_PROJECT_TECH_STACK_EXPLICIT_END: Completed explicit tech line.") #
+                            for match_id,_,_ in self.phrase_matcher(tech_doc): #
+                                tech_used_in_project.update(skill.name.lower() for skill in self._matched_skills(tech_doc, match_id)) #
                             # Also add comma/slash separated items from this line if PhraseMatcher missed them
                             raw_techs = [t.strip() for t in re.split(r'[,;/]+', tech_text_from_stack) if t.strip() and len(t.strip()) > 1 and len(t.strip()) < 25] #
                             for rt in raw_techs: #
                                 if self.categorize_skill(rt) != 'other': tech_used_in_project.add(rt) #
 
                         except Exception as e: #
-                             if DEBUG_NLP_CALLS: print(f"ERROR in NLP_CALL_PROJECT_TECH_STACK_EXPLICIT: {e}") #
+                             NLP_LOG.error("Error in NLP_CALL_PROJECT_TECH_STACK_EXPLICIT: %s", e) #
                         # Once "Tech Stack:" is processed for a line, assume subsequent lines are not part of it unless explicitly stated
                         # This part might need refinement if tech stack spans multiple lines without clear markers.
                         break # Stop checking other tech_stack_keywords for this line #
@@ -1039,6 +1111,7 @@ class AdvancedResumeParser: #
         lines = section_doc.text.split('\n') #
         i=0 #
         while i < len(lines): #
+            if self.parse_budget.exhausted: self.parse_budget.note_truncated('projects'); break #
             line_text = lines[i].strip() #
             i+=1 # Increment here to avoid issues with continue #
             if not line_text: continue #
@@ -1071,12 +1144,13 @@ class AdvancedResumeParser: #
         return projects #
 
     def extract_awards(self) -> List[Dict[str, Any]]: #
-        if DEBUG_FIND_SECTION: print("DEBUG_MAIN_EXTRACTION: Attempting to extract awards...") #
+        SECTION_LOG.debug("Attempting to extract awards...") #
         awards_list: List[Dict[str, Any]] = [] #
         section_doc = self.find_section(['awards', 'honors', 'achievements', 'recognition', 'scholarships', 'accomplishments', 'grants']) #
         if not section_doc or not section_doc.text.strip(): return awards_list #
 
         for line in section_doc.text.split('\n'): #
+            if self.parse_budget.exhausted: self.parse_budget.note_truncated('awards'); break #
             line_text = line.strip() #
             if line_text and len(line_text) > 5: # Basic check for meaningful content #
                 cleaned_line = re.sub(r'^[•\-\*\s]+|[✓❖➢]\s*', '', line_text).strip() # Remove bullets #
@@ -1096,62 +1170,26 @@ class AdvancedResumeParser: #
                     cleaned_line = cleaned_line[:issuer_match.start()].strip(' ,-') # Remove issuer part from name #
                 elif FUZZY_AVAILABLE and process : # Fallback to NER if regex fails #
                     cleaned_line_for_nlp = self._apply_nlp_preprocessing(cleaned_line) # Use the potentially year-stripped line #
-                    if DEBUG_NLP_CALLS: print(f"NLP_CALL_AWARD_LINE_START: Processing award line ({len(cleaned_line_for_nlp)} chars): '''{cleaned_line_for_nlp[:100]}...'''") #
+                    NLP_LOG.debug("NLP_CALL_AWARD_LINE_START: Processing award line (%s chars): '''%s...'''", len(cleaned_line_for_nlp), cleaned_line_for_nlp[:100]) #
                     try:
                         line_doc_for_award = self.nlp(cleaned_line_for_nlp) #
-                        if DEBUG_NLP_CALLS: print(f"NLP_CALL_AWARD_LINE_END: Completed award line.") #
+                        NLP_LOG.debug("NLP_CALL_AWARD_LINE_END: Completed award line.") #
                         for ent in line_doc_for_award.ents: #
                             if ent.label_ == "ORG" and (len(ent.text.split()) > 1 or ent.text.lower() in ['university', 'college', 'school', 'institute', 'foundation', 'society']): # More specific ORG check #
                                 award_info['issuer'] = ent.text; break #
                     except Exception as e: #
-                         if DEBUG_NLP_CALLS: print(f"ERROR in NLP_CALL_AWARD_LINE: {e}") #
+                         NLP_LOG.error("Error in NLP_CALL_AWARD_LINE: %s", e) #
                 
                 award_info['name'] = cleaned_line.strip(',').strip() # Whatever remains is the name #
                 if award_info['name']: awards_list.append(award_info) #
         return awards_list #
     
     def parse_date_entity(self, date_text: str) -> Optional[str]: #
-        date_text_lower = date_text.lower().strip(); date_text_original = date_text.strip() #
-        if any(word in date_text_lower for word in ['present', 'current', 'now', 'today', 'till date']): return 'Present' #
-        try:
-            # Handle YYYY format directly
-            if re.fullmatch(r'(19|20)\d{2}', date_text_lower): return date_text_lower #
-            
-            # Handle "Month YYYY" or "Mon YYYY"
-            month_year_match = re.match(r'(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*)\.?\s*\'?((?:19|20)\d{2})', date_text_lower) #
-            if month_year_match: #
-                try: return date_parser.parse(f"{month_year_match.group(1)} {month_year_match.group(2)}").strftime('%Y-%m') #
-                except: pass # Fall through if specific parse fails #
-
-            # Handle MM/YYYY or MM-YYYY or MM.YYYY
-            mm_yyyy_match = re.match(r'(\d{1,2})[/\s.-]+((?:19|20)\d{2})', date_text_lower) #
-            if mm_yyyy_match: #
-                try: return date_parser.parse(f"{mm_yyyy_match.group(1)}-{mm_yyyy_match.group(2)}").strftime('%Y-%m') #
-                except: pass #
-
-            # General fuzzy parsing as a last resort for structured dates
-            parsed_date = date_parser.parse(date_text_lower, fuzzy=True, default=date_parser.parse("1900-01-01")) #
-            if parsed_date.year != 1900 : # If fuzzy parsing yielded a plausible year #
-                # If only year was likely intended (e.g., "2023" parsed to "2023-01-01" by default)
-                if parsed_date.month == 1 and parsed_date.day == 1 and not (re.search(r'\b(jan|1st|01)\b', date_text_lower)): # No explicit month/day #
-                    year_only_in_text = re.fullmatch(r'(19|20)\d{2}', date_text_original) # Check original text #
-                    if year_only_in_text: return year_only_in_text.group(0) #
-                return parsed_date.strftime('%Y-%m') # Return YYYY-MM #
-            else: # If fuzzy parsing defaulted to 1900, it likely didn't find a good date, try just year #
-                year_only_match = re.search(r'\b(19|20)\d{2}\b', date_text_lower) #
-                if year_only_match: return year_only_match.group(0) #
-        except (ValueError, TypeError, OverflowError): # Catch various parsing errors #
-            pass #
-        
-        # Final fallback: if it's just a year, return that.
-        year_only_match_final = re.search(r'\b(19|20)\d{2}\b', date_text_lower) #
-        if year_only_match_final: return year_only_match_final.group(0) #
-        
-        return date_text_original # Return original if all else fails #
+        return normalize_date(date_text) # 'YYYY', 'YYYY-MM', 'Present' or the original text; see core/date_normalizer.py #
 
     def parse_date_range_text(self, text: str) -> List[str]: #
         parts = re.split(r'\s*[-–to]+\s*', text.strip(), 1) # Split on common range separators #
-        parsed_dates = [self.parse_date_entity(p.strip()) for p in parts if p.strip()] # Parse each part #
+        parsed_dates = normalize_dates(p.strip() for p in parts if p.strip()) # Parse each part #
         return [d for d in parsed_dates if d] # Filter out None results #
 
     def calculate_parsing_confidence(self, parsed_data: Dict[str, Any]) -> float: #
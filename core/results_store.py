@@ -0,0 +1,86 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# Server-side home for search results when MongoDB is unavailable. The browser session only
+# carries an opaque token; the results themselves live here, in a small SQLite file shared by
+# the workers on a host, and expire after RESULTS_STORE_TTL_SECONDS.
+RESULTS_STORE_DB_PATH = os.environ.get('RESULTS_STORE_DB_PATH', os.path.join('instance', 'results_store.sqlite3'))
+RESULTS_STORE_TTL_SECONDS = int(os.environ.get('RESULTS_STORE_TTL_SECONDS', 24 * 60 * 60))
+RESULTS_STORE_PURGE_INTERVAL_SECONDS = 10 * 60 # Expired rows are deleted at most this often, on write
+
+
+class ResultsStore:
+    """SQLite key-value store of JSON values with a per-entry expiry time."""
+    def __init__(self, db_path: str = RESULTS_STORE_DB_PATH, ttl_seconds: int = RESULTS_STORE_TTL_SECONDS):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._last_purge = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    directory = os.path.dirname(self.db_path)
+                    if directory: os.makedirs(directory, exist_ok=True)
+                    conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+                    conn.execute("PRAGMA journal_mode=WAL") # Readers don't block the writer
+                    conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+                    conn.execute("CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)")
+                    self._initialized = True
+                    return conn
+        return sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+
+    def put(self, key: str, value, ttl_seconds: int = None) -> bool:
+        expires_at = time.time() + (ttl_seconds or self.ttl_seconds)
+        try:
+            payload = json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str)
+            conn = self._connect()
+            try:
+                conn.execute("INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)", (key, payload, expires_at))
+                if time.time() - self._last_purge > RESULTS_STORE_PURGE_INTERVAL_SECONDS:
+                    self._last_purge = time.time()
+                    conn.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+            finally:
+                conn.close()
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"WARNING: Could not store results under '{key}': {e}")
+            return False
+
+    def get(self, key: str):
+        """The stored value, or None if the key is unknown or has expired."""
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT value FROM results WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+            finally:
+                conn.close()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            print(f"WARNING: Could not read results for '{key}': {e}")
+            return None
+
+    def delete(self, key: str) -> bool:
+        """Removes the entry. Returns True if there was one."""
+        try:
+            conn = self._connect()
+            try:
+                cursor = conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            finally:
+                conn.close()
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"WARNING: Could not delete results for '{key}': {e}")
+            return False
+
+
+results_store = ResultsStore()
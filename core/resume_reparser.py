@@ -0,0 +1,203 @@
+import os
+import sys
+import time
+import signal
+import argparse
+import multiprocessing
+from collections import deque
+from dotenv import load_dotenv
+
+try:
+    from core.database_manager import (
+        connect_db,
+        iter_search_session_resume_texts,
+        count_search_session_resume_texts,
+        bulk_update_search_session_resume_data,
+        save_job_checkpoint,
+        get_job_checkpoint,
+        clear_job_checkpoint
+    )
+except ImportError: # Allows running this file directly from inside core/
+    from database_manager import (
+        connect_db,
+        iter_search_session_resume_texts,
+        count_search_session_resume_texts,
+        bulk_update_search_session_resume_data,
+        save_job_checkpoint,
+        get_job_checkpoint,
+        clear_job_checkpoint
+    )
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# Re-parses the resume text stored with every personalized search session and writes the new skills
+# and score back, so old sessions pick up parser improvements. Sessions are streamed in `_id` order
+# and fanned out to a pool of worker processes, each holding one parser and tagging its batch with
+# nlp.pipe(). Results are written with one bulk_write per batch, in order, and the last written `_id`
+# is checkpointed, so an interrupted run continues where it stopped.
+REPARSE_BATCH_SIZE = int(os.environ.get("REPARSE_BATCH_SIZE", 32))
+REPARSE_WORKERS = int(os.environ.get("REPARSE_WORKERS", os.cpu_count() or 1))
+REPARSE_MODEL = os.environ.get("REPARSE_MODEL", "en_core_web_sm")
+BATCHES_IN_FLIGHT_PER_WORKER = 2 # Enough queued work to keep every worker busy, without reading ahead of the writes
+
+_stop_requested = False
+_worker_parser = None
+_worker_use_doc_cache = True
+
+
+def _init_worker(model_name: str, use_doc_cache: bool):
+    """Pool initializer. Ctrl+C is left to the parent, which drains the pool and checkpoints."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _load_parser(model_name, use_doc_cache)
+
+def _load_parser(model_name: str, use_doc_cache: bool):
+    """Builds this process's parser once. Offline re-parses are not time-boxed like uploads."""
+    global _worker_parser, _worker_use_doc_cache
+    try:
+        from core.python_resume_parser_v9 import AdvancedResumeParser
+        from core.parse_budget import ParseBudget
+    except ImportError:
+        from python_resume_parser_v9 import AdvancedResumeParser
+        from parse_budget import ParseBudget
+    _worker_parser = AdvancedResumeParser(model_name)
+    _worker_parser.budget_factory = ParseBudget.unlimited
+    _worker_use_doc_cache = use_doc_cache
+
+def reparse_batch(batch: list[dict]) -> list[dict]:
+    """
+    Parses one batch of {'_id', 'raw_text'} in this process. Returns {'_id', 'score', 'extracted_skills'}
+    per session, or {'_id', 'error'} for a resume the parser failed on or only partially parsed (a partial
+    result would overwrite a complete one).
+    """
+    texts = [doc['raw_text'] for doc in batch]
+    try:
+        parsed_batch = _worker_parser.parse_resumes(texts, use_doc_cache=_worker_use_doc_cache)
+    except Exception: # Retry one by one, so a single bad resume doesn't fail the whole batch
+        parsed_batch = None
+    results = []
+    for i, doc in enumerate(batch):
+        try:
+            parsed = parsed_batch[i] if parsed_batch else _worker_parser.parse_resume(doc['raw_text'], use_doc_cache=_worker_use_doc_cache)
+            if parsed.get('metadata', {}).get('partial'):
+                results.append({'_id': doc['_id'], 'error': f"partial parse ({parsed['metadata'].get('parse_budget')})"})
+                continue
+            results.append({'_id': doc['_id'], 'score': parsed.get('metadata', {}).get('resume_score', 0.0),
+                            'extracted_skills': parsed.get('skills', {}).get('all_skills', [])})
+        except Exception as e:
+            results.append({'_id': doc['_id'], 'error': str(e)})
+    return results
+
+
+def _job_name(run: str) -> str:
+    return f"resume_reparse:{run}"
+
+def _format_eta(seconds: float) -> str:
+    if seconds <= 0 or seconds == float('inf'): return "-"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+def run_reparse(run: str = "default", batch_size: int = REPARSE_BATCH_SIZE, workers: int = REPARSE_WORKERS,
+                model_name: str = REPARSE_MODEL, limit: int = None, restart: bool = False, dry_run: bool = False,
+                use_doc_cache: bool = True) -> dict:
+    """
+    Re-parses every stored session after the run's checkpoint. With workers > 1 batches are parsed in a
+    process pool; results are still written (and checkpointed) in `_id` order. Returns the run totals.
+    """
+    job_name = _job_name(run)
+    if restart and not dry_run: clear_job_checkpoint(job_name)
+    checkpoint = {} if restart else get_job_checkpoint(job_name)
+    after_id = checkpoint.get('last_id')
+    totals = {'processed': checkpoint.get('processed', 0), 'failed': checkpoint.get('failed', 0), 'modified': checkpoint.get('modified', 0)}
+    pending = count_search_session_resume_texts(after_id)
+    remaining = min(pending, limit) if limit else pending
+    print(f"Re-parse run '{run}': {remaining} sessions to process"
+          f"{f' (resuming after {after_id})' if after_id is not None else ''}, {workers} worker(s), batches of {batch_size}.")
+
+    # Spawned (not forked) workers: the parent has a MongoClient and the logging thread running
+    pool = multiprocessing.get_context("spawn").Pool(workers, initializer=_init_worker, initargs=(model_name, use_doc_cache)) if workers > 1 else None
+    if pool is None: _load_parser(model_name, use_doc_cache)
+    in_flight = deque()
+    started_at, done_this_run = time.perf_counter(), 0
+
+    def write_results(results: list[dict]):
+        nonlocal done_this_run
+        failed = [r for r in results if 'error' in r]
+        for result in failed: print(f"WARNING: Could not re-parse session {result['_id']}: {result['error']}")
+        if not dry_run:
+            stats = bulk_update_search_session_resume_data([r for r in results if 'error' not in r], parser_run=run)
+            totals['modified'] += stats['modified']
+        totals['processed'] += len(results); totals['failed'] += len(failed)
+        done_this_run += len(results)
+        if not dry_run: save_job_checkpoint(job_name, {'last_id': results[-1]['_id'], 'status': "running", **totals})
+        elapsed = time.perf_counter() - started_at
+        rate = done_this_run / elapsed if elapsed else 0.0
+        print(f"  {done_this_run}/{remaining} sessions  {rate:.1f} docs/s  {totals['failed']} failed  ETA {_format_eta((remaining - done_this_run) / rate if rate else 0)}")
+
+    try:
+        for batch in iter_search_session_resume_texts(after_id, batch_size=batch_size, limit=limit):
+            if _stop_requested: break
+            if pool is None:
+                write_results(reparse_batch(batch))
+                continue
+            in_flight.append(pool.apply_async(reparse_batch, (batch,)))
+            if len(in_flight) >= workers * BATCHES_IN_FLIGHT_PER_WORKER: write_results(in_flight.popleft().get())
+        while in_flight: write_results(in_flight.popleft().get())
+    finally:
+        if pool is not None:
+            pool.terminate(); pool.join()
+
+    elapsed = time.perf_counter() - started_at
+    finished = not _stop_requested and done_this_run >= pending
+    if finished and not dry_run: save_job_checkpoint(job_name, {'status': "done", **totals})
+    summary = {**totals, 'this_run': done_this_run, 'seconds': round(elapsed, 1),
+               'docs_per_second': round(done_this_run / elapsed, 2) if elapsed else 0.0, 'finished': finished}
+    print(f"Re-parse run '{run}' {'finished' if finished else 'stopped'}: {summary}")
+    return summary
+
+def print_reparse_status(run: str):
+    checkpoint = get_job_checkpoint(_job_name(run))
+    if not checkpoint:
+        print(f"Re-parse run '{run}' has not started.")
+        return
+    print(f"Re-parse run '{run}': {checkpoint.get('status')}  last _id {checkpoint.get('last_id', '-')}  "
+          f"processed {checkpoint.get('processed', 0)}  failed {checkpoint.get('failed', 0)}  updated {checkpoint.get('updated_at')}")
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-parses the resume text stored with personalized search sessions and updates their skills and score.")
+    parser.add_argument('--run', default="default", help="Run name; its checkpoint is kept separately and written to resume_data.parser_run.")
+    parser.add_argument('--batch-size', type=int, default=REPARSE_BATCH_SIZE, help="Sessions per cursor batch, parse batch and bulk write.")
+    parser.add_argument('--workers', type=int, default=REPARSE_WORKERS, help="Parser processes (default: all cores). 1 parses in this process.")
+    parser.add_argument('--model', default=REPARSE_MODEL, help="spaCy model for the parser.")
+    parser.add_argument('--limit', type=int, help="Stop after this many sessions (e.g. for a trial run).")
+    parser.add_argument('--restart', action='store_true', help="Ignore the run's checkpoint and start from the first session.")
+    parser.add_argument('--dry-run', action='store_true', help="Parse and report throughput without writing results or checkpoints.")
+    parser.add_argument('--no-doc-cache', action='store_true', help="Don't read or write the spaCy DocBin cache.")
+    parser.add_argument('--status', action='store_true', help="Print the run's checkpoint and exit.")
+    args = parser.parse_args(argv)
+
+    try:
+        connect_db()
+    except Exception as e:
+        print(f"CRITICAL: Could not connect to MongoDB ({e}). The re-parse job needs the database.")
+        return 1
+    if args.status:
+        print_reparse_status(args.run)
+        return 0
+
+    def _request_stop(signum, frame):
+        global _stop_requested
+        print(f"Received signal {signum}, stopping after the batches in flight...")
+        _stop_requested = True
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+
+    run_reparse(run=args.run, batch_size=max(1, args.batch_size), workers=max(1, args.workers), model_name=args.model,
+                limit=args.limit, restart=args.restart, dry_run=args.dry_run, use_doc_cache=not args.no_doc_cache)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
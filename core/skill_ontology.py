@@ -0,0 +1,246 @@
+import os
+import sys
+import json
+import mmap
+import pickle
+import hashlib
+import argparse
+import tempfile
+import threading
+import importlib.util
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from dotenv import load_dotenv
+
+# spaCy is imported only where patterns are tokenized or matched: loading the compiled ontology
+# (skill names, aliases, categories) must not pull it into processes that never match text.
+SPACY_AVAILABLE = importlib.util.find_spec("spacy") is not None
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# One skill ontology for the resume parser and the job scraper: canonical skill IDs, display names,
+# aliases ("postgres" -> postgresql, "k8s" -> kubernetes) and categories, kept in skill_ontology.json
+# next to this file. `python -m core.skill_ontology build` compiles it into a pickle holding the skills,
+# the alias map and every pattern already tokenized for the PhraseMatcher; both sides memory-map that
+# artifact at startup instead of parsing and tokenizing the vocabulary again. A missing artifact, or one
+# built from a different version of the JSON, is rebuilt on first load.
+SKILL_ONTOLOGY_PATH = os.environ.get('SKILL_ONTOLOGY_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_ontology.json'))
+SKILL_ONTOLOGY_ARTIFACT_PATH = os.environ.get('SKILL_ONTOLOGY_ARTIFACT_PATH', os.path.join('instance', 'skill_ontology.pkl'))
+ARTIFACT_FORMAT = 2
+PATTERN_LANG = "en" # Patterns are pre-tokenized with this language's tokenizer; other pipelines tokenize them at load
+
+
+@dataclass(slots=True, frozen=True)
+class Skill:
+    id: str # Lowercased canonical name
+    name: str # Display name
+    category: str
+    aliases: Tuple[str, ...] = ()
+    extract: bool = True # False for search terms ("fresher", "entry level") that are never extracted from text
+    implies: Tuple[str, ...] = () # Skill ids a match also counts as ("AWS Certified" -> aws)
+
+    @property
+    def surfaces(self) -> Tuple[str, ...]:
+        return (self.id, *self.aliases) # Lowercase, as the tokens they are matched against
+
+
+class SkillOntology:
+    """Canonical skills with their aliases. Text is matched with a PhraseMatcher over lowercased tokens."""
+    def __init__(self, version: str, categories: List[str], skills: List[Skill], source_sha256: str = "",
+                 patterns: Optional[List[Tuple[str, Tuple[str, ...], Tuple[bool, ...]]]] = None):
+        self.version = version
+        self.categories = categories
+        self.skills = skills
+        self.source_sha256 = source_sha256
+        self.by_id: Dict[str, Skill] = {skill.id: skill for skill in skills}
+        self.alias_map: Dict[str, str] = {surface.lower(): skill.id for skill in skills for surface in (skill.id, *skill.aliases)}
+        self._patterns = patterns # (skill id, words, spaces) per surface, from the compiled artifact
+        self._text_matcher = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_source(cls, data: dict, source_sha256: str = "") -> "SkillOntology":
+        """Validates the JSON ontology: known categories, and no surface form claimed by two skills."""
+        categories = list(data['categories'])
+        skills, seen = [], {}
+        for entry in data['skills']:
+            skill = Skill(id=entry['id'].strip().lower(), name=entry.get('name', entry['id']).strip(), category=entry['category'],
+                          aliases=tuple(alias.strip().lower() for alias in entry.get('aliases', ())), extract=entry.get('extract', True),
+                          implies=tuple(skill_id.strip().lower() for skill_id in entry.get('implies', ())))
+            if skill.category not in categories:
+                raise ValueError(f"Skill '{skill.id}' has unknown category '{skill.category}'.")
+            if skill.name.lower() != skill.id:
+                raise ValueError(f"Skill '{skill.id}' has display name '{skill.name}'; it must differ from the id only in case.")
+            for surface in (skill.id, *skill.aliases):
+                if surface in seen:
+                    raise ValueError(f"'{surface}' is listed for both '{seen[surface]}' and '{skill.id}'.")
+                seen[surface] = skill.id
+            skills.append(skill)
+        known_ids = {skill.id for skill in skills}
+        for skill in skills:
+            unknown = [skill_id for skill_id in skill.implies if skill_id not in known_ids]
+            if unknown: raise ValueError(f"Skill '{skill.id}' implies unknown skills {unknown}.")
+        return cls(str(data.get('version', '')), categories, skills, source_sha256)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def canonical_id(self, skill: str) -> Optional[str]:
+        """Canonical id for a skill or one of its aliases ("Postgres" -> "postgresql"), None if unknown."""
+        return self.alias_map.get(skill.strip().lower()) if isinstance(skill, str) else None
+
+    def canonical_name(self, skill: str) -> str:
+        """Display name for a known skill or alias; unknown skills are returned stripped."""
+        skill_id = self.canonical_id(skill)
+        return self.by_id[skill_id].name if skill_id else skill.strip()
+
+    def with_implied(self, skill_id: str) -> List[Skill]:
+        """The skill for a match id followed by the skills it implies."""
+        skill = self.by_id[skill_id]
+        return [skill, *(self.by_id[implied] for implied in skill.implies)]
+
+    def job_keywords(self) -> List[str]:
+        """Display names in ontology order, as the scraper's keyword list."""
+        return [skill.name for skill in self.skills]
+
+    def skills_by_category(self) -> Dict[str, List[str]]:
+        """{category: surface forms} for the skills extracted from text, in ontology order."""
+        by_category: Dict[str, List[str]] = {category: [] for category in self.categories}
+        for skill in self.skills:
+            if skill.extract: by_category[skill.category].extend(skill.surfaces)
+        return {category: surfaces for category, surfaces in by_category.items() if surfaces}
+
+    def phrase_matcher(self, vocab, lang: str = PATTERN_LANG, make_doc=None):
+        """PhraseMatcher over lowercased tokens with one match id per skill id (vocab.strings[match_id] is the id)."""
+        import spacy
+        from spacy.matcher import PhraseMatcher
+        from spacy.tokens import Doc
+        matcher = PhraseMatcher(vocab, attr="LOWER")
+        docs_by_id: Dict[str, list] = {}
+        if self._patterns is not None and lang == PATTERN_LANG:
+            for skill_id, words, spaces in self._patterns:
+                docs_by_id.setdefault(skill_id, []).append(Doc(vocab, words=list(words), spaces=list(spaces)))
+        else:
+            make_doc = make_doc or spacy.blank(PATTERN_LANG).make_doc
+            for skill in self.skills:
+                if skill.extract: docs_by_id[skill.id] = [make_doc(surface) for surface in skill.surfaces]
+        for skill_id, docs in docs_by_id.items(): matcher.add(skill_id, docs)
+        return matcher
+
+    def extract(self, text: str) -> List[str]:
+        """Display names of the skills (or their aliases) occurring in `text`, sorted. The tokenizer is built on first use."""
+        if not text: return []
+        with self._lock:
+            if self._text_matcher is None:
+                import spacy
+                nlp = spacy.blank(PATTERN_LANG)
+                self._text_matcher = (nlp.make_doc, self.phrase_matcher(nlp.vocab))
+        make_doc, matcher = self._text_matcher
+        doc = make_doc(text)
+        strings = doc.vocab.strings
+        return sorted({skill.name for match_id, _, _ in matcher(doc) for skill in self.with_implied(strings[match_id])})
+
+    def to_artifact(self) -> dict:
+        """Everything needed to rebuild this ontology and its matcher without the JSON or the tokenizer."""
+        import spacy
+        tokenizer = spacy.blank(PATTERN_LANG).tokenizer
+        patterns = []
+        for skill in self.skills:
+            if not skill.extract: continue
+            for surface in skill.surfaces:
+                doc = tokenizer(surface)
+                patterns.append((skill.id, tuple(token.text for token in doc), tuple(bool(token.whitespace_) for token in doc)))
+        return {'format': ARTIFACT_FORMAT, 'source_sha256': self.source_sha256, 'version': self.version, 'categories': self.categories,
+                'skills': [(s.id, s.name, s.category, s.aliases, s.extract, s.implies) for s in self.skills], 'patterns': patterns}
+
+    @classmethod
+    def from_artifact(cls, artifact: dict) -> "SkillOntology":
+        skills = [Skill(*fields) for fields in artifact['skills']]
+        return cls(artifact['version'], artifact['categories'], skills, artifact['source_sha256'], artifact['patterns'])
+
+
+def _read_source(path: str) -> Tuple[bytes, str]:
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return raw, hashlib.sha256(raw).hexdigest()
+
+def _read_artifact(path: str) -> Optional[dict]:
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return pickle.loads(mapped)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError) as e:
+        print(f"WARNING: Could not read skill ontology artifact '{path}': {e}")
+        return None
+
+def build_artifact(source_path: str = SKILL_ONTOLOGY_PATH, artifact_path: str = SKILL_ONTOLOGY_ARTIFACT_PATH) -> SkillOntology:
+    """Compiles the JSON ontology and writes the artifact atomically (temp file + rename)."""
+    raw, source_sha256 = _read_source(source_path)
+    ontology = SkillOntology.from_source(json.loads(raw), source_sha256)
+    artifact = ontology.to_artifact()
+    os.makedirs(os.path.dirname(artifact_path) or '.', exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(artifact_path) or '.', suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, artifact_path)
+    return SkillOntology.from_artifact(artifact)
+
+def load_skill_ontology(source_path: str = SKILL_ONTOLOGY_PATH, artifact_path: str = SKILL_ONTOLOGY_ARTIFACT_PATH) -> SkillOntology:
+    """The compiled ontology if the artifact matches the JSON; otherwise the artifact is rebuilt (or the JSON used directly)."""
+    raw, source_sha256 = _read_source(source_path)
+    artifact = _read_artifact(artifact_path)
+    if artifact and artifact.get('format') == ARTIFACT_FORMAT and artifact.get('source_sha256') == source_sha256:
+        return SkillOntology.from_artifact(artifact)
+    if SPACY_AVAILABLE:
+        print(f"INFO: Skill ontology artifact '{artifact_path}' is missing or outdated. Rebuilding it from '{source_path}'.")
+        try:
+            return build_artifact(source_path, artifact_path)
+        except OSError as e:
+            print(f"WARNING: Could not write skill ontology artifact '{artifact_path}': {e}")
+    return SkillOntology.from_source(json.loads(raw), source_sha256)
+
+
+_default_ontology: SkillOntology | None = None
+_default_lock = threading.Lock()
+
+def get_skill_ontology() -> SkillOntology:
+    """Process-wide ontology, loaded once."""
+    global _default_ontology
+    with _default_lock:
+        if _default_ontology is None: _default_ontology = load_skill_ontology()
+    return _default_ontology
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compiles the skill ontology shared by the resume parser and the job scraper.")
+    parser.add_argument('command', choices=['build', 'status', 'lookup'], help="build: write the artifact; status: check it is current; lookup: resolve skills.")
+    parser.add_argument('skills', nargs='*', help="Skills or aliases to resolve (lookup).")
+    parser.add_argument('--source', default=SKILL_ONTOLOGY_PATH, help="Ontology JSON.")
+    parser.add_argument('--artifact', default=SKILL_ONTOLOGY_ARTIFACT_PATH, help="Compiled artifact path.")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        try:
+            ontology = build_artifact(args.source, args.artifact)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"CRITICAL: Could not build the skill ontology ({e}).")
+            return 1
+        print(f"Built '{args.artifact}': ontology {ontology.version}, {len(ontology)} skills, {len(ontology.alias_map)} surface forms.")
+    elif args.command == 'status':
+        artifact = _read_artifact(args.artifact)
+        current = bool(artifact) and artifact.get('source_sha256') == _read_source(args.source)[1] and artifact.get('format') == ARTIFACT_FORMAT
+        version = f" (ontology {artifact.get('version')})" if artifact else ""
+        print(f"'{args.artifact}': {'current' if current else 'missing or outdated'}{version}.")
+        return 0 if current else 1
+    else:
+        ontology = load_skill_ontology(args.source, args.artifact)
+        for skill in args.skills:
+            skill_id = ontology.canonical_id(skill)
+            print(f"{skill} -> {skill_id} ({ontology.by_id[skill_id].category})" if skill_id else f"{skill} -> unknown")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# Per-source call budgets. `limit` is the number of calls allowed per `window` ("day" or "month",
+# UTC); None means the source has no hard quota. `rate`/`burst` configure the in-process token
+# bucket that spaces out calls (rate = tokens per second).
+def _env_int(name: str, default: int | None) -> int | None:
+    value = os.environ.get(name)
+    if value is None or value == "": return default
+    return None if value.lower() == "none" else int(value)
+
+SOURCE_QUOTAS = {
+    'jsearch': {'limit': _env_int('JSEARCH_QUOTA_LIMIT', 200), 'window': os.environ.get('JSEARCH_QUOTA_WINDOW', 'day'), 'rate': 1.0, 'burst': 3},
+    'adzuna': {'limit': _env_int('ADZUNA_QUOTA_LIMIT', 250), 'window': os.environ.get('ADZUNA_QUOTA_WINDOW', 'day'), 'rate': 1.0, 'burst': 3},
+    'usajobs': {'limit': _env_int('USAJOBS_QUOTA_LIMIT', 500), 'window': os.environ.get('USAJOBS_QUOTA_WINDOW', 'day'), 'rate': 2.0, 'burst': 5},
+    'remotive': {'limit': _env_int('REMOTIVE_QUOTA_LIMIT', None), 'window': 'day', 'rate': 0.5, 'burst': 2},
+    'arbeitnow': {'limit': _env_int('ARBEITNOW_QUOTA_LIMIT', None), 'window': 'day', 'rate': 1.0, 'burst': 3},
+}
+LOW_QUOTA_FRACTION = 0.1 # Below this share of the budget, only high-priority (interactive) calls may spend quota
+QUOTA_DB_PATH = os.environ.get('SOURCE_QUOTA_DB_PATH', os.path.join('instance', 'source_quota.sqlite3'))
+RATE_LIMIT_WAIT_SECONDS = 1.0 # How long a caller may wait for a token before the source is skipped
+RESPONSE_CACHE_FRESH_SECONDS = 15 * 60 # Identical requests within this window are served from cache for free
+RESPONSE_CACHE_STALE_SECONDS = 24 * 60 * 60 # Older cached responses are only served when quota is unavailable
+RESPONSE_CACHE_MAX_ENTRIES = 512
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst` tokens stored."""
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def acquire(self, timeout: float = RATE_LIMIT_WAIT_SECONDS) -> bool:
+        """Waits up to `timeout` seconds for a token. Returns False if none became available."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return True
+                wait = (1.0 - self._tokens) / self.rate if self.rate > 0 else timeout
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class QuotaManager:
+    """
+    Tracks calls per source per quota window in a small SQLite file so the count is shared by all
+    worker processes on a host and survives restarts. Check-and-increment runs in one
+    `BEGIN IMMEDIATE` transaction, so concurrent workers cannot overspend a budget.
+    """
+    def __init__(self, db_path: str = QUOTA_DB_PATH, quotas: dict = None):
+        self.db_path = db_path
+        self.quotas = quotas if quotas is not None else SOURCE_QUOTAS
+        self.buckets = {name: TokenBucket(cfg['rate'], cfg['burst']) for name, cfg in self.quotas.items()}
+        self._denied: dict[str, int] = {name: 0 for name in self.quotas}
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute("CREATE TABLE IF NOT EXISTS quota_usage (source TEXT NOT NULL, window_key TEXT NOT NULL, calls INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (source, window_key))")
+                    self._initialized = True
+        return conn
+
+    @staticmethod
+    def window_key(window: str, now: datetime = None) -> str:
+        now = now or datetime.now(timezone.utc)
+        return now.strftime('%Y-%m') if window == 'month' else now.strftime('%Y-%m-%d')
+
+    def _ensure_dir(self):
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+    def used(self, source: str) -> int:
+        cfg = self.quotas.get(source)
+        if not cfg: return 0
+        try:
+            self._ensure_dir()
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT calls FROM quota_usage WHERE source = ? AND window_key = ?",
+                                   (source, self.window_key(cfg['window']))).fetchone()
+            finally:
+                conn.close()
+            return row[0] if row else 0
+        except sqlite3.Error as e:
+            print(f"WARNING: Could not read quota usage for '{source}': {e}")
+            return 0
+
+    def remaining(self, source: str) -> int | None:
+        """Calls left in the current window, or None if the source has no quota."""
+        cfg = self.quotas.get(source)
+        if not cfg or cfg['limit'] is None: return None
+        return max(0, cfg['limit'] - self.used(source))
+
+    def is_low(self, source: str) -> bool:
+        cfg = self.quotas.get(source)
+        if not cfg or cfg['limit'] is None: return False
+        return self.remaining(source) <= cfg['limit'] * LOW_QUOTA_FRACTION
+
+    def try_consume(self, source: str, priority: str = "high", calls: int = 1) -> bool:
+        """
+        Reserves `calls` from the source's budget. Low-priority callers are refused once the budget
+        drops under LOW_QUOTA_FRACTION, keeping the reserve for interactive searches.
+        """
+        cfg = self.quotas.get(source)
+        if not cfg or cfg['limit'] is None: return True
+        allowed_up_to = cfg['limit'] if priority == "high" else int(cfg['limit'] * (1 - LOW_QUOTA_FRACTION))
+        key = self.window_key(cfg['window'])
+        try:
+            self._ensure_dir()
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT calls FROM quota_usage WHERE source = ? AND window_key = ?", (source, key)).fetchone()
+                current = row[0] if row else 0
+                if current + calls > allowed_up_to:
+                    conn.execute("ROLLBACK")
+                    self._denied[source] = self._denied.get(source, 0) + 1
+                    return False
+                conn.execute("INSERT INTO quota_usage (source, window_key, calls) VALUES (?, ?, ?) "
+                             "ON CONFLICT(source, window_key) DO UPDATE SET calls = calls + excluded.calls", (source, key, calls))
+                conn.execute("COMMIT")
+                return True
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # Never block job search because the counter store is unavailable
+            print(f"WARNING: Quota store unavailable for '{source}', allowing call: {e}")
+            return True
+
+    def acquire(self, source: str, priority: str = "high", wait: float = RATE_LIMIT_WAIT_SECONDS) -> bool:
+        """Rate limit first (cheap, in-process), then spend quota. Returns False if the call must be skipped."""
+        bucket = self.buckets.get(source)
+        if bucket and not bucket.acquire(timeout=wait):
+            self._denied[source] = self._denied.get(source, 0) + 1
+            return False
+        return self.try_consume(source, priority)
+
+    def metrics(self) -> dict:
+        """Remaining-budget metrics per source, suitable for a JSON endpoint or a metrics exporter."""
+        snapshot = {}
+        for source, cfg in self.quotas.items():
+            used = self.used(source)
+            snapshot[source] = {
+                'limit': cfg['limit'],
+                'window': cfg['window'],
+                'window_key': self.window_key(cfg['window']),
+                'used': used,
+                'remaining': None if cfg['limit'] is None else max(0, cfg['limit'] - used),
+                'low': self.is_low(source),
+                'denied_calls_this_process': self._denied.get(source, 0)
+            }
+        return snapshot
+
+
+class ResponseCache:
+    """Small in-process LRU of API responses keyed by source, URL and query params."""
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(source: str, url: str, params: dict = None) -> str:
+        return source + "|" + url + "|" + json.dumps(params or {}, sort_keys=True, default=str)
+
+    def get(self, key: str, max_age: float):
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry: return None
+            stored_at, value = entry
+            if time.time() - stored_at > max_age: return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+quota_manager = QuotaManager()
+response_cache = ResponseCache()
+
+def get_quota_metrics() -> dict:
+    return quota_manager.metrics()
@@ -0,0 +1,145 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import threading
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# Subsystem loggers live under "resume_app" (resume_app.parser.contact, resume_app.parser.nlp, ...).
+# Levels are set per subsystem, e.g. LOG_LEVELS="parser=WARNING,parser.contact=DEBUG", and can be
+# changed at runtime with set_log_levels(). Verbose DEBUG traces can be sampled per document with
+# LOG_TRACE_SAMPLE_RATES="parser=0.05": start_trace_sample() decides once per parse whether that
+# parse's DEBUG records are kept, so a sampled trace is complete rather than every 20th line.
+# Records go through a bounded in-memory queue; a background thread formats and writes them, so
+# callers never format messages or wait on stdout. When the queue is full, records are dropped.
+LOGGER_ROOT = "resume_app"
+DEFAULT_LOG_LEVELS = {"": "INFO", "parser": "WARNING"}
+LOG_LEVELS = os.environ.get("LOG_LEVELS", "")
+LOG_TRACE_SAMPLE_RATES = os.environ.get("LOG_TRACE_SAMPLE_RATES", "")
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text") # "text" or "json" (one JSON object per line)
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+
+_unsampled_traces: ContextVar[frozenset] = ContextVar("log_unsampled_traces", default=frozenset()) # Logger names whose current trace was not sampled
+_sample_rates: dict[str, float] = {}
+_configure_lock = threading.Lock()
+_listener: QueueListener | None = None
+dropped_records = 0
+
+
+def _parse_spec(spec) -> dict[str, str]:
+    """'parser=WARNING,parser.nlp=DEBUG' (or a dict) -> {'parser': 'WARNING', 'parser.nlp': 'DEBUG'}."""
+    if isinstance(spec, dict): return {k: str(v) for k, v in spec.items()}
+    parsed = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            parsed[name.strip()] = value.strip()
+    return parsed
+
+def _logger_name(subsystem: str) -> str:
+    return f"{LOGGER_ROOT}.{subsystem}" if subsystem else LOGGER_ROOT
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"), "level": record.levelname,
+                 "logger": record.name[len(LOGGER_ROOT) + 1:] or LOGGER_ROOT, "msg": record.getMessage()}
+        fields = getattr(record, "fields", None)
+        if fields: entry.update(fields)
+        if record.exc_info: entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread and drops records instead of blocking."""
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        global dropped_records
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            dropped_records += 1
+
+
+class TraceSamplingFilter(logging.Filter):
+    """Drops DEBUG records of a subsystem (and its children) while its current trace is not sampled."""
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG: return True
+        unsampled = _unsampled_traces.get()
+        return not unsampled or not any(record.name == name or record.name.startswith(name + ".") for name in unsampled)
+
+
+def configure_logging(levels=None, sample_rates=None, log_format: str = None) -> logging.Logger:
+    """Installs the queue handler and background writer (once) and applies levels and sample rates."""
+    global _listener
+    root = logging.getLogger(LOGGER_ROOT)
+    with _configure_lock:
+        if _listener is None:
+            log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            stream_handler = logging.StreamHandler(sys.stdout)
+            if (log_format or LOG_FORMAT) == "json":
+                stream_handler.setFormatter(JsonFormatter())
+            else:
+                stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+            handler = DeferredQueueHandler(log_queue)
+            handler.addFilter(TraceSamplingFilter())
+            root.addHandler(handler)
+            root.propagate = False
+            _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+            _listener.start()
+            atexit.register(_listener.stop) # Flushes queued records on exit
+    set_log_levels({**DEFAULT_LOG_LEVELS, **_parse_spec(LOG_LEVELS), **_parse_spec(levels)})
+    set_trace_sample_rates({**_parse_spec(LOG_TRACE_SAMPLE_RATES), **_parse_spec(sample_rates)})
+    return root
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Logger for a subsystem such as 'parser.contact'. Logging is configured on first use."""
+    if _listener is None: configure_logging()
+    return logging.getLogger(_logger_name(subsystem))
+
+def set_log_levels(levels) -> dict[str, str]:
+    """Applies 'subsystem=LEVEL' pairs at runtime. '' is the root of all subsystems. Raises ValueError on unknown levels."""
+    parsed = _parse_spec(levels)
+    for subsystem, level in parsed.items():
+        if not isinstance(logging.getLevelName(level.upper()), int):
+            raise ValueError(f"Unknown log level '{level}' for '{subsystem or LOGGER_ROOT}'.")
+    for subsystem, level in parsed.items():
+        logging.getLogger(_logger_name(subsystem)).setLevel(level.upper())
+    return get_log_levels()
+
+def get_log_levels() -> dict[str, str]:
+    levels = {}
+    for name, logger in logging.Logger.manager.loggerDict.items():
+        if (name == LOGGER_ROOT or name.startswith(LOGGER_ROOT + ".")) and isinstance(logger, logging.Logger) and logger.level:
+            levels[name[len(LOGGER_ROOT) + 1:]] = logging.getLevelName(logger.level)
+    return levels
+
+def set_trace_sample_rates(rates) -> dict[str, float]:
+    for subsystem, rate in _parse_spec(rates).items():
+        _sample_rates[subsystem] = min(1.0, max(0.0, float(rate)))
+    return dict(_sample_rates)
+
+def start_trace_sample(subsystem: str) -> bool:
+    """Decides whether DEBUG records for the unit of work starting now (one parse) are kept."""
+    sampled = random.random() < _sample_rates.get(subsystem, 1.0)
+    name, unsampled = _logger_name(subsystem), _unsampled_traces.get()
+    _unsampled_traces.set(unsampled - {name} if sampled else unsampled | {name})
+    return sampled
+
+def trace_enabled(logger: logging.Logger) -> bool:
+    """Guard for multi-line DEBUG blocks: the level is enabled and the current trace is sampled."""
+    if not logger.isEnabledFor(logging.DEBUG): return False
+    return not any(logger.name == name or logger.name.startswith(name + ".") for name in _unsampled_traces.get())
+
+def logging_status() -> dict:
+    return {"levels": get_log_levels(), "trace_sample_rates": dict(_sample_rates), "dropped_records": dropped_records}
@@ -0,0 +1,64 @@
+import os
+import hashlib
+import tempfile
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Configuration & Constants ---
+# Uploaded resumes are written straight from the multipart parser into a spooled buffer: kept in
+# memory up to UPLOAD_SPOOL_MAX_MEMORY_BYTES, rolled over to an anonymous temp file above that.
+# The rolled-over file is unlinked as soon as it is created (POSIX), so a crashed worker leaves
+# nothing behind in uploads/.
+UPLOAD_SPOOL_MAX_MEMORY_BYTES = int(os.environ.get('UPLOAD_SPOOL_MAX_MEMORY_BYTES', 2 * 1024 * 1024))
+UPLOAD_HASH_ALGORITHM = 'sha256'
+
+
+class HashingSpooledFile:
+    """
+    Writable, seekable file-like buffer that hashes everything written to it. Werkzeug writes the
+    upload into it once and seeks back to 0; readers (PdfReader) then use read/seek/tell as usual.
+    """
+    def __init__(self, max_memory: int = UPLOAD_SPOOL_MAX_MEMORY_BYTES, spill_dir: str = None):
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory, mode='w+b', dir=spill_dir)
+        self._hash = hashlib.new(UPLOAD_HASH_ALGORITHM)
+        self.size = 0
+
+    def write(self, data) -> int:
+        self._hash.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    @property
+    def content_hash(self) -> str:
+        """Hex digest of every byte written so far; final once the upload has been parsed."""
+        return self._hash.hexdigest()
+
+    @property
+    def in_memory(self) -> bool:
+        return not self._file._rolled
+
+    def getbuffer(self) -> memoryview | None:
+        """
+        Zero-copy view of the content while it is still in memory, else None (read it as a file).
+        Release the view (`with` or .release()) before the buffer is closed.
+        """
+        return self._file._file.getbuffer() if self.in_memory else None
+
+    def readable(self) -> bool: return True
+    def writable(self) -> bool: return True
+    def seekable(self) -> bool: return True
+
+    def __getattr__(self, name):
+        # read, readline, seek, tell, flush, close, closed, ... go straight to the spooled file
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        return False
@@ -0,0 +1,101 @@
+"""
+Local stand-in for the Gemini REST API, for trying the resume enhancement flow without an API key.
+
+    python testing/fake_gemini_server.py --port 8765 --delay 2
+    GEMINI_API_BASE_URL=http://127.0.0.1:8765 python app.py
+
+It answers `POST /v1beta/models/<model>:generateContent` with a canned response in the marker
+format core/enhancement_service.py parses, after an optional delay to mimic a slow model.
+`:streamGenerateContent?alt=sse` streams the same response as SSE chunks, spreading the delay
+over the chunks so the incremental preview can be watched filling in.
+Use `--fail` to return HTTP 500 and check the error fallback.
+"""
+import re
+import json
+import time
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CALL_COUNT = 0
+
+
+def build_fake_response(prompt: str) -> str:
+    """Echoes parts of the prompt back inside the enhancement markers, so results are deterministic."""
+    goal = re.search(r'User\'s Goal: "(.*?)"', prompt, re.DOTALL)
+    goal_text = goal.group(1).strip() if goal else "general improvements"
+    skills = re.search(r"Current Skills:\n(.*?)\n", prompt)
+    skills_text = skills.group(1).strip() if skills else ""
+    skills_text = ", ".join(filter(None, [skills_text, "Communication"]))
+    return (
+        "AI_ENHANCED_SUMMARY_START\n"
+        f"Results-driven professional (fake Gemini, goal: {goal_text}).\n"
+        "AI_ENHANCED_SUMMARY_END\n"
+        "AI_ENHANCED_EXPERIENCE_1_RESPONSIBILITIES_START\n"
+        "- Delivered measurable improvements across key projects\n"
+        "- Collaborated with cross-functional teams to ship features\n"
+        "AI_ENHANCED_EXPERIENCE_1_RESPONSIBILITIES_END\n"
+        "AI_ENHANCED_SKILLS_START\n"
+        f"{skills_text}\n"
+        "AI_ENHANCED_SKILLS_END\n"
+    )
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    fail = False
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_sse(self, text: str, chunk_size: int = 24):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        for chunk in chunks:
+            if self.delay: time.sleep(self.delay / len(chunks))
+            event = {"candidates": [{"content": {"role": "model", "parts": [{"text": chunk}]}}]}
+            self.wfile.write(f"data: {json.dumps(event)}\r\n\r\n".encode('utf-8'))
+            self.wfile.flush()
+
+    def do_POST(self):
+        global CALL_COUNT
+        streaming = re.match(r"^/v1beta/models/[^/:]+:streamGenerateContent", self.path) is not None
+        if not streaming and not re.match(r"^/v1beta/models/[^/:]+:generateContent", self.path):
+            self._send_json(404, {"error": {"code": 404, "message": f"Unknown path {self.path}"}})
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        request_body = json.loads(self.rfile.read(length) or b"{}")
+        prompt = "".join(part.get('text', '') for content in request_body.get('contents', []) for part in content.get('parts', []))
+        CALL_COUNT += 1
+        print(f"Fake Gemini call #{CALL_COUNT}: {len(prompt)} prompt chars{' (streaming)' if streaming else ''}")
+        if self.fail:
+            self._send_json(500, {"error": {"code": 500, "message": "Fake Gemini failure"}})
+            return
+        if streaming:
+            self._stream_sse(build_fake_response(prompt))
+            return
+        if self.delay: time.sleep(self.delay)
+        self._send_json(200, {"candidates": [{"content": {"role": "model", "parts": [{"text": build_fake_response(prompt)}]}}]})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Gemini REST endpoint for local testing.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help="Seconds to wait before answering.")
+    parser.add_argument('--fail', action='store_true', help="Answer every call with HTTP 500.")
+    args = parser.parse_args()
+    FakeGeminiHandler.delay = args.delay
+    FakeGeminiHandler.fail = args.fail
+    server = ThreadingHTTPServer((args.host, args.port), FakeGeminiHandler)
+    print(f"Fake Gemini listening on http://{args.host}:{args.port} (delay={args.delay}s, fail={args.fail})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
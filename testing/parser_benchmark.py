@@ -0,0 +1,299 @@
+"""
+Parser benchmark on a synthetic, seeded résumé corpus. Runs offline (needs the spaCy model installed).
+
+    python testing/parser_benchmark.py --docs 60                       # report only
+    python testing/parser_benchmark.py --save-baseline testing/parser_baseline.json
+    python testing/parser_benchmark.py --compare testing/parser_baseline.json   # exit 1 on regression
+
+The corpus varies length, section order and heading style, bullet characters and date formats, and
+every résumé is written to a real PDF, so each run times pdf.extract_text, parser.parse_resume and
+every parser.extract.<section> / parser.nlp.<caller> span. The same --seed and --docs always give the
+same corpus; a baseline records both and --compare refuses to compare different corpora.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Run from anywhere
+
+from core.python_resume_parser_v9 import extract_text_from_pdf, AdvancedResumeParser
+from core.instrumentation import start_request_timing, finish_request_timing, INSTRUMENTATION_ENABLED
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+DEFAULT_DOCS = 40
+DEFAULT_SEED = 1234
+DEFAULT_WARMUP_DOCS = 3
+DEFAULT_TOLERANCE = 0.25 # Relative slowdown allowed before --compare fails
+DEFAULT_SLACK_MS = 2.0 # Absolute slowdown always allowed, so sub-millisecond stages don't flap
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Meera", "Arjun", "Sneha", "Karan", "Divya", "James", "Maria"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Reddy", "Nair", "Gupta", "Mehta", "Rao", "Singh", "Das", "Smith", "Garcia"]
+CITIES = ["Bengaluru, Karnataka", "Pune, Maharashtra", "Hyderabad, Telangana", "Chennai, Tamil Nadu", "New Delhi", "Mumbai"]
+COMPANIES = ["Infosys", "Tata Consultancy Services", "Wipro Technologies", "Zoho Corporation", "Flipkart", "Freshworks", "Accenture", "Razorpay"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Analyst", "Backend Developer", "Machine Learning Engineer", "DevOps Engineer", "Research Intern", "Technical Lead"]
+SKILLS = ["Python", "Java", "JavaScript", "React", "Node.js", "SQL", "MongoDB", "Docker", "Kubernetes", "AWS", "Flask", "Django",
+          "TensorFlow", "PyTorch", "Pandas", "Git", "Linux", "REST APIs", "Microservices", "Spark", "Tableau", "C++"]
+VERBS = ["Designed", "Built", "Led", "Optimized", "Migrated", "Automated", "Implemented", "Reduced", "Maintained", "Delivered"]
+OBJECTS = ["a payments reconciliation service", "the search indexing pipeline", "CI/CD workflows for 12 services", "an internal analytics dashboard",
+           "REST APIs used by the mobile app", "the customer onboarding flow", "batch ETL jobs on Spark", "a recommendation model"]
+OUTCOMES = ["cutting latency by 40%", "serving 2M requests a day", "saving 15 hours of manual work per week", "with 99.9% uptime",
+            "improving conversion by 8%", "for a team of 6 engineers", "", ""]
+UNIVERSITIES = ["Indian Institute of Technology, Madras", "National Institute of Technology, Trichy", "BITS Pilani", "Anna University", "University of Mumbai"]
+DEGREES = ["Bachelor of Technology in Computer Science", "B.E. in Electronics and Communication", "Master of Science in Data Science", "M.Tech in Software Engineering", "B.Sc. Mathematics"]
+CERTIFICATIONS = ["AWS Certified Solutions Architect - Associate", "Google Data Analytics Professional Certificate", "Certified Kubernetes Administrator", "Oracle Certified Java Programmer"]
+LANGUAGES = ["English", "Hindi", "Tamil", "Kannada", "Marathi", "Telugu"]
+AWARDS = ["Best Intern Award", "Hackathon Winner, Smart India Hackathon", "Employee of the Quarter", "Dean's List"]
+
+BULLET_STYLES = ["•", "-", "*", "–", "numbered"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+DATE_STYLES = ("mon_yyyy", "month_yyyy", "mm/yyyy", "yyyy-mm", "yyyy", "mon_'yy")
+CURRENT_WORDS = ["Present", "Current", "Till Date"]
+
+
+def _format_date(year: int, month: int, style: str) -> str:
+    if style == "mon_yyyy": return f"{MONTHS[month - 1][:3]} {year}"
+    if style == "month_yyyy": return f"{MONTHS[month - 1]} {year}"
+    if style == "mm/yyyy": return f"{month:02d}/{year}"
+    if style == "yyyy-mm": return f"{year}-{month:02d}"
+    if style == "mon_'yy": return f"{MONTHS[month - 1][:3]} '{year % 100:02d}"
+    return str(year)
+
+def _heading(title: str, style: str) -> str:
+    if style == "upper": return title.upper()
+    if style == "colon": return f"{title}:"
+    return title
+
+def _bullets(rng: random.Random, items: list[str], style: str) -> list[str]:
+    if style == "numbered": return [f"{i}. {item}" for i, item in enumerate(items, 1)]
+    return [f"{style} {item}" for item in items]
+
+def generate_resume_text(rng: random.Random, size: str) -> str:
+    """One synthetic résumé. `size` ('short' | 'medium' | 'long') sets the number of jobs, bullets and sections."""
+    jobs, bullets_per_job = {"short": (1, 2), "medium": (3, 4), "long": (6, 6)}[size]
+    heading_style = rng.choice(["upper", "title", "colon"])
+    bullet_style = rng.choice(BULLET_STYLES)
+    date_style = rng.choice(DATE_STYLES)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = f"{name.lower().replace(' ', '.')}{rng.randint(1, 99)}@example.com"
+    contact_separator = rng.choice([" | ", " • ", "\n"])
+    lines = [name, contact_separator.join([email, f"+91 {rng.randint(6, 9)}{rng.randint(100000000, 999999999)}", rng.choice(CITIES),
+                                           f"linkedin.com/in/{name.lower().replace(' ', '-')}"])]
+
+    sections = {}
+    sections["Summary"] = [f"{rng.choice(TITLES)} with {rng.randint(1, 12)} years of experience in {', '.join(rng.sample(SKILLS, 3))}. "
+                           f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(OUTCOMES)}.".replace(" .", ".")]
+    skill_count = {"short": 6, "medium": 12, "long": 20}[size]
+    sections["Skills"] = [", ".join(rng.sample(SKILLS, skill_count))] if rng.random() < 0.5 else \
+        [f"Languages: {', '.join(rng.sample(SKILLS[:6], 3))}", f"Tools: {', '.join(rng.sample(SKILLS[6:], min(skill_count - 3, len(SKILLS) - 6)))}"]
+
+    experience, year = [], 2025
+    for _ in range(jobs):
+        start_year = year - rng.randint(1, 3)
+        end = rng.choice(CURRENT_WORDS) if year == 2025 and rng.random() < 0.6 else _format_date(year, rng.randint(1, 12), date_style)
+        dates = f"{_format_date(start_year, rng.randint(1, 12), date_style)} {rng.choice(['-', '–', 'to'])} {end}"
+        title, company = rng.choice(TITLES), rng.choice(COMPANIES)
+        experience.extend([f"{title}, {company}", dates] if rng.random() < 0.5 else [f"{title} | {company} | {dates}"])
+        experience.extend(_bullets(rng, [f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(OUTCOMES)}".strip()
+                                         for _ in range(bullets_per_job)], bullet_style))
+        experience.append("")
+        year = start_year
+    sections["Experience"] = experience[:-1]
+
+    grad_year = year - rng.randint(0, 2)
+    sections["Education"] = [rng.choice(DEGREES), rng.choice(UNIVERSITIES),
+                             f"{_format_date(grad_year - 4, 7, date_style)} - {_format_date(grad_year, 5, date_style)}",
+                             rng.choice([f"CGPA: {rng.uniform(6.5, 9.8):.2f}/10", f"Percentage: {rng.randint(60, 95)}%", ""])]
+    if size != "short":
+        sections["Projects"] = []
+        for _ in range(jobs):
+            sections["Projects"].extend([f"{rng.choice(['Inventory', 'Chat', 'Resume', 'Weather', 'Expense'])} {rng.choice(['Tracker', 'Bot', 'Analyzer', 'Portal'])}",
+                                         *_bullets(rng, [f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {', '.join(rng.sample(SKILLS, 2))}"], bullet_style)])
+        sections["Certifications"] = _bullets(rng, rng.sample(CERTIFICATIONS, 2), bullet_style)
+    if size == "long":
+        sections["Languages"] = [", ".join(rng.sample(LANGUAGES, 3))]
+        sections["Awards"] = _bullets(rng, rng.sample(AWARDS, 2), bullet_style)
+
+    order = ["Summary", "Skills", "Experience", "Education"] if rng.random() < 0.5 else ["Summary", "Education", "Skills", "Experience"]
+    order += [title for title in sections if title not in order]
+    for title in order:
+        lines.extend(["", _heading(title, heading_style), *sections[title]])
+    return "\n".join(lines)
+
+def generate_corpus(count: int, seed: int) -> list[dict]:
+    """Deterministic list of {'id', 'size', 'text'}: a third each of short, medium and long résumés."""
+    rng = random.Random(seed)
+    sizes = ("short", "medium", "long")
+    return [{'id': f"doc{i:04d}", 'size': sizes[i % 3], 'text': generate_resume_text(rng, sizes[i % 3])} for i in range(count)]
+
+
+# --- Minimal PDF writer (no extra dependency; Helvetica, WinAnsi encoding) ---
+PDF_LINES_PER_PAGE = 52
+
+def _pdf_string(line: str) -> str:
+    encoded = line.encode('cp1252', errors='replace').decode('latin-1')
+    return encoded.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def write_text_pdf(text: str, path: str):
+    """Writes `text` as a plain multi-page A4 PDF whose text PyPDF2 can extract line by line."""
+    lines = text.split("\n")
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>",
+               2: f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] /Count {len(pages)} >>",
+               3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"}
+    for page_id, page_lines in zip(page_ids, pages):
+        content = "BT /F1 10 Tf 14 TL 50 800 Td " + " ".join(f"({_pdf_string(line)}) Tj T*" for line in page_lines) + " ET"
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>")
+        objects[page_id + 1] = f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream"
+    out, offsets = bytearray(b"%PDF-1.4\n"), {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n{objects[obj_id]}\nendobj\n".encode('latin-1')
+    xref_at = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    out += "".join(f"{offsets[obj_id]:010d} 00000 n \n" for obj_id in sorted(objects)).encode('latin-1')
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode('latin-1')
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+# --- Measurement ---
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))]
+
+def peak_rss_mb() -> float | None:
+    if resource is None: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024 # bytes on macOS, KiB on Linux
+
+def run_benchmark(docs: int = DEFAULT_DOCS, seed: int = DEFAULT_SEED, warmup: int = DEFAULT_WARMUP_DOCS,
+                  model: str = "en_core_web_sm", corpus_dir: str = None, use_doc_cache: bool = False) -> dict:
+    if not INSTRUMENTATION_ENABLED:
+        raise RuntimeError("INSTRUMENTATION_ENABLED=false hides the per-stage spans; unset it to benchmark.")
+    corpus = generate_corpus(docs, seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_dir = corpus_dir or tmp_dir
+        os.makedirs(pdf_dir, exist_ok=True)
+        for doc in corpus:
+            doc['pdf_path'] = os.path.join(pdf_dir, f"{doc['id']}_{doc['size']}.pdf")
+            write_text_pdf(doc['text'], doc['pdf_path'])
+
+        load_start = time.perf_counter()
+        parser = AdvancedResumeParser(model_name=model)
+        model_load_seconds = time.perf_counter() - load_start
+        for doc in corpus[:warmup]: # First calls pay for lazy spaCy/regex initialisation
+            parser.parse_resume(extract_text_from_pdf(doc['pdf_path']), use_doc_cache=use_doc_cache)
+
+        stage_samples: dict[str, list[float]] = {}
+        run_start = time.perf_counter()
+        for doc in corpus:
+            token = start_request_timing()
+            doc_start = time.perf_counter()
+            try:
+                text = extract_text_from_pdf(doc['pdf_path'])
+                parse_start = time.perf_counter()
+                parser.parse_resume(text, use_doc_cache=use_doc_cache)
+                parse_seconds = time.perf_counter() - parse_start
+            finally:
+                spans = finish_request_timing(token)
+            per_doc = {'document': time.perf_counter() - doc_start, 'parser.parse_resume': parse_seconds}
+            for name, seconds in spans: # A stage can run several times per document (parser.nlp.*); sum them
+                per_doc[name] = per_doc.get(name, 0.0) + seconds
+            for name, seconds in per_doc.items():
+                stage_samples.setdefault(name, []).append(seconds)
+        total_seconds = time.perf_counter() - run_start
+
+    return {
+        'corpus': {'docs': docs, 'seed': seed, 'characters': sum(len(doc['text']) for doc in corpus)},
+        'model': model,
+        'doc_cache': use_doc_cache,
+        'python': sys.version.split()[0],
+        'model_load_seconds': round(model_load_seconds, 3),
+        'docs_per_sec': round(len(corpus) / total_seconds, 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1) if resource else None,
+        'stages': {name: {'runs': len(samples), 'p50_ms': round(percentile(samples, 0.5) * 1000, 3),
+                          'p95_ms': round(percentile(samples, 0.95) * 1000, 3)}
+                   for name, samples in sorted(stage_samples.items())}
+    }
+
+def compare_to_baseline(result: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE,
+                        slack_ms: float = DEFAULT_SLACK_MS) -> list[str]:
+    """Regressions of `result` against `baseline`, as readable lines. Empty when nothing got slower beyond tolerance."""
+    if result['corpus'] != baseline.get('corpus') or result.get('doc_cache') != baseline.get('doc_cache', False):
+        return [f"Corpus differs from the baseline ({result['corpus']} vs {baseline.get('corpus')}); rerun with the baseline's --docs/--seed/--doc-cache."]
+    regressions = []
+    if result['docs_per_sec'] < baseline['docs_per_sec'] / (1 + tolerance):
+        regressions.append(f"throughput: {result['docs_per_sec']} docs/sec vs baseline {baseline['docs_per_sec']}")
+    for name, base in baseline['stages'].items():
+        current = result['stages'].get(name)
+        if current is None: continue # Stage was renamed or removed
+        for stat in ('p50_ms', 'p95_ms'):
+            if current[stat] > base[stat] * (1 + tolerance) + slack_ms:
+                regressions.append(f"{name} {stat}: {current[stat]:.2f} ms vs baseline {base[stat]:.2f} ms")
+    return regressions
+
+def print_report(result: dict, baseline: dict = None):
+    print(f"Corpus: {result['corpus']['docs']} docs (seed {result['corpus']['seed']}, {result['corpus']['characters']} chars), "
+          f"model {result['model']}, Python {result['python']}")
+    print(f"Model load: {result['model_load_seconds']:.2f} s   Throughput: {result['docs_per_sec']:.2f} docs/sec   "
+          f"Peak RSS: {result['peak_rss_mb'] if result['peak_rss_mb'] is not None else 'n/a'} MB")
+    print(f"\n{'stage':<44}{'runs':>6}{'p50 ms':>11}{'p95 ms':>11}" + (f"{'base p95':>11}" if baseline else ""))
+    for name, stats in result['stages'].items():
+        row = f"{name:<44}{stats['runs']:>6}{stats['p50_ms']:>11.2f}{stats['p95_ms']:>11.2f}"
+        if baseline and name in baseline.get('stages', {}): row += f"{baseline['stages'][name]['p95_ms']:>11.2f}"
+        print(row)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks PDF text extraction and resume parsing on a synthetic corpus.")
+    parser.add_argument('--docs', type=int, default=DEFAULT_DOCS, help="Number of synthetic resumes (short/medium/long in turn).")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Corpus seed; same seed and --docs give the same corpus.")
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP_DOCS, help="Untimed documents parsed first.")
+    parser.add_argument('--model', default="en_core_web_sm", help="spaCy model to load.")
+    parser.add_argument('--doc-cache', action='store_true', help="Replay cached spaCy Docs (measures extractor-only re-runs).")
+    parser.add_argument('--corpus-dir', help="Keep the generated PDFs in this directory instead of a temp dir.")
+    parser.add_argument('--save-baseline', metavar='PATH', help="Write the results as a baseline JSON file.")
+    parser.add_argument('--compare', metavar='PATH', help="Compare with a baseline and exit 1 on regression.")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="Allowed relative slowdown (0.25 = 25%%).")
+    parser.add_argument('--slack-ms', type=float, default=DEFAULT_SLACK_MS, help="Allowed absolute slowdown per stage, in ms.")
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON instead of a table.")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        args.docs, args.seed = baseline['corpus']['docs'], baseline['corpus']['seed']
+
+    result = run_benchmark(docs=args.docs, seed=args.seed, warmup=args.warmup, model=args.model, corpus_dir=args.corpus_dir,
+                           use_doc_cache=args.doc_cache)
+    if args.json: print(json.dumps(result, indent=2))
+    else: print_report(result, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+    if baseline:
+        regressions = compare_to_baseline(result, baseline, tolerance=args.tolerance, slack_ms=args.slack_ms)
+        if regressions:
+            print(f"\nREGRESSION against {args.compare} (tolerance {args.tolerance:.0%} + {args.slack_ms} ms):")
+            for line in regressions: print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.compare}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())